@@ -0,0 +1,6 @@
+"""
+Benchmarki wydajnościowe (nie są częścią testów pytest).
+
+Uruchamianie z katalogu głównego repozytorium, np.:
+    python -m benchmarks.entity_memory --iterations 10000
+"""
@@ -0,0 +1,151 @@
+"""Syntetyczna liga do benchmarków: drużyny, rundy (double round-robin), mecze i TeamStrength."""
+
+from __future__ import annotations
+
+import random
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from src.domain.entities import (
+    LeagueRound,
+    MatchRound,
+    SeasonStats,
+    StrengthItem,
+    TeamStrength,
+    TrainingData,
+    TrainingDataset,
+)
+from src.domain.features.trainings.training_builder import TrainingBuilder
+from src.domain.ids import ids
+
+
+@dataclass(frozen=True)
+class SyntheticLeague:
+    league_id: str
+    team_ids: List[int]
+    rounds: List[LeagueRound]
+    matches: List[MatchRound]  # wszystkie mecze sezonu (is_played dla rund <= played_until)
+    played_until: int
+
+    @property
+    def matches_to_simulate(self) -> List[MatchRound]:
+        return [m for m in self.matches if not m.is_played]
+
+
+def _uuid_str(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _int_id(rng: random.Random) -> int:
+    # identyfikatory jak po mapowaniu w klientach gRPC (UUID -> int z rejestru)
+    return ids.to_int(_uuid_str(rng))
+
+
+def _round_robin(team_ids: List[int]) -> List[List[Tuple[int, int]]]:
+    teams = list(team_ids)
+    n = len(teams)
+    first_half: List[List[Tuple[int, int]]] = []
+    for _ in range(n - 1):
+        first_half.append([(teams[i], teams[n - 1 - i]) for i in range(n // 2)])
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    return first_half + [[(a, h) for h, a in pairs] for pairs in first_half]
+
+
+def build_league(
+    n_teams: int = 18, played_until: int = 17, seed: int = 42
+) -> SyntheticLeague:
+    rng = random.Random(seed)
+    league_id = _uuid_str(rng)
+    team_ids = [_int_id(rng) for _ in range(n_teams)]
+    schedule = _round_robin(team_ids)
+    rounds = [
+        LeagueRound(
+            id=_int_id(rng), league_id=ids.to_int(league_id), season_year="3", round=i + 1
+        )
+        for i in range(len(schedule))
+    ]
+
+    matches: List[MatchRound] = []
+    for league_round, pairs in zip(rounds, schedule):
+        played = league_round.round <= played_until
+        for home, away in pairs:
+            home_goals = rng.choice([0, 1, 1, 2, 2, 3]) if played else 0
+            away_goals = rng.choice([0, 0, 1, 1, 2, 3]) if played else 0
+            matches.append(
+                MatchRound(
+                    id=_uuid_str(rng),  # id meczu zostaje stringiem (jak w klientach gRPC)
+                    round_id=league_round.id,
+                    home_team_id=home,
+                    away_team_id=away,
+                    home_goals=home_goals,
+                    away_goals=away_goals,
+                    is_draw=home_goals == away_goals,
+                    is_played=played,
+                )
+            )
+    return SyntheticLeague(league_id, team_ids, rounds, matches, played_until)
+
+
+def build_team_strengths(
+    league: SyntheticLeague, until_round: int, seed: int = 7
+) -> Dict[int, List[TeamStrength]]:
+    """TeamStrength per (drużyna, runda) dla rund 1..until_round."""
+    rng = random.Random(seed)
+    result: Dict[int, List[TeamStrength]] = {}
+    for team_id in league.team_ids:
+        items = []
+        for league_round in league.rounds[:until_round]:
+            post_off, post_def = rng.uniform(0.8, 2.0), rng.uniform(0.8, 2.0)
+            items.append(
+                TeamStrength(
+                    team_id=team_id,
+                    likelihood=StrengthItem(rng.uniform(0.5, 2.5), rng.uniform(0.5, 2.5)),
+                    posterior=StrengthItem(post_off, post_def),
+                    expected_goals=post_off,
+                    last_update=f"2025-01-01T00:00:{league_round.round:02d}",
+                    round_id=league_round.id,
+                    season_stats=SeasonStats(
+                        id=_uuid_str(rng),
+                        team_id=team_id,
+                        season_year=3,
+                        league_id=ids.to_int(league.league_id),
+                        league_strength=1.5,
+                        matches_played=league_round.round,
+                        wins=league_round.round // 2,
+                        losses=league_round.round // 3,
+                        draws=league_round.round - league_round.round // 2 - league_round.round // 3,
+                        goals_for=int(post_off * league_round.round),
+                        goals_against=int(post_def * league_round.round),
+                    ),
+                )
+            )
+        result[team_id] = items
+    return result
+
+
+def build_training_dataset(rows: int, seed: int, train_ratio: float = 0.8) -> TrainingDataset:
+    """
+    Wiersze cech ze schematu TrainingBuilder i gole Poisson: lambda gospodarzy rośnie
+    z ich ofensywą i maleje z obroną gości (i odwrotnie dla gości).
+    """
+    schema = TrainingBuilder.feature_schema()
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(0.5, 2.5, size=(rows, len(schema)))
+    lam_home = 0.9 * values[:, 0] / values[:, 5] + 0.2
+    lam_away = 0.7 * values[:, 4] / values[:, 1] + 0.1
+    y_home, y_away = rng.poisson(lam_home), rng.poisson(lam_away)
+
+    data: List[TrainingData] = [
+        TrainingData(
+            x_row=dict(zip(schema, row.tolist())),
+            y_home=int(h),
+            y_away=int(a),
+            prev_round_id=0,
+        )
+        for row, h, a in zip(values, y_home, y_away)
+    ]
+    split = int(rows * train_ratio)
+    return TrainingDataset(train=data[:split], test=data[split:])
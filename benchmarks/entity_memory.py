@@ -0,0 +1,158 @@
+"""
+Pamięć encji domenowych dla streamu predykcji: dataclass z __dict__ + osobne kopie
+UUID (stan wyjściowy) vs dataclass(slots=True) z identyfikatorami drużyn, rund i lig
+jako int z rejestru (src.domain.ids); id meczu zostaje stringiem w obu wariantach.
+
+Budujemy `--sample` iteracji (TeamStrength per drużyna/runda + symulowane MatchRound),
+mierzymy tracemalloc i rzutujemy wynik na `--iterations` iteracji.
+
+    python -m benchmarks.entity_memory --iterations 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from dataclasses import fields, make_dataclass
+from typing import Callable, List
+
+from benchmarks._synthetic import build_league
+from src.domain.entities import (
+    MatchRound,
+    SeasonStats,
+    StrengthItem,
+    TeamStrength,
+)
+from src.domain.ids import ids
+
+
+def _dict_twin(cls):
+    """Ten sam zestaw pól, ale zwykła dataclass z __dict__ (bez slots)."""
+    return make_dataclass(f"Dict{cls.__name__}", [(f.name, f.type) for f in fields(cls)])
+
+
+DictMatchRound = _dict_twin(MatchRound)
+DictStrengthItem = _dict_twin(StrengthItem)
+DictTeamStrength = _dict_twin(TeamStrength)
+DictSeasonStats = _dict_twin(SeasonStats)
+
+
+def _fresh_copy(value: int) -> str:
+    # tak jak po json.loads: każda iteracja ma własne kopie stringów z identyfikatorami
+    return ids.to_str(value).encode().decode()
+
+
+def _build_iterations(
+    n_iterations: int,
+    league,
+    match_cls,
+    item_cls,
+    strength_cls,
+    stats_cls,
+    make_id: Callable[[int], object],
+) -> List[list]:
+    # id meczu to zawsze świeża kopia stringa (jak po json.loads), niezależnie od make_id
+    iterations = []
+    for it in range(n_iterations):
+        objects = []
+        for team_id in league.team_ids:
+            for league_round in league.rounds:
+                tid = make_id(team_id)
+                objects.append(
+                    strength_cls(
+                        team_id=tid,
+                        likelihood=item_cls(1.0 + it * 1e-6, 1.1),
+                        posterior=item_cls(1.2, 0.9 + it * 1e-6),
+                        expected_goals=1.2,
+                        last_update="2025-01-01T00:00:00",
+                        round_id=make_id(league_round.id),
+                        season_stats=stats_cls(
+                            id=None,
+                            team_id=tid,
+                            season_year=3,
+                            league_id=make_id(league.league_id),
+                            league_strength=1.5,
+                            matches_played=league_round.round,
+                            wins=1,
+                            losses=1,
+                            draws=1,
+                            goals_for=league_round.round * 2,
+                            goals_against=league_round.round,
+                        ),
+                    )
+                )
+        for m in league.matches_to_simulate:
+            objects.append(
+                match_cls(
+                    id=_fresh_copy(m.id),
+                    round_id=make_id(m.round_id),
+                    home_team_id=make_id(m.home_team_id),
+                    away_team_id=make_id(m.away_team_id),
+                    home_goals=it % 4,
+                    away_goals=it % 3,
+                    is_draw=False,
+                    is_played=True,
+                )
+            )
+        iterations.append(objects)
+    return iterations
+
+
+def _measure(builder: Callable[[], list]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    data = builder()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=10_000)
+    parser.add_argument("--sample", type=int, default=200)
+    parser.add_argument("--teams", type=int, default=18)
+    args = parser.parse_args()
+
+    league = build_league(n_teams=args.teams, played_until=args.teams - 1)
+    sample = min(args.sample, args.iterations)
+
+    legacy = _measure(
+        lambda: _build_iterations(
+            sample,
+            league,
+            DictMatchRound,
+            DictStrengthItem,
+            DictTeamStrength,
+            DictSeasonStats,
+            _fresh_copy,
+        )
+    )
+    compact = _measure(
+        lambda: _build_iterations(
+            sample,
+            league,
+            MatchRound,
+            StrengthItem,
+            TeamStrength,
+            SeasonStats,
+            lambda v: ids.to_int(_fresh_copy(v)),
+        )
+    )
+
+    scale = args.iterations / sample
+    mib = 1024 * 1024
+    print(
+        f"league: {args.teams} teams, {len(league.rounds)} rounds, "
+        f"{len(league.matches_to_simulate)} simulated matches/iteration"
+    )
+    print(f"measured on {sample} iterations, projected to {args.iterations}:")
+    print(f"  dict dataclasses + per-iteration id copies: {legacy * scale / mib:10.1f} MiB")
+    print(f"  slots=True dataclasses + int ids:           {compact * scale / mib:10.1f} MiB")
+    print(f"  reduction: {100.0 * (1 - compact / legacy):.1f}%")
+
+
+if __name__ == "__main__":
+    main()
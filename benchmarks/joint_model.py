@@ -0,0 +1,110 @@
+"""
+Dwa modele home/away (QuantileDMatrix, dwa xgb.train) vs wspólny booster z
+dwukolumnowym targetem (XGB_JOINT_MODEL, multi_output_tree / one_output_per_tree).
+
+Raportujemy czas treningu, latencję predict (jeden wiersz jak w symulacji i cały
+zbiór testowy naraz) oraz średnią dewiancję Poissona na zbiorze testowym dla
+lambd home/away - im niżej, tym lepiej.
+
+    python -m benchmarks.joint_model --rows 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from dataclasses import replace
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+
+def _deviance(y: np.ndarray, lam: np.ndarray) -> float:
+    lam = np.clip(lam, 1e-9, None)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        term = np.where(y > 0, y * np.log(y / lam), 0.0)
+    return float(np.mean(2.0 * (term - (y - lam))))
+
+
+def _latency(predict: Callable[[], object], repeat: int) -> float:
+    predict()  # rozgrzewka
+    started = time.perf_counter()
+    for _ in range(repeat):
+        predict()
+    return (time.perf_counter() - started) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=300)
+    args = parser.parse_args()
+
+    from benchmarks._synthetic import build_training_dataset
+    from src.domain.entities import TrainedModels
+    from src.domain.features.mapper import Mapper
+    from src.domain.features.trainings.training_builder import TrainingBuilder
+    from src.services.xgboost.prediction_engine import predict_lambdas
+    from src.services.xgboost import xgboost_service
+    from src.services.xgboost.xgboost_service import XgboostService
+
+    t_dataset = build_training_dataset(args.rows, args.seed)
+    schema = TrainingBuilder.feature_schema()
+    X_test, y_home, y_away = Mapper.map_to_feature_array(t_dataset.test, schema)
+    x_rows = [row.x_row for row in t_dataset.test]
+    service = XgboostService(context=None)
+
+    def train(variant: str) -> Tuple[TrainedModels, float]:
+        started = time.perf_counter()
+        if variant == "two models":
+            home, away, _, best = service._train_quantile(t_dataset, schema, args.seed)
+            models = TrainedModels(home, away, schema, best)
+        else:
+            cfg = xgboost_service.app_config
+            xgboost_service.app_config = replace(
+                cfg, xgboost=replace(cfg.xgboost, multi_strategy=variant)
+            )
+            joint, _, best = service._train_joint(t_dataset, schema, args.seed)
+            models = TrainedModels(None, None, schema, best, joint=joint)
+        return models, time.perf_counter() - started
+
+    results: Dict[str, Tuple[float, float, float, float, float, str]] = {}
+    for variant in ("two models", "multi_output_tree", "one_output_per_tree"):
+        models, train_seconds = train(variant)
+        for booster in (models.home, models.away):
+            if booster is not None:
+                booster.set_params(n_jobs=1)
+        if models.joint is not None:
+            models.joint.set_param({"nthread": 1})
+
+        home, away = predict_lambdas(models, x_rows)
+        single = _latency(lambda: predict_lambdas(models, x_rows[:1]), args.repeat)
+        batch = _latency(lambda: predict_lambdas(models, x_rows), 5)
+        results[variant] = (
+            train_seconds,
+            single * 1e3,
+            batch * 1e3,
+            _deviance(y_home, home),
+            _deviance(y_away, away),
+            ",".join(f"{k}={v + 1}" for k, v in models.best_iterations.items()),
+        )
+
+    print(
+        f"rows: {args.rows} (80% train / {len(X_test)} test), "
+        f"cpu: {os.cpu_count()}, predict n_jobs=1"
+    )
+    print(
+        f"{'variant':<20} {'train s':>8} {'1 row ms':>9} {'batch ms':>9} "
+        f"{'dev home':>9} {'dev away':>9}  trees"
+    )
+    for variant, (train_s, single_ms, batch_ms, dev_h, dev_a, trees) in results.items():
+        print(
+            f"{variant:<20} {train_s:>8.2f} {single_ms:>9.3f} {batch_ms:>9.1f} "
+            f"{dev_h:>9.4f} {dev_a:>9.4f}  {trees}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Trening modeli home/away: DataFrame + dwa XGBRegressor.fit (każdy fit buduje własną
+macierz XGBoost) vs float32 + jedna QuantileDMatrix (hist) współdzielona przez oba
+modele (XGB_QUANTILE_DMATRIX).
+
+Każdy wariant działa w osobnym procesie (spawn), żeby szczyt RSS nie mieszał się
+między wariantami; raportujemy czas (wall/CPU), przyrost szczytowego RSS ponad stan
+po zbudowaniu datasetu i rozmiar macierzy cech po stronie Pythona.
+
+    python -m benchmarks.training_matrix --rows 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import resource
+import time
+from typing import Dict
+
+
+def _run(variant: str, rows: int, seed: int) -> Dict[str, float]:
+    from benchmarks._synthetic import build_training_dataset
+    from src.domain.features.mapper import Mapper
+    from src.domain.features.trainings.training_builder import TrainingBuilder
+    from src.services.xgboost.xgboost_service import XgboostService
+
+    t_dataset = build_training_dataset(rows, seed)
+    schema = TrainingBuilder.feature_schema()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    if variant == "dataframe":
+        X, _, _, _ = Mapper.map_to_xy_matrix(t_dataset.train, schema)
+        matrix_bytes = int(X.memory_usage(deep=True).sum())
+    else:
+        X, _, _ = Mapper.map_to_feature_array(t_dataset.train, schema)
+        matrix_bytes = int(X.nbytes)
+    del X
+
+    service = XgboostService(context=None)
+    wall, cpu = time.perf_counter(), time.process_time()
+    if variant == "dataframe":
+        _, _, _, best = service._train_dataframe(t_dataset, schema, seed, None)
+    else:
+        _, _, _, best = service._train_quantile(t_dataset, schema, seed)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "wall": wall,
+        "cpu": cpu,
+        "peak_rss_mb": (rss_after - rss_before) / 1024,  # ru_maxrss w KiB (Linux)
+        "matrix_mb": matrix_bytes / 2**20,
+        "trees": sum(v + 1 for v in best.values()) if best else float("nan"),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    for variant in ("dataframe", "quantile"):
+        with ctx.Pool(1) as pool:
+            results[variant] = pool.apply(_run, (variant, args.rows, args.seed))
+
+    print(f"rows: {args.rows} (80% train / 20% test)")
+    print(
+        f"{'variant':<10} {'wall s':>8} {'cpu s':>8} {'+peak RSS MB':>13} "
+        f"{'X MB':>8} {'trees':>6}"
+    )
+    for variant, r in results.items():
+        print(
+            f"{variant:<10} {r['wall']:>8.2f} {r['cpu']:>8.2f} {r['peak_rss_mb']:>13.1f} "
+            f"{r['matrix_mb']:>8.1f} {r['trees']:>6.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Redukcja wariancji losowania Poisson w PredictionEngine: none (rng.poisson) vs crn
+vs antithetic vs stratified na syntetycznej lidze i modelach XGBoost.
+
+Każdy tryb liczy `--replications` niezależnych estymacji (różne seedy) po
+`--iterations` iteracji; estymatory to oczekiwane punkty i P(mistrzostwo) drużyn
+(PredictionAggregator). Efektywność = 1 / (wariancja estymatora * sekundy CPU na
+estymację) - im wyżej, tym mniej CPU na tę samą precyzję.
+
+    python -m benchmarks.variance_reduction --iterations 64 --replications 12
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from benchmarks._synthetic import build_league, build_team_strengths
+from src.core.config import VARIANCE_REDUCTION_MODES
+from src.domain.entities import (
+    InitPrediction,
+    LeagueTopology,
+    MatchFixtures,
+    PredictRequest,
+    TrainedModels,
+    TrainingDataset,
+)
+from src.domain.features.predictions.prediction_aggregator import PredictionAggregator
+from src.domain.features.trainings.training_builder import TrainingBuilder
+from src.services.xgboost.prediction_engine import PredictionEngine
+
+
+def _synthetic_models(seed: int = 3) -> TrainedModels:
+    """Modele, w których lambda rośnie z ofensywą drużyny i maleje z obroną rywala."""
+    schema = TrainingBuilder.feature_schema()
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.uniform(0.5, 2.5, size=(4000, len(schema))), columns=schema)
+    lam_home = 0.9 * X["home_p_off"] / X["away_p_def"] + 0.2
+    lam_away = 0.7 * X["away_p_off"] / X["home_p_def"] + 0.1
+
+    def fit(target) -> xgb.XGBRegressor:
+        model = xgb.XGBRegressor(
+            n_estimators=40, max_depth=3, objective="count:poisson", n_jobs=1
+        )
+        model.fit(X, rng.poisson(target))
+        return model
+
+    return TrainedModels(home=fit(lam_home), away=fit(lam_away), feature_schema=schema)
+
+
+def _setup(n_teams: int, played_until: int) -> Tuple[PredictRequest, InitPrediction]:
+    league = build_league(n_teams=n_teams, played_until=played_until)
+    topology = LeagueTopology.from_rounds(league.rounds[0].league_id, league.rounds)
+    request = PredictRequest(
+        simulation_id="bench",
+        league_id=league.league_id,
+        iteration_count=0,
+        team_strengths=build_team_strengths(league, until_round=played_until),
+        matches_to_simulate=league.matches_to_simulate,
+        train_until_round_no=played_until,
+        league_avg_strength=1.5,
+        games_to_reach_trust=25,
+    )
+    init_prediction = InitPrediction(
+        TrainingDataset(train=[], test=[]),
+        [],
+        topology,
+        MatchFixtures.from_match_rounds(league.matches_to_simulate, topology),
+        played_match_rounds=[m for m in league.matches if m.is_played],
+    )
+    return request, init_prediction
+
+
+def _estimate(
+    engine: PredictionEngine, init_prediction: InitPrediction, iterations: int
+) -> Tuple[np.ndarray, float]:
+    aggregator = PredictionAggregator(
+        init_prediction.fixtures, init_prediction.played_match_rounds
+    )
+    started = time.process_time()
+    for iteration_index in range(iterations):
+        home_goals, away_goals, _ = engine.simulate(
+            iteration_index, "2025-01-01T00:00:00"
+        )
+        aggregator.add(home_goals, away_goals)
+    seconds = time.process_time() - started
+
+    expected_points = aggregator.points_sum / aggregator.iterations
+    return np.concatenate((expected_points, aggregator.title_probabilities())), seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--teams", type=int, default=10)
+    parser.add_argument("--played-until", type=int, default=12)
+    parser.add_argument("--iterations", type=int, default=64)
+    parser.add_argument("--replications", type=int, default=12)
+    parser.add_argument(
+        "--strata", type=int, default=None, help="domyślnie = --iterations (jeden blok)"
+    )
+    args = parser.parse_args()
+
+    request, init_prediction = _setup(args.teams, args.played_until)
+    models = _synthetic_models()
+    n_teams = len(init_prediction.fixtures.team_ids)
+    print(
+        f"league: {args.teams} teams, {len(init_prediction.fixtures)} fixtures; "
+        f"{args.replications} x {args.iterations} iterations per mode"
+    )
+
+    results: Dict[str, Tuple[float, float, float]] = {}
+    for mode in VARIANCE_REDUCTION_MODES:
+        estimates: List[np.ndarray] = []
+        cpu: List[float] = []
+        for replication in range(args.replications):
+            engine = PredictionEngine(
+                request,
+                init_prediction,
+                models,
+                goal_sampling="poisson",
+                seed_entropy=1000 + replication,
+                variance_reduction=mode,
+                strata=args.strata or args.iterations,
+            )
+            estimate, seconds = _estimate(engine, init_prediction, args.iterations)
+            estimates.append(estimate)
+            cpu.append(seconds)
+
+        variance = np.var(np.stack(estimates), axis=0, ddof=1)
+        points_var = float(variance[:n_teams].mean())
+        title_var = float(variance[n_teams:].mean())
+        results[mode] = (points_var, title_var, float(np.mean(cpu)))
+
+    base_points, base_title, base_cpu = results["none"]
+    print(
+        f"{'mode':<11} {'cpu s/est':>10} {'var(points)':>12} {'var(title)':>11} "
+        f"{'eff(points)':>12} {'eff(title)':>11}"
+    )
+    for mode, (points_var, title_var, seconds) in results.items():
+        eff_points = (base_points * base_cpu) / max(points_var * seconds, 1e-300)
+        eff_title = (base_title * base_cpu) / max(title_var * seconds, 1e-300)
+        print(
+            f"{mode:<11} {seconds:>10.3f} {points_var:>12.5f} {title_var:>11.6f} "
+            f"{eff_points:>11.2f}x {eff_title:>10.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
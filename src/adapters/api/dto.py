@@ -0,0 +1,150 @@
+"""
+src/adapters/api/dto.py
+Ciała żądań REST - identyfikatory jako UUID stringi (tak jak wysyła je klient).
+
+Domena trzyma id jako gęste inty (src/domain/ids.py), więc zamiana na int dzieje się
+tutaj, na granicy adaptera - tak samo jak w PredictServiceServicer dla gRPC.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from src.domain.entities import (
+    MatchRound,
+    PredictRequest,
+    SeasonStats,
+    StrengthItem,
+    TeamStrength,
+)
+from src.domain.ids import EMPTY_ID, GUID_EMPTY, ids
+
+
+@dataclass
+class MatchRoundDto:
+    id: str
+    round_id: str
+    home_team_id: str
+    away_team_id: str
+    home_goals: Optional[int] = None
+    away_goals: Optional[int] = None
+    is_draw: bool = False
+    is_played: bool = False
+
+    def to_domain(self) -> MatchRound:
+        return MatchRound(
+            id=self.id or GUID_EMPTY,
+            round_id=ids.to_int(self.round_id) or EMPTY_ID,
+            home_team_id=ids.to_int(self.home_team_id),
+            away_team_id=ids.to_int(self.away_team_id),
+            home_goals=self.home_goals,
+            away_goals=self.away_goals,
+            is_draw=self.is_draw,
+            is_played=self.is_played,
+        )
+
+
+@dataclass
+class StrengthItemDto:
+    offensive: float = 1.0
+    defensive: float = 1.0
+
+    def to_domain(self) -> StrengthItem:
+        return StrengthItem(offensive=self.offensive, defensive=self.defensive)
+
+
+@dataclass
+class SeasonStatsDto:
+    team_id: str
+    season_year: str
+    league_id: str
+    league_strength: float = 1.0
+    matches_played: int = 0
+    wins: int = 0
+    losses: int = 0
+    draws: int = 0
+    goals_for: int = 0
+    goals_against: int = 0
+    id: Optional[str] = None
+
+    def to_domain(self) -> SeasonStats:
+        return SeasonStats(
+            id=self.id,
+            team_id=ids.to_int(self.team_id),
+            season_year=self.season_year,
+            league_id=ids.to_int(self.league_id),
+            league_strength=self.league_strength,
+            matches_played=self.matches_played,
+            wins=self.wins,
+            losses=self.losses,
+            draws=self.draws,
+            goals_for=self.goals_for,
+            goals_against=self.goals_against,
+        )
+
+
+@dataclass
+class TeamStrengthDto:
+    team_id: str
+    round_id: str
+    likelihood: StrengthItemDto = field(default_factory=StrengthItemDto)
+    posterior: StrengthItemDto = field(default_factory=StrengthItemDto)
+    expected_goals: float = 0.0
+    last_update: str = "2001-01-01T05:14:36.246303"
+    season_stats: Optional[SeasonStatsDto] = None
+
+    def to_domain(self) -> TeamStrength:
+        team_id = ids.to_int(self.team_id) or EMPTY_ID
+        return TeamStrength(
+            team_id=team_id,
+            likelihood=self.likelihood.to_domain(),
+            posterior=self.posterior.to_domain(),
+            expected_goals=self.expected_goals,
+            last_update=self.last_update,
+            round_id=ids.to_int(self.round_id) or EMPTY_ID,
+            season_stats=(
+                self.season_stats.to_domain()
+                if self.season_stats is not None
+                else SeasonStats.empty(team_id=team_id)
+            ),
+        )
+
+
+@dataclass
+class PredictRequestDto:
+    simulation_id: str
+    league_id: str
+    iteration_count: int
+    # team_id -> historia siły drużyny (jak PredictRequest.team_strengths)
+    team_strengths: Dict[str, List[TeamStrengthDto]]
+    matches_to_simulate: List[MatchRoundDto]
+    train_until_round_no: int
+    league_avg_strength: Optional[float] = None
+    seed: Optional[int] = None
+    train_ratio: Optional[float] = None
+    games_to_reach_trust: Optional[int] = None
+    goal_sampling: Optional[str] = None
+    variance_reduction: Optional[str] = None
+    convergence_tolerance: Optional[float] = None
+
+    def to_domain(self) -> PredictRequest:
+        team_strengths: Dict[int, List[TeamStrength]] = {}
+        for team_id, strengths in self.team_strengths.items():
+            if not team_id:
+                continue
+            team_strengths[ids.to_int(team_id)] = [ts.to_domain() for ts in strengths]
+
+        return PredictRequest(
+            simulation_id=self.simulation_id,
+            league_id=self.league_id,
+            iteration_count=self.iteration_count,
+            team_strengths=team_strengths,
+            matches_to_simulate=[m.to_domain() for m in self.matches_to_simulate],
+            train_until_round_no=self.train_until_round_no,
+            league_avg_strength=self.league_avg_strength,
+            seed=self.seed,
+            train_ratio=self.train_ratio,
+            games_to_reach_trust=self.games_to_reach_trust,
+            goal_sampling=self.goal_sampling,
+            variance_reduction=self.variance_reduction,
+            convergence_tolerance=self.convergence_tolerance,
+        )
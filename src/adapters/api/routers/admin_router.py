@@ -0,0 +1,54 @@
+"""
+src/adapters/api/routers/admin_router.py
+REST Adapter (Admin) - diagnostyka działającego procesu.
+"""
+
+from dataclasses import asdict
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from src.core import get_logger
+from src.core.profiler import profiler
+
+logger = get_logger(__name__)
+router = APIRouter()
+
+
+@router.post("/admin/profiling")
+async def arm_profiling(
+    calls: Optional[int] = Query(None, ge=1, description="Profile the next N StreamPrediction calls."),
+    seconds: Optional[float] = Query(None, gt=0, description="Profile every StreamPrediction started within this window."),
+):
+    logger.info("API Request POST: arm_profiling(calls=%s, seconds=%s)", calls, seconds)
+
+    try:
+        profiler.arm(calls=calls, seconds=seconds)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return profiler.status()
+
+
+@router.get("/admin/profiling")
+async def get_profiling_results(
+    limit: int = Query(25, ge=1, le=500),
+    sort_by: str = Query("cumulative", pattern="^(cumulative|tottime|calls)$"),
+    match: Optional[str] = Query(None, description="Filter by function or file name substring."),
+):
+    logger.info("API Request GET: get_profiling_results(limit=%s, sort_by=%s, match=%s)", limit, sort_by, match)
+
+    return {
+        "status": profiler.status(),
+        "hot_functions": [
+            asdict(f) for f in profiler.hot_functions(limit=limit, sort_by=sort_by, match=match)
+        ],
+    }
+
+
+@router.delete("/admin/profiling")
+async def reset_profiling():
+    logger.info("API Request DELETE: reset_profiling()")
+
+    profiler.disarm()
+    profiler.reset()
+    return profiler.status()
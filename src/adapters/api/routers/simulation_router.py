@@ -1,22 +1,195 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+import base64
+import binascii
+from contextlib import aclosing
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, Dict, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Body, Header, Query
+from fastapi.responses import StreamingResponse
 from src.core import get_logger
-from src.domain.entities import PredictRequest
+from src.core.profiler import profiler
+from src.core.utils import json_line
+from src.adapters.api.dto import PredictRequestDto
+from src.di.ports.simulation_service_port import SimulationServicePort
+from src.domain.entities import (
+    IterationResult,
+    PagedResponse,
+    PredictionSummary,
+    PredictRequest,
+    SimulationOverview,
+)
+from src.domain.features.mapper import Mapper
 from src.services import SimulationService
-from src.di.services import get_simulation_service
+from src.di.services import get_simulation_service, get_simulation_service_scope
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+PAGE_LIMIT_DEFAULT = 50
+PAGE_LIMIT_MAX = 500
+
+ServiceScope = Callable[[], AsyncContextManager[SimulationServicePort]]
+
+
+# ---------- stronicowanie (kursor = zakodowany offset upstreamu) ----------
+
+def _encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(f"o:{offset}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, offset = raw.split(":", 1)
+        if prefix != "o" or int(offset) < 0:
+            raise ValueError(raw)
+        return int(offset)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _page_dict(page: PagedResponse, offset: int, limit: int, item_to_dict) -> Dict[str, Any]:
+    next_offset = offset + len(page.items)
+    has_more = (
+        next_offset < page.total_count if page.total_count > 0 else len(page.items) >= limit
+    )
+    return {
+        "total_count": page.total_count,
+        "items": [item_to_dict(item) for item in page.items],
+        "next_cursor": _encode_cursor(next_offset) if has_more and page.items else None,
+    }
+
+
+def _overview_to_dict(item: SimulationOverview) -> Dict[str, Any]:
+    return {
+        "id": item.id,
+        "created_at": item.created_date,
+    }
+
+
+def _iteration_result_to_dict(item: IterationResult) -> Dict[str, Any]:
+    return {
+        "id": item.id,
+        "simulation_id": item.simulation_id,
+        "iteration_index": item.iteration_index,
+        "start_date": item.start_date,
+        "execution_time": item.execution_time,
+        "simulated_match_round": [
+            Mapper.map_match_round_to_dict(m)
+            for m in item.match_rounds()
+        ],
+    }
+
+
+def _ndjson_response(lines: AsyncIterator[bytes]) -> StreamingResponse:
+    return StreamingResponse(
+        lines, media_type=NDJSON_MEDIA_TYPE, headers={"Cache-Control": "no-cache"}
+    )
+
+
+async def _prediction_events(
+    scope: ServiceScope, body: PredictRequest, sse: bool
+) -> AsyncIterator[bytes]:
+    # jedno zdarzenie na iterację, wysyłane od razu (chunked) - pamięć nie rośnie z iteration_count
+    with profiler.profile_call():
+        async with scope() as service:
+            async with aclosing(service.run_prediction_stream(body)) as stream:
+                async for status, iteration_result, counter, standard_error in stream:
+                    line = Mapper.map_to_predict_event(
+                        status, iteration_result, counter, standard_error
+                    )
+                    # SSE: ta sama linia JSON (bez "\n") jako pole data
+                    yield b"id: %d\ndata: %s\n\n" % (counter, line[:-1]) if sse else line
+
+
 @router.post("/simulations/predict")
 async def post_simulation(
-    body: PredictRequest = Body(...),
-    service: SimulationService = Depends(get_simulation_service)
+    body: PredictRequestDto = Body(...),
+    accept: Optional[str] = Header(default=None),
+    scope: ServiceScope = Depends(get_simulation_service_scope),
 ):
-    logger.info(f"API Request POST: post_simulation() with body={body}")
-    
-    result = await service.run_prediction(body)
-    
-    return {"iterationResults": result}
+    """Stream iteracji jak gRPC StreamPrediction: NDJSON albo SSE (Accept: text/event-stream)."""
+    logger.info(
+        "API Request POST: post_simulation() simulation_id=%s iterations=%s",
+        body.simulation_id,
+        body.iteration_count,
+    )
+
+    sse = SSE_MEDIA_TYPE in (accept or "")
+    return StreamingResponse(
+        _prediction_events(scope, body.to_domain(), sse),
+        media_type=SSE_MEDIA_TYPE if sse else NDJSON_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache"},
+    )
+
+@router.post("/simulations/predict/summary")
+async def post_simulation_summary(
+    body: PredictRequestDto = Body(...),
+    progress_every: Optional[int] = Query(None, ge=1),
+    scope: ServiceScope = Depends(get_simulation_service_scope),
+):
+    """
+    Same agregaty. Bez `progress_every` - jeden JSON z COMPLETED; z `progress_every` -
+    NDJSON: PROGRESS co tyle iteracji, na końcu COMPLETED.
+    """
+    logger.info(
+        "API Request POST: post_simulation_summary() simulation_id=%s iterations=%s",
+        body.simulation_id,
+        body.iteration_count,
+    )
+
+    request = body.to_domain()
+
+    async def events() -> AsyncIterator[Tuple[str, PredictionSummary, int]]:
+        with profiler.profile_call():
+            async with scope() as service:
+                async with aclosing(
+                    service.run_prediction_summary_stream(request, progress_every=progress_every)
+                ) as stream:
+                    async for event in stream:
+                        yield event
+
+    if progress_every is None:
+        summary = None
+        async with aclosing(events()) as stream:
+            async for _, summary, _ in stream:
+                pass
+        return Mapper.map_prediction_summary_to_dict(summary)
+
+    async def lines() -> AsyncIterator[bytes]:
+        async with aclosing(events()) as stream:
+            async for status, summary, counter in stream:
+                yield json_line(
+                    {
+                        "status": status,
+                        "predicted_iterations": counter,
+                        "summary": Mapper.map_prediction_summary_to_dict(summary),
+                    }
+                )
+
+    return _ndjson_response(lines())
+
+@router.post("/simulations/predict/outcomes")
+async def post_simulation_outcomes(
+    body: PredictRequestDto = Body(...),
+    service: SimulationService = Depends(get_simulation_service),
+):
+    """
+    Analityczne prawdopodobieństwa z macierzy Poissona. Pokrywają się z
+    /simulations/predict tylko przy PREDICTION_GOAL_SAMPLING=poisson (lub goal_sampling
+    w requeście); tryb użyty przez strumień zwracamy w polu `goal_sampling`.
+    """
+    logger.info(
+        "API Request POST: post_simulation_outcomes() simulation_id=%s",
+        body.simulation_id,
+    )
+
+    result = await service.run_outcome_probabilities(body.to_domain())
+
+    return Mapper.map_analytic_prediction_to_dict(result)
 
 @router.get("/simulations/overviews/all")
 async def get_simulation_overview(
@@ -34,16 +207,43 @@ async def get_simulation_overview(
 
     return {
         "total_count": result.total_count,
-        "items": [
-            {
-                "id": item.id,
-                "created_at": item.created_date,
-            }
-            for item in result.items
-        ],
+        "items": [_overview_to_dict(item) for item in result.items],
     }
 
 
+@router.get("/simulations/overviews")
+async def get_simulation_overviews_page(
+    cursor: Optional[str] = None,
+    limit: int = Query(PAGE_LIMIT_DEFAULT, ge=1, le=PAGE_LIMIT_MAX),
+    service: SimulationService = Depends(get_simulation_service),
+):
+    """Jedna strona przeglądów; kolejna przez `next_cursor`."""
+    offset = _decode_cursor(cursor)
+    logger.info("API Request GET: get_simulation_overviews_page(offset=%s, limit=%s)", offset, limit)
+
+    page = await service.run_simulation_overviews_page(offset, limit)
+    if page is None:
+        raise HTTPException(status_code=502, detail="Simulation overviews unavailable")
+
+    return _page_dict(page, offset, limit, _overview_to_dict)
+
+
+@router.get("/simulations/overviews/stream")
+async def stream_simulation_overviews(
+    scope: ServiceScope = Depends(get_simulation_service_scope),
+):
+    """Wszystkie przeglądy jako NDJSON - strony z upstreamu przekazywane od razu."""
+    logger.info("API Request GET: stream_simulation_overviews()")
+
+    async def lines() -> AsyncIterator[bytes]:
+        async with scope() as service:
+            async with aclosing(service.iter_simulation_overviews()) as overviews:
+                async for item in overviews:
+                    yield json_line(_overview_to_dict(item))
+
+    return _ndjson_response(lines())
+
+
 @router.get("/simulations/iterationresults")
 async def get_iteration_results(
     simulation_id: str,
@@ -66,20 +266,52 @@ async def get_iteration_results(
 
     return {
         "total_count": result.total_count,
-        "items": [
-            {
-                "id": item.id,
-                "simulation_id": item.simulation_id,
-                "iteration_index": item.iteration_index,
-                "start_date": item.start_date,
-                "execution_time": item.execution_time,
-                "simulated_match_round": item.simulated_match_rounds,
-            }
-            for item in result.items
-        ],
+        "items": [_iteration_result_to_dict(item) for item in result.items],
     }
 
 
+@router.get("/simulations/iterationresults/page")
+async def get_iteration_results_page(
+    simulation_id: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(PAGE_LIMIT_DEFAULT, ge=1, le=PAGE_LIMIT_MAX),
+    service: SimulationService = Depends(get_simulation_service),
+):
+    """Jedna strona iteracji symulacji; kolejna przez `next_cursor`."""
+    offset = _decode_cursor(cursor)
+    logger.info(
+        "API Request GET: get_iteration_results_page(simulation_id=%s, offset=%s, limit=%s)",
+        simulation_id,
+        offset,
+        limit,
+    )
+
+    page = await service.run_get_iterationResults_page(simulation_id, offset, limit)
+    if page is None:
+        raise HTTPException(status_code=502, detail="Iteration results unavailable")
+
+    return _page_dict(page, offset, limit, _iteration_result_to_dict)
+
+
+@router.get("/simulations/iterationresults/stream")
+async def stream_iteration_results(
+    simulation_id: str,
+    scope: ServiceScope = Depends(get_simulation_service_scope),
+):
+    """Wszystkie iteracje symulacji jako NDJSON, paczkami prosto z upstreamu."""
+    logger.info("API Request GET: stream_iteration_results(simulation_id=%s)", simulation_id)
+
+    async def lines() -> AsyncIterator[bytes]:
+        async with scope() as service:
+            async with aclosing(
+                service.iter_iterationResults_by_simulationId(simulation_id)
+            ) as batches:
+                async for batch in batches:
+                    yield b"".join(json_line(_iteration_result_to_dict(item)) for item in batch)
+
+    return _ndjson_response(lines())
+
+
 @router.get("/simulations/sync")
 async def get_pending_simulations_to_sync(
     service: SimulationService = Depends(get_simulation_service),
@@ -8,6 +8,7 @@ from fastapi.encoders import jsonable_encoder
 from src.services import SportsDataService
 from src.adapters.grpc.client import LeagueRoundClient
 from src.core import get_logger
+from src.domain.features.mapper import Mapper
 from src.di.services import get_sportsdata_service
 
 logger = get_logger(__name__)
@@ -19,7 +20,7 @@ async def get_league_rounds(
     league_id: str, service: SportsDataService = Depends(get_sportsdata_service)
 ):
 
-    logger.info(f"API Request: get_league_rounds(league_id={league_id})")
+    logger.info("API Request: get_league_rounds(league_id=%s)", league_id)
 
     result = await service.get_league_rounds_by_league_id(league_id=league_id)
 
@@ -27,14 +28,14 @@ async def get_league_rounds(
         raise HTTPException(
             status_code=404, detail="No league rounds found or error occurred"
         )
-    return {"items": [r.__dict__ for r in result]}
+    return {"items": [Mapper.map_league_round_to_dict(r) for r in result]}
 
 @router.get("/sportsdata/matchRounds")
 async def get_match_rounds(
     league_id: str, service: SportsDataService = Depends(get_sportsdata_service)
 ):
 
-    logger.info(f"API Request: get_match_rounds(league_id={league_id})")
+    logger.info("API Request: get_match_rounds(league_id=%s)", league_id)
 
     league_rounds = await service.get_league_rounds_by_league_id(league_id=league_id)
     result = await service.get_match_rounds_by_league_rounds(league_rounds)
@@ -42,4 +43,4 @@ async def get_match_rounds(
         raise HTTPException(
             status_code=404, detail="No match rounds found or error occurred"
         )
-    return {"items": [r.__dict__ for r in result]}
\ No newline at end of file
+    return {"items": [Mapper.map_match_round_to_dict(r) for r in result]}
\ No newline at end of file
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from typing import Optional, Protocol
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Iterator, Optional, Protocol
 import grpc
 
 from src.core import get_logger, config as app_config, SimulationGrpcConfig, SportsDataGrpcConfig
+from src.core.metrics import GRPC_CLIENT_ERRORS, GRPC_CLIENT_LATENCY
 
 logger = get_logger(__name__)
 
@@ -18,7 +21,7 @@ class BaseGrpcClient:
 
     def _create_channel(self) -> grpc.aio.Channel:
         address = self.grpc_config.address
-        logger.info(f"Connecting to gRPC server: {address}")
+        logger.info("Connecting to gRPC server: %s", address)
         return grpc.aio.insecure_channel(address)
 
     async def close(self) -> None:
@@ -27,6 +30,18 @@ class BaseGrpcClient:
     def _format_rpc_error(self, e: grpc.RpcError) -> dict:
         return {"code": str(e.code()), "details": e.details()}
 
+    @contextmanager
+    def _observe_rpc(self, method: str) -> Iterator[None]:
+        """Mierzy czas wywołania RPC (łącznie z konsumpcją streamu) i zlicza błędy."""
+        start = perf_counter()
+        try:
+            yield
+        except grpc.RpcError:
+            GRPC_CLIENT_ERRORS.inc(method=method)
+            raise
+        finally:
+            GRPC_CLIENT_LATENCY.observe(perf_counter() - start, method=method)
+
     async def __aenter__(self) -> "BaseGrpcClient":
         return self
 
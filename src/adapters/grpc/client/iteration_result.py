@@ -3,11 +3,12 @@ Klient gRPC do serwisu IterationResult
 """
 
 from __future__ import annotations
-from typing import Optional
-import os
+from contextlib import aclosing
+from typing import AsyncIterator, List, Optional, Tuple
 import grpc
 import json
 from src.adapters.grpc.client.baseGrpc import BaseGrpcClient
+from src.adapters.grpc.client.paging import PrefetchingPager
 from src.domain.features.mapper import Mapper
 from src.generatedSimulationProtos.SimulationService.IterationResult import (
     service_pb2_grpc,
@@ -15,96 +16,112 @@ from src.generatedSimulationProtos.SimulationService.IterationResult import (
 )
 from src.generatedSimulationProtos.SimulationService import commonTypes_pb2
 from src.domain.entities import IterationResult, PagedResponse
-from src.core import get_logger, SimulationGrpcConfig
+from src.core import get_logger, SimulationGrpcConfig, config as app_config
 from src.di.ports.adapters.iteration_result_port import IterationResultPort
 
 logger = get_logger(__name__)
 
-try:
-    BATCH_LIMIT = int(os.getenv("GRPC_PAGINATION_LIMIT", "100"))
-except ValueError:
-    BATCH_LIMIT = 100
-
 
 class IterationResultClient(BaseGrpcClient, IterationResultPort):
     def __init__(self, grpc_config: Optional[SimulationGrpcConfig] = None):
         super().__init__(grpc_config)
         self.stub = service_pb2_grpc.IterationResultServiceStub(self.channel)
 
+    async def _stream_page(
+        self, simulation_id: str, offset: int, limit: int
+    ) -> AsyncIterator[Tuple[List[IterationResult], Optional[commonTypes_pb2.PagedResponseGrpc]]]:
+        """Jedna strona z upstreamu: (zmapowane itemy, paged) per wiadomość streamu."""
+        paged_req = commonTypes_pb2.PagedRequestGrpc(
+            offset=offset, limit=limit, sorting_method=None
+        )
+
+        req = requests_pb2.IterationResultsBySimulationIdRequest(
+            simulation_id=simulation_id, paged_request=paged_req
+        )
+
+        with self._observe_rpc("GetIterationResultsBySimulationId"):
+            response_stream = self.stub.GetIterationResultsBySimulationId(req)
+
+            async for resp in response_stream:
+                mapped_items = [
+                    IterationResult(
+                        id=o.id,
+                        simulation_id=o.simulation_id,
+                        iteration_index=o.iteration_index,
+                        start_date=o.start_date,
+                        execution_time=o.execution_time,
+                        team_strengths=IterationResult.from_team_strength_raw_list(
+                            o.team_strengths
+                        ),
+                        simulated_match_rounds=IterationResult.from_sim_matches_raw_new(
+                            json.loads(o.simulated_match_rounds)
+                        ),
+                    )
+                    for o in resp.items
+                ]
+                yield mapped_items, resp.paged if resp.HasField("paged") else None
+
+    def _pager(self, simulation_id: str) -> PrefetchingPager[IterationResult]:
+        return PrefetchingPager(
+            lambda offset, limit: self.get_iterationResults_page_BySimulationId(
+                simulation_id, offset, limit
+            ),
+            app_config.paging,
+        )
+
     async def get_all_iterationResults_BySimulationId(
         self, simulation_id: str
     ) -> Optional[PagedResponse[IterationResult]]:
         all_items = []
-        current_offset = 0
-        final_total_count = 0
-        final_sorting_option = ""
-        final_sorting_order = ""
+        pager = self._pager(simulation_id)
 
-        try:
-            while True:
-                paged_req = commonTypes_pb2.PagedRequestGrpc(
-                    offset=current_offset, limit=BATCH_LIMIT, sorting_method=None
-                )
-
-                req = requests_pb2.IterationResultsBySimulationIdRequest(
-                    simulation_id=simulation_id, paged_request=paged_req
-                )
-
-                response_stream = self.stub.GetIterationResultsBySimulationId(req)
-
-                items_in_this_batch = 0
-                batch_paged_info = None
-
-                async for resp in response_stream:
-                    mapped_items = [
-                        IterationResult(
-                            id=o.id,
-                            simulation_id=o.simulation_id,
-                            iteration_index=o.iteration_index,
-                            start_date=o.start_date,
-                            execution_time=o.execution_time,
-                            team_strengths=IterationResult.from_team_strength_raw_list(
-                                o.team_strengths
-                            ),
-                            simulated_match_rounds=IterationResult.from_sim_matches_raw_new(
-                                json.loads(o.simulated_match_rounds)
-                            ),
-                        )
-                        for o in resp.items
-                    ]
-                    all_items.extend(mapped_items)
-                    items_in_this_batch += len(mapped_items)
-
-                    if resp.HasField("paged"):
-                        batch_paged_info = resp.paged
-
-                # Aktualizacja metadanych z ostatniej paczki
-                if batch_paged_info:
-                    final_total_count = batch_paged_info.total_count
-                    final_sorting_option = batch_paged_info.sorting_option
-                    final_sorting_order = batch_paged_info.sorting_order
-
-                if items_in_this_batch < BATCH_LIMIT:
-                    break
-
-                current_offset += BATCH_LIMIT
-
-                if final_total_count > 0 and len(all_items) >= final_total_count:
-                    break
-
-            return PagedResponse(
-                items=all_items,
-                total_count=final_total_count,  # lub len(all_items)
-                sorting_option=final_sorting_option,
-                sorting_order=final_sorting_order,
-            )
+        async with aclosing(pager.pages()) as pages:
+            async for items in pages:
+                all_items.extend(items)
+
+        if not pager.complete:
+            return None
 
+        last_page = pager.last_page
+        return PagedResponse(
+            items=all_items,
+            total_count=pager.total_count,  # lub len(all_items)
+            sorting_option=last_page.sorting_option if last_page else "",
+            sorting_order=last_page.sorting_order if last_page else "",
+        )
+
+    async def get_iterationResults_page_BySimulationId(
+        self, simulation_id: str, offset: int, limit: int
+    ) -> Optional[PagedResponse[IterationResult]]:
+        """Jedna strona (offset/limit) bez pobierania reszty symulacji."""
+        items: List[IterationResult] = []
+        paged_info = None
+        try:
+            async for mapped_items, paged in self._stream_page(simulation_id, offset, limit):
+                items.extend(mapped_items)
+                if paged is not None:
+                    paged_info = paged
         except grpc.RpcError as e:
             logger.error(
-                f"GetIterationResultsBySimulationId failed: {self._format_rpc_error(e)}"
+                "GetIterationResultsBySimulationId failed: %s", self._format_rpc_error(e)
             )
             return None
 
+        return PagedResponse(
+            items=items,
+            total_count=paged_info.total_count if paged_info else 0,
+            sorting_option=paged_info.sorting_option if paged_info else "",
+            sorting_order=paged_info.sorting_order if paged_info else "",
+        )
+
+    async def iter_iterationResults_BySimulationId(
+        self, simulation_id: str
+    ) -> AsyncIterator[List[IterationResult]]:
+        """Wszystkie iteracje symulacji stronami, oddawane w kolejności zaraz po przyjściu."""
+        async with aclosing(self._pager(simulation_id).pages()) as pages:
+            async for items in pages:
+                yield items
+
     async def send_iteration_result(self, iteration_result: IterationResult) -> bool:
         try:
             grpc_object = Mapper.map_iteration_result_to_proto(iteration_result)
@@ -113,12 +130,13 @@ class IterationResultClient(BaseGrpcClient, IterationResultPort):
                 iteration_result_grpc=grpc_object
             )
 
-            await self.stub.SaveIterationResult(req)
+            with self._observe_rpc("SaveIterationResult"):
+                await self.stub.SaveIterationResult(req)
 
             return True
 
         except grpc.RpcError as e:
             logger.error(
-                f"GetIterationResultsBySimulationId failed: {self._format_rpc_error(e)}"
+                "SaveIterationResult failed: %s", self._format_rpc_error(e)
             )
             return False
@@ -10,6 +10,7 @@ from src.generatedSportsDataProtos.SportsDataService.LeagueRound import (
     requests_pb2,
 )
 from src.domain.entities import LeagueRound
+from src.domain.ids import ids
 from src.di.ports.adapters.league_round_port import LeagueRoundPort
 
 logger = get_logger(__name__)
@@ -24,10 +25,11 @@ class LeagueRoundClient(BaseGrpcClient, LeagueRoundPort):
         request = requests_pb2.LeagueRoundsByParamsRequest(league_id=req_league_id)
 
         try:
-            response = await self.stub.GetAllLeagueRoundsByParams(
-                request,
-                timeout=self.grpc_config.timeout_seconds,
-            )
+            with self._observe_rpc("GetAllLeagueRoundsByParams"):
+                response = await self.stub.GetAllLeagueRoundsByParams(
+                    request,
+                    timeout=self.grpc_config.timeout_seconds,
+                )
         except grpc.RpcError as e:
             logger.exception(
                 "LeagueRound RPC failed",
@@ -37,8 +39,8 @@ class LeagueRoundClient(BaseGrpcClient, LeagueRoundPort):
 
         mapped = [
             LeagueRound(
-                id=r.id,
-                league_id=r.league_id,
+                id=ids.to_int(r.id),
+                league_id=ids.to_int(r.league_id),
                 season_year=r.season_year,
                 round=r.round,
             )
@@ -4,6 +4,7 @@ from src.adapters.grpc.client.baseGrpc import BaseGrpcClient
 from src.core import get_logger, SportsDataGrpcConfig, config as app_config
 from src.di.ports.adapters.match_round_port import MatchRoundPort
 from src.domain.entities import MatchRound
+from src.domain.ids import ids
 from src.generatedSportsDataProtos.SportsDataService.MatchRound import (
     service_pb2_grpc,
     requests_pb2,
@@ -18,15 +19,18 @@ class MatchRoundClient(BaseGrpcClient, MatchRoundPort):
         self.stub = service_pb2_grpc.MatchRoundServiceStub(self.channel)
 
     async def get_match_rounds_by_round_id(
-        self, req_round_id: str
+        self, req_round_id: int
     ) -> List[MatchRound]:
-        req = requests_pb2.MatchRoundsByRoundIdRequest(round_id=req_round_id)
+        req = requests_pb2.MatchRoundsByRoundIdRequest(
+            round_id=ids.to_str(req_round_id)
+        )
 
         try:
-            response = await self.stub.GetMatchRoundsByRoundId(
-                req,
-                timeout=self.grpc_config.timeout_seconds,
-            )  # per-RPC timeout [web:23]
+            with self._observe_rpc("GetMatchRoundsByRoundId"):
+                response = await self.stub.GetMatchRoundsByRoundId(
+                    req,
+                    timeout=self.grpc_config.timeout_seconds,
+                )  # per-RPC timeout [web:23]
         except grpc.RpcError as e:
             logger.exception(
                 "MatchRound RPC failed",
@@ -37,9 +41,9 @@ class MatchRoundClient(BaseGrpcClient, MatchRoundPort):
         mapped = [
             MatchRound(
                 id=r.id,
-                round_id=r.round_id,
-                home_team_id=r.home_team_id,
-                away_team_id=r.away_team_id,
+                round_id=ids.to_int(r.round_id),
+                home_team_id=ids.to_int(r.home_team_id),
+                away_team_id=ids.to_int(r.away_team_id),
                 home_goals=r.home_goals,
                 away_goals=r.away_goals,
                 is_draw=r.is_draw,
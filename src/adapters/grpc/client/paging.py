@@ -0,0 +1,96 @@
+"""
+Stronicowanie klientów gRPC z prefetchem.
+
+Pierwsza strona idzie sama (poznajemy total_count); potem, gdy total_count jest
+znany, do `prefetch_pages` kolejnych offsetów leci równolegle, a strony są oddawane
+w kolejności offsetów, zaraz po zmapowaniu. Bez total_count - strona po stronie,
+koniec na krótszej stronie (jak dotąd).
+
+Rozmiar strony dopasowuje się do czasu odpowiedzi (~target_page_seconds na stronę,
+najwyżej x2 / /2 na krok, w granicach [1, max_page_size]).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from time import perf_counter
+from typing import AsyncIterator, Awaitable, Callable, Deque, Generic, List, Optional, Tuple, TypeVar
+
+from src.core.config import PagingConfig
+from src.domain.entities import PagedResponse
+
+T = TypeVar("T")
+
+# (offset, limit) -> zmapowana strona albo None (błąd upstreamu, już zalogowany)
+PageFetcher = Callable[[int, int], Awaitable[Optional[PagedResponse[T]]]]
+
+
+class PrefetchingPager(Generic[T]):
+    def __init__(self, fetch_page: PageFetcher, paging: PagingConfig):
+        self._fetch_page = fetch_page
+        self._paging = paging
+        self.page_size = paging.page_size
+        self.total_count = 0
+        self.last_page: Optional[PagedResponse[T]] = None
+        # False, dopóki nie przejdziemy wszystkich stron (np. upstream zwrócił błąd)
+        self.complete = False
+
+    async def _timed_fetch(
+        self, offset: int, limit: int
+    ) -> Tuple[int, Optional[PagedResponse[T]], float]:
+        started = perf_counter()
+        page = await self._fetch_page(offset, limit)
+        return limit, page, perf_counter() - started
+
+    def _adapt(self, limit: int, items: int, seconds: float) -> None:
+        target = self._paging.target_page_seconds
+        if target <= 0 or items == 0 or seconds <= 0:
+            return
+        ideal = items * target / seconds
+        size = min(limit * 2, max(limit // 2, ideal))
+        self.page_size = int(min(self._paging.max_page_size, max(1, size)))
+
+    async def pages(self) -> AsyncIterator[List[T]]:
+        in_flight: Deque[asyncio.Future] = deque()  # w kolejności offsetów
+        next_offset = 0
+
+        def submit() -> None:
+            nonlocal next_offset
+            limit = self.page_size
+            if self.total_count > 0:
+                limit = min(limit, self.total_count - next_offset)
+            in_flight.append(asyncio.ensure_future(self._timed_fetch(next_offset, limit)))
+            next_offset += limit
+
+        try:
+            submit()
+            while in_flight:
+                limit, page, seconds = await in_flight.popleft()
+                if page is None:
+                    return
+
+                self.last_page = page
+                self.total_count = page.total_count or self.total_count
+                self._adapt(limit, len(page.items), seconds)
+                if page.items:
+                    yield page.items
+
+                if len(page.items) < limit:
+                    break
+
+                if self.total_count > 0:
+                    while (
+                        len(in_flight) < self._paging.prefetch_pages
+                        and next_offset < self.total_count
+                    ):
+                        submit()
+                elif not in_flight:
+                    submit()
+
+            self.complete = True
+        finally:
+            for future in in_flight:
+                future.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+from contextlib import aclosing
 from datetime import datetime
 from typing import Optional, AsyncIterator, List, Union
-import os
 import grpc
 
 from src.adapters.grpc.client.baseGrpc import BaseGrpcClient
+from src.adapters.grpc.client.paging import PrefetchingPager
 from src.di.ports.adapters.simulation_engine_port import SimulationEnginePort
 from src.core import get_logger, SimulationGrpcConfig, config as app_config
 from src.domain.entities import SimulationOverview, PagedResponse
@@ -17,11 +18,6 @@ from src.generatedSimulationProtos.SimulationService.SimulationEngine import (
 
 logger = get_logger(__name__)
 
-try:
-    BATCH_LIMIT = int(os.getenv("GRPC_PAGINATION_LIMIT", "100"))
-except ValueError:
-    BATCH_LIMIT = 100
-
 
 class SimulationEngineClient(BaseGrpcClient, SimulationEnginePort):
     """
@@ -43,10 +39,11 @@ class SimulationEngineClient(BaseGrpcClient, SimulationEnginePort):
                 sorting_method=None,
             )
 
-            resp = await self.stub.GetAllSimulationOverviews(
-                req,
-                timeout=self.grpc_config.timeout_seconds,
-            )
+            with self._observe_rpc("GetAllSimulationOverviews"):
+                resp = await self.stub.GetAllSimulationOverviews(
+                    req,
+                    timeout=self.grpc_config.timeout_seconds,
+                )
 
             items = [
                 SimulationOverview(
@@ -75,25 +72,20 @@ class SimulationEngineClient(BaseGrpcClient, SimulationEnginePort):
     async def get_all_paged_simulation_overviews(
         self,
     ) -> AsyncIterator[SimulationOverview]:
-        current_offset = 0
-
-        while True:
-            page = await self.get_paged_simulation_overviews(
-                offset=current_offset,
-                limit=BATCH_LIMIT,
-            )
-
-            if not page or not page.items:
-                logger.warning("No simulation overviews or empty page.")
-                break
-
-            for item in page.items:
-                yield item
+        pager = PrefetchingPager(
+            lambda offset, limit: self.get_paged_simulation_overviews(
+                offset=offset, limit=limit
+            ),
+            app_config.paging,
+        )
 
-            if len(page.items) < BATCH_LIMIT:
-                break
+        async with aclosing(pager.pages()) as pages:
+            async for items in pages:
+                for item in items:
+                    yield item
 
-            current_offset += BATCH_LIMIT
+        if not pager.complete or pager.last_page is None or not pager.last_page.items:
+            logger.warning("No simulation overviews or empty page.")
 
     async def get_latest_simulationIds_by_date(
         self, latest_date: Union[str, datetime]
@@ -112,10 +104,11 @@ class SimulationEngineClient(BaseGrpcClient, SimulationEnginePort):
         )
 
         try:
-            result = await self.stub.GetLatestSimulationIds(
-                request,
-                timeout=self.grpc_config.timeout_seconds,
-            )
+            with self._observe_rpc("GetLatestSimulationIds"):
+                result = await self.stub.GetLatestSimulationIds(
+                    request,
+                    timeout=self.grpc_config.timeout_seconds,
+                )
         except grpc.RpcError as e:
             logger.exception(
                 "GetLatestSimulationIds failed",
@@ -1,6 +1,7 @@
 import json
 import grpc
 from src.core.logger import get_logger
+from src.core.profiler import profiler
 from src.di.ports.simulation_service_port import SimulationServicePort
 from src.domain.entities import PredictRequest, IterationResult
 from src.domain.features.mapper import Mapper
@@ -29,16 +30,21 @@ class PredictServiceServicer(service_pb2_grpc.PredictServiceServicer):
                 games_to_reach_trust=getattr(grpc_data, "games_to_reach_trust")
             )
 
-            async for status, iteration_result, counter in self._simulation_service.run_prediction_stream(domain_req):
-                if context.cancelled():
-                    logger.info("Stream cancelled for simulation_id=%s", domain_req.simulation_id)
-                    return
+            with profiler.profile_call():
+                async for status, iteration_result, counter, standard_error in self._simulation_service.run_prediction_stream(domain_req):
+                    if context.cancelled():
+                        logger.info("Stream cancelled for simulation_id=%s", domain_req.simulation_id)
+                        return
 
-                yield Mapper.map_to_predict_response(
-                    status=status,
-                    iteration_result=iteration_result,
-                    counter=counter,
-                )
+                    # PredictResponse nie ma pola na precyzję - osiągnięty SE idzie w trailing metadata
+                    if standard_error is not None:
+                        context.set_trailing_metadata((("standard-error", repr(standard_error)),))
+
+                    yield Mapper.map_to_predict_response(
+                        status=status,
+                        iteration_result=iteration_result,
+                        counter=counter,
+                    )
         except Exception:
             logger.exception("StreamPrediction crashed")
             raise
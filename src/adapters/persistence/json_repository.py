@@ -16,9 +16,9 @@ class JsonFileRepository:
         if not self.storage_path.exists():
             try:
                 self.storage_path.mkdir(parents=True, exist_ok=True)
-                logger.info(f"Created persistence directory: {self.storage_path}")
+                logger.info("Created persistence directory: %s", self.storage_path)
             except OSError as e:
-                logger.error(f"Failed to create persistence directory {self.storage_path}: {e}")
+                logger.error("Failed to create persistence directory %s: %s", self.storage_path, e)
                 raise
 
     def get_full_path(self, filename: str) -> Path:
@@ -37,10 +37,10 @@ class JsonFileRepository:
 
             # 2. Atomowa podmiana (rename jest operacją atomową w POSIX)
             os.replace(temp_path, target_path)
-            logger.debug(f"Successfully saved JSON to {target_path}")
+            logger.debug("Successfully saved JSON to %s", target_path)
 
         except Exception as e:
-            logger.error(f"Failed to save JSON file {filename}: {e}")
+            logger.error("Failed to save JSON file %s: %s", filename, e)
             if temp_path.exists():
                 os.remove(temp_path)
             raise
@@ -49,17 +49,17 @@ class JsonFileRepository:
         target_path = self.get_full_path(filename)
 
         if not target_path.exists():
-            logger.warning(f"File {filename} not found in {self.storage_path}")
+            logger.warning("File %s not found in %s", filename, self.storage_path)
             return None
 
         try:
             with open(target_path, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except json.JSONDecodeError as e:
-            logger.error(f"Corrupted JSON file {filename}: {e}")
+            logger.error("Corrupted JSON file %s: %s", filename, e)
             raise
         except Exception as e:
-            logger.error(f"Error loading {filename}: {e}")
+            logger.error("Error loading %s: %s", filename, e)
             raise
 
     def delete(self, filename: str) -> bool:
@@ -67,9 +67,9 @@ class JsonFileRepository:
         try:
             if target_path.exists():
                 os.remove(target_path)
-                logger.info(f"Deleted file {filename}")
+                logger.info("Deleted file %s", filename)
                 return True
             return False
         except OSError as e:
-            logger.error(f"Error deleting {filename}: {e}")
+            logger.error("Error deleting %s: %s", filename, e)
             return False
\ No newline at end of file
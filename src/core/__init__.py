@@ -1,9 +1,31 @@
-from src.core.config import SportsDataGrpcConfig, SimulationGrpcConfig, config
-from src.core.logger import get_logger
+from src.core.config import (
+    PagingConfig,
+    PredictionConfig,
+    SportsDataGrpcConfig,
+    SimulationGrpcConfig,
+    TrainingConfig,
+    XgboostConfig,
+    config,
+)
+from src.core.logger import (
+    aggregate_warnings,
+    aggregated_stream,
+    get_logger,
+    log_aggregated,
+    shutdown_logging,
+)
 
 __all__ = [
     "SportsDataGrpcConfig",
     "SimulationGrpcConfig",
+    "PagingConfig",
+    "PredictionConfig",
+    "XgboostConfig",
+    "TrainingConfig",
     "config",
     "get_logger",
+    "aggregate_warnings",
+    "aggregated_stream",
+    "log_aggregated",
+    "shutdown_logging",
 ]
@@ -0,0 +1,87 @@
+"""
+Single-flight z paczkami: dla danego klucza najwyżej jedno wywołanie naraz.
+
+Zgłoszenia przychodzące w trakcie wywołania nie dołączają do niego (nie zawiera ich
+elementów, np. nowych symulacji), tylko do jednej paczki na następne wywołanie - z sumą
+elementów wszystkich zgłoszeń. Wszyscy w paczce dostają ten sam wynik (albo wyjątek).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Sequence, TypeVar
+
+from src.core.metrics import SINGLE_FLIGHT_CALLS
+
+I = TypeVar("I")
+T = TypeVar("T")
+
+
+class _Batch(Generic[I, T]):
+    __slots__ = ("fn", "items", "task")
+
+    def __init__(self, fn: Callable[[List[I]], Awaitable[T]]):
+        self.fn = fn
+        self.items: List[I] = []
+        self.task: Optional[asyncio.Task] = None
+
+
+class BatchedFlight(Generic[I, T]):
+    def __init__(self, name: str):
+        self.name = name
+        self._running: Dict[Hashable, asyncio.Task] = {}
+        # paczka czekająca na koniec trwającego wywołania (jeszcze otwarta)
+        self._pending: Dict[Hashable, _Batch[I, T]] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._running or key in self._pending
+
+    async def do(
+        self, key: Hashable, items: Sequence[I], fn: Callable[[List[I]], Awaitable[T]]
+    ) -> T:
+        """
+        Wynik `fn(elementy paczki)`; paczka zawiera `items`. Gdy dla `key` czeka już
+        paczka - dokładamy do niej (wywoła się `fn` jej założyciela).
+        """
+        batch = self._pending.get(key)
+        if batch is None:
+            SINGLE_FLIGHT_CALLS.inc(name=self.name, role="leader")
+            batch = _Batch(fn)
+            self._pending[key] = batch
+            batch.task = asyncio.ensure_future(self._run(key, batch))
+            batch.task.add_done_callback(_retrieve_exception)
+        else:
+            SINGLE_FLIGHT_CALLS.inc(name=self.name, role="shared")
+        batch.items.extend(item for item in items if item not in batch.items)
+        # shield: anulowanie jednego czekającego nie przerywa wywołania pozostałym
+        return await asyncio.shield(batch.task)
+
+    async def join(self, key: Hashable) -> Optional[T]:
+        """Wynik najnowszego zaplanowanego wywołania dla `key` albo None, gdy nic nie trwa."""
+        batch = self._pending.get(key)
+        task = batch.task if batch is not None else self._running.get(key)
+        if task is None:
+            return None
+        SINGLE_FLIGHT_CALLS.inc(name=self.name, role="shared")
+        return await asyncio.shield(task)
+
+    async def _run(self, key: Hashable, batch: _Batch[I, T]) -> T:
+        previous = self._running.get(key)
+        if previous is not None:
+            await asyncio.wait([previous])
+        # od tej chwili paczka jest zamknięta - kolejne zgłoszenia tworzą następną
+        if self._pending.get(key) is batch:
+            del self._pending[key]
+        task = batch.task
+        self._running[key] = task
+        try:
+            return await batch.fn(list(batch.items))
+        finally:
+            if self._running.get(key) is task:
+                del self._running[key]
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    # wyjątek odebrany także, gdy wszyscy czekający zostali anulowani
+    if not task.cancelled():
+        task.exception()
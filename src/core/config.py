@@ -21,14 +21,168 @@ class SportsDataGrpcConfig:
     server_host: str = os.getenv("SPORTSDATA_GRPC_SERVER_HOST", "localhost")
     server_port: int = int(os.getenv("SPORTSDATA_GRPC_SERVER_PORT", "40033"))
     timeout_seconds: float = float(os.getenv("SPORTSDATA_GRPC_TIMEOUT", "30"))
+    # jak długo topologia ligi jest brana z pamięci bez pytania o rundy (0 = pytamy zawsze)
+    topology_ttl_seconds: float = float(os.getenv("SPORTSDATA_TOPOLOGY_TTL_SECONDS", "60"))
+
+    def __post_init__(self):
+        if self.topology_ttl_seconds < 0:
+            raise ValueError("SPORTSDATA_TOPOLOGY_TTL_SECONDS must be >= 0")
 
     @property
     def address(self) -> str:
         return f"{self.server_host}:{self.server_port}"
 
+@dataclass(frozen=True)
+class PagingConfig:
+    # rozmiar pierwszej strony w klientach gRPC (dalej dopasowywany do czasu odpowiedzi)
+    page_size: int = int(os.getenv("GRPC_PAGINATION_LIMIT", "100"))
+    # ile stron naraz w locie, gdy znamy total_count (1 = strona po stronie)
+    prefetch_pages: int = int(os.getenv("GRPC_PREFETCH_PAGES", "4"))
+    # docelowy czas jednej strony; 0 = stały rozmiar strony
+    target_page_seconds: float = float(os.getenv("GRPC_TARGET_PAGE_SECONDS", "0.5"))
+    max_page_size: int = int(os.getenv("GRPC_MAX_PAGE_SIZE", "1000"))
+
+    def __post_init__(self):
+        if self.page_size <= 0 or self.prefetch_pages <= 0 or self.max_page_size < self.page_size:
+            raise ValueError(
+                "GRPC_PAGINATION_LIMIT and GRPC_PREFETCH_PAGES must be > 0 "
+                "and GRPC_MAX_PAGE_SIZE >= GRPC_PAGINATION_LIMIT"
+            )
+        if self.target_page_seconds < 0:
+            raise ValueError("GRPC_TARGET_PAGE_SECONDS must be >= 0")
+
+GOAL_SAMPLING_MODES = ("round", "poisson")
+# redukcja wariancji losowania Poisson (goal_sampling="poisson"):
+# none = rng.poisson, crn = odwrotna dystrybuanta z U(0,1) per (seed, iteracja, mecz),
+# antithetic = crn + pary iteracji (u, 1 - u), stratified = crn + warstwy U w blokach iteracji
+VARIANCE_REDUCTION_MODES = ("none", "crn", "antithetic", "stratified")
+MULTI_STRATEGIES = ("one_output_per_tree", "multi_output_tree")
+
+@dataclass(frozen=True)
+class PredictionConfig:
+    # 0 = predykcja w procesie serwera; N > 0 = pula N procesów dla długich streamów
+    workers: int = int(os.getenv("PREDICTION_WORKERS", "0"))
+    # sharding włącza się dopiero od workers * shard_min_iterations iteracji
+    shard_min_iterations: int = int(os.getenv("PREDICTION_SHARD_MIN_ITERATIONS", "100"))
+    # iteracje w jednym zadaniu puli (granulacja streamu)
+    shard_chunk_size: int = int(os.getenv("PREDICTION_SHARD_CHUNK_SIZE", "25"))
+    # round = round(lambda) (deterministycznie), poisson = losowanie Poisson(lambda) per mecz
+    goal_sampling: str = os.getenv("PREDICTION_GOAL_SAMPLING", "round").strip()
+    variance_reduction: str = os.getenv("PREDICTION_VARIANCE_REDUCTION", "none").strip()
+    # liczba warstw (= rozmiar bloku iteracji) dla variance_reduction="stratified"
+    strata: int = int(os.getenv("PREDICTION_STRATA", "64"))
+    # liczba miejsc spadkowych w podsumowaniach (PredictionSummary.teams[].relegation)
+    relegation_places: int = int(os.getenv("PREDICTION_RELEGATION_PLACES", "3"))
+    # wczesne zatrzymanie: błąd standardowy P(mistrzostwo)/P(spadek) <= tolerance (0 = wyłączone)
+    convergence_tolerance: float = float(os.getenv("PREDICTION_CONVERGENCE_TOLERANCE", "0"))
+    convergence_check_every: int = int(os.getenv("PREDICTION_CONVERGENCE_CHECK_EVERY", "500"))
+    convergence_min_iterations: int = int(os.getenv("PREDICTION_CONVERGENCE_MIN_ITERATIONS", "1000"))
+    # cache wyników identycznych streamów (LRU, liczba streamów; 0 = wyłączony, bez łączenia requestów)
+    cache_entries: int = int(os.getenv("PREDICTION_CACHE_ENTRIES", "0"))
+    # dłuższe streamy nie są cache'owane ani łączone (bufor w pamięci)
+    cache_max_iterations: int = int(os.getenv("PREDICTION_CACHE_MAX_ITERATIONS", "10000"))
+    # katalog na wpisy wypchnięte z pamięci ("" = bez dysku) i limit plików
+    cache_spill_dir: str = os.getenv("PREDICTION_CACHE_SPILL_DIR", "").strip()
+    cache_spill_entries: int = int(os.getenv("PREDICTION_CACHE_SPILL_ENTRIES", "100"))
+
+    def __post_init__(self):
+        if self.goal_sampling not in GOAL_SAMPLING_MODES:
+            raise ValueError(
+                f"PREDICTION_GOAL_SAMPLING must be one of {GOAL_SAMPLING_MODES}, "
+                f"got {self.goal_sampling!r}"
+            )
+        if self.variance_reduction not in VARIANCE_REDUCTION_MODES:
+            raise ValueError(
+                f"PREDICTION_VARIANCE_REDUCTION must be one of {VARIANCE_REDUCTION_MODES}, "
+                f"got {self.variance_reduction!r}"
+            )
+        if self.strata <= 0:
+            raise ValueError("PREDICTION_STRATA must be > 0")
+        if self.workers < 0 or self.shard_chunk_size <= 0:
+            raise ValueError("PREDICTION_WORKERS must be >= 0 and PREDICTION_SHARD_CHUNK_SIZE > 0")
+        if self.convergence_tolerance < 0 or self.convergence_check_every <= 0:
+            raise ValueError(
+                "PREDICTION_CONVERGENCE_TOLERANCE must be >= 0 and PREDICTION_CONVERGENCE_CHECK_EVERY > 0"
+            )
+        if self.cache_entries < 0 or self.cache_max_iterations < 0 or self.cache_spill_entries < 0:
+            raise ValueError(
+                "PREDICTION_CACHE_ENTRIES, PREDICTION_CACHE_MAX_ITERATIONS and "
+                "PREDICTION_CACHE_SPILL_ENTRIES must be >= 0"
+            )
+
+    def use_shards(self, iteration_count: int) -> bool:
+        return self.workers > 0 and iteration_count >= self.workers * self.shard_min_iterations
+
+@dataclass(frozen=True)
+class XgboostConfig:
+    # górny limit drzew; przy early stopping zwykle trenujemy mniej
+    n_estimators: int = int(os.getenv("XGB_N_ESTIMATORS", "100"))
+    # rundy bez poprawy na zbiorze testowym (split czasowy) przed zatrzymaniem (0 = wyłączone);
+    # zbiór testowy służy wtedy do wyboru liczby drzew, więc nie jest już niezależną oceną
+    early_stopping_rounds: int = int(os.getenv("XGB_EARLY_STOPPING_ROUNDS", "0"))
+    # "" = domyślny tree_method XGBoost (parametr nie jest przekazywany)
+    tree_method: str = os.getenv("XGB_TREE_METHOD", "").strip()
+    # liczba kubełków histogramu cech (hist / QuantileDMatrix)
+    max_bin: int = int(os.getenv("XGB_MAX_BIN", "256"))
+    # trening na jednej QuantileDMatrix (float32) współdzielonej przez modele home/away
+    quantile_dmatrix: bool = os.getenv("XGB_QUANTILE_DMATRIX", "False").strip() == "True"
+    # jeden booster z dwukolumnowym targetem (home, away) zamiast dwóch modeli
+    joint_model: bool = os.getenv("XGB_JOINT_MODEL", "False").strip() == "True"
+    multi_strategy: str = os.getenv("XGB_MULTI_STRATEGY", "one_output_per_tree").strip()
+    # liczba starszych wersji modeli ligi trzymanych w rejestrze (STORAGE_DIR/models);
+    # poprzednia wersja zostaje zawsze (może być jeszcze wczytywana)
+    registry_retention: int = int(os.getenv("XGB_REGISTRY_RETENTION", "3"))
+
+    def __post_init__(self):
+        if self.n_estimators <= 0 or self.early_stopping_rounds < 0:
+            raise ValueError("XGB_N_ESTIMATORS must be > 0 and XGB_EARLY_STOPPING_ROUNDS >= 0")
+        if self.max_bin < 2:
+            raise ValueError("XGB_MAX_BIN must be >= 2")
+        if self.quantile_dmatrix and self.tree_method != "hist":
+            raise ValueError("XGB_QUANTILE_DMATRIX requires XGB_TREE_METHOD=hist")
+        if self.joint_model and self.tree_method != "hist":
+            raise ValueError("XGB_JOINT_MODEL requires XGB_TREE_METHOD=hist")
+        if self.multi_strategy not in MULTI_STRATEGIES:
+            raise ValueError(f"XGB_MULTI_STRATEGY must be one of {MULTI_STRATEGIES}")
+        if self.registry_retention < 0:
+            raise ValueError("XGB_REGISTRY_RETENTION must be >= 0")
+
+@dataclass(frozen=True)
+class TrainingConfig:
+    # zwijanie identycznych wierszy (cechy, gole, runda) w jeden z wagą (sample_weight)
+    compaction: bool = os.getenv("TRAINING_COMPACTION", "True").strip() == "True"
+    # limit wierszy po próbkowaniu (reservoir per runda, przed kompakcją); 0 = bez limitu
+    max_rows: int = int(os.getenv("TRAINING_MAX_ROWS", "0"))
+    # waga symulacji maleje o połowę co N nowszych symulacji (0 = wszystkie równo)
+    recency_half_life: float = float(os.getenv("TRAINING_RECENCY_HALF_LIFE", "0"))
+    # trening w tle co N sekund (nowe symulacje -> nowe modele); 0 = trening na ścieżce requestu
+    scheduler_interval_seconds: float = float(
+        os.getenv("TRAINING_SCHEDULER_INTERVAL_SECONDS", "0")
+    )
+
+    def __post_init__(self):
+        if self.max_rows < 0 or self.recency_half_life < 0:
+            raise ValueError("TRAINING_MAX_ROWS and TRAINING_RECENCY_HALF_LIFE must be >= 0")
+        if self.scheduler_interval_seconds < 0:
+            raise ValueError("TRAINING_SCHEDULER_INTERVAL_SECONDS must be >= 0")
+
+@dataclass(frozen=True)
+class IdsConfig:
+    # próg rejestru UUID -> int; po przekroczeniu id są dalej dodawane, ale z ostrzeżeniem i metryką
+    max_entries: int = int(os.getenv("IDS_MAX_ENTRIES", "200000"))
+
+    def __post_init__(self):
+        if self.max_entries <= 0:
+            raise ValueError("IDS_MAX_ENTRIES must be > 0")
+
 @dataclass(frozen=True)
 class AppConfig:
     simulation_grpc: SimulationGrpcConfig = field(default_factory=SimulationGrpcConfig)
     sportsdata_grpc: SportsDataGrpcConfig = field(default_factory=SportsDataGrpcConfig)
+    paging: PagingConfig = field(default_factory=PagingConfig)
+    prediction: PredictionConfig = field(default_factory=PredictionConfig)
+    xgboost: XgboostConfig = field(default_factory=XgboostConfig)
+    training: TrainingConfig = field(default_factory=TrainingConfig)
+    ids: IdsConfig = field(default_factory=IdsConfig)
 
 config = AppConfig()
@@ -1,9 +1,77 @@
+import asyncio
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+from contextlib import aclosing, contextmanager
+from contextvars import ContextVar
+from time import monotonic
+from typing import AsyncIterator, Callable, Dict, Hashable, Iterator, Optional, Set, Tuple, TypeVar
+
+T = TypeVar("T")
 
 # Prosty logger aplikacyjny. Python logging to standardowa biblioteka. [web:19]
 _LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 
+# LOG_ASYNC=True: handlery tylko wrzucają rekord do kolejki, a formatowanie i zapis
+# do stderr robi osobny wątek (QueueListener) - logowanie nie blokuje pętli predykcji.
+_raw_LOG_ASYNC = os.getenv("LOG_ASYNC", "False").strip()
+if _raw_LOG_ASYNC not in ("True", "False"):
+    raise ValueError(f"LOG_ASYNC must be True/False, got {_raw_LOG_ASYNC!r}")
+_LOG_ASYNC = _raw_LOG_ASYNC == "True"
+
+# Minimalny odstęp (s) między powtórzeniami tego samego ostrzeżenia poza scope agregacji.
+_LOG_RATE_LIMIT_SECONDS = float(os.getenv("LOG_RATE_LIMIT_SECONDS", "10"))
+
+_FORMAT = "%(asctime)s %(levelname)s %(name)s - %(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue: Optional[queue.SimpleQueue] = None
+_listener_lock = threading.Lock()
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler bez formatowania w wątku wołającym (domyślny prepare() robi
+    record.getMessage()). Kolejka jest in-process, więc rekord nie musi być picklowalny.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _stream_handler() -> logging.Handler:
+    handler = logging.StreamHandler()
+    handler.setLevel(_LOG_LEVEL)
+    handler.setFormatter(logging.Formatter(_FORMAT))
+    return handler
+
+
+def _queue_handler() -> logging.Handler:
+    global _listener, _queue
+    with _listener_lock:
+        if _listener is None:
+            _queue = queue.SimpleQueue()
+            _listener = logging.handlers.QueueListener(
+                _queue, _stream_handler(), respect_handler_level=True
+            )
+            _listener.start()
+            atexit.register(shutdown_logging)
+    handler = _DeferredQueueHandler(_queue)
+    handler.setLevel(_LOG_LEVEL)
+    return handler
+
+
+def shutdown_logging() -> None:
+    """Opróżnia kolejkę i zatrzymuje wątek QueueListener (no-op bez LOG_ASYNC)."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
 
 def get_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
@@ -11,13 +79,165 @@ def get_logger(name: str) -> logging.Logger:
         return logger  # już skonfigurowany
 
     logger.setLevel(_LOG_LEVEL)
-    handler = logging.StreamHandler()
-    handler.setLevel(_LOG_LEVEL)
-
-    formatter = logging.Formatter(
-        "%(asctime)s %(levelname)s %(name)s - %(message)s"
-    )
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    logger.addHandler(_queue_handler() if _LOG_ASYNC else _stream_handler())
     logger.propagate = False
     return logger
+
+
+# ---------- agregowane / limitowane ostrzeżenia dla gorących pętli ----------
+
+
+class WarningAggregator:
+    """
+    Zlicza powtarzające się ostrzeżenia w obrębie jednego scope (np. streamu predykcji)
+    i emituje je jako jedno podsumowanie przy flush().
+    """
+
+    def __init__(self, logger: logging.Logger, scope: str):
+        self._logger = logger
+        self._scope = scope
+        # event -> (count, subjects, subject_label)
+        self._events: Dict[str, Tuple[int, Set[Hashable], str]] = {}
+
+    def record(self, event: str, subject: Hashable, subject_label: str) -> None:
+        count, subjects, _ = self._events.get(event, (0, set(), subject_label))
+        subjects.add(subject)
+        self._events[event] = (count + 1, subjects, subject_label)
+
+    def count(self, event: str) -> int:
+        entry = self._events.get(event)
+        return entry[0] if entry else 0
+
+    def events(self) -> Dict[str, Tuple[int, Set[Hashable], str]]:
+        """Zliczenia do przeniesienia do innego scope (np. z procesu roboczego)."""
+        return dict(self._events)
+
+    def merge(self, events: Dict[str, Tuple[int, Set[Hashable], str]]) -> None:
+        for event, (count, subjects, subject_label) in events.items():
+            current, current_subjects, _ = self._events.get(event, (0, set(), subject_label))
+            self._events[event] = (current + count, current_subjects | subjects, subject_label)
+
+    def flush(self) -> None:
+        for event, (count, subjects, subject_label) in self._events.items():
+            self._logger.warning(
+                "%s used %s times for %s %s in this %s",
+                event,
+                f"{count:,}",
+                len(subjects),
+                subject_label,
+                self._scope,
+            )
+        self._events.clear()
+
+
+_current_aggregator: ContextVar[Optional[WarningAggregator]] = ContextVar(
+    "simpitchml_warning_aggregator", default=None
+)
+_rate_limit_state: Dict[Tuple[str, str], Tuple[float, int]] = {}
+_rate_limit_lock = threading.Lock()
+
+
+@contextmanager
+def aggregate_warnings(
+    logger: logging.Logger, scope: str, flush: bool = True
+) -> Iterator[WarningAggregator]:
+    """
+    Scope, w którym log_aggregated() tylko zlicza zdarzenia; podsumowanie jest
+    logowane raz przy wyjściu (flush=False - zliczenia odbiera wołający przez
+    events()). Działa per task asyncio (ContextVar), więc nie obejmuje yieldów
+    async generatora - do streamów jest aggregated_stream().
+    """
+    aggregator = WarningAggregator(logger, scope)
+    token = _current_aggregator.set(aggregator)
+    try:
+        yield aggregator
+    finally:
+        _current_aggregator.reset(token)
+        if flush:
+            aggregator.flush()
+
+
+def merge_aggregated(
+    logger: logging.Logger, scope: str, events: Dict[str, Tuple[int, Set[Hashable], str]]
+) -> None:
+    """
+    Dolicza zdarzenia z innego scope (WarningAggregator.events()) do bieżącego
+    aggregate_warnings(); poza scope - od razu jedno podsumowanie dla `scope`.
+    """
+    if not events:
+        return
+    aggregator = _current_aggregator.get()
+    if aggregator is None:
+        aggregator = WarningAggregator(logger, scope)
+        aggregator.merge(events)
+        aggregator.flush()
+        return
+    aggregator.merge(events)
+
+
+async def aggregated_stream(
+    logger: logging.Logger, scope: str, stream_factory: Callable[[], AsyncIterator[T]]
+) -> AsyncIterator[T]:
+    """
+    aggregate_warnings() dla async generatora: generator chodzi w osobnym tasku
+    (własna kopia kontekstu), więc scope nie przecieka do konsumenta między yieldami.
+    Producent wyprzedza konsumenta najwyżej o jeden element.
+    """
+    items: asyncio.Queue = asyncio.Queue(maxsize=1)
+
+    async def produce() -> None:
+        try:
+            with aggregate_warnings(logger, scope):
+                async with aclosing(stream_factory()) as stream:
+                    async for item in stream:
+                        await items.put((True, item))
+        except Exception as exc:
+            await items.put((False, exc))
+        else:
+            await items.put((False, None))
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            ok, value = await items.get()
+            if not ok:
+                if value is not None:
+                    raise value
+                return
+            yield value
+    finally:
+        # konsument skończył wcześniej (break / rozłączenie) - zamykamy generator w tasku
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+
+
+def log_aggregated(
+    logger: logging.Logger,
+    event: str,
+    subject: Hashable,
+    subject_label: str = "teams",
+) -> None:
+    """
+    Ostrzeżenie z gorącej pętli. W scope aggregate_warnings() - tylko licznik;
+    poza nim - najwyżej jeden wpis na LOG_RATE_LIMIT_SECONDS (z liczbą pominiętych).
+    """
+    aggregator = _current_aggregator.get()
+    if aggregator is not None:
+        aggregator.record(event, subject, subject_label)
+        return
+
+    if not logger.isEnabledFor(logging.WARNING):
+        return
+
+    key = (logger.name, event)
+    now = monotonic()
+    with _rate_limit_lock:
+        last_emit, suppressed = _rate_limit_state.get(key, (None, 0))
+        if last_emit is not None and now - last_emit < _LOG_RATE_LIMIT_SECONDS:
+            _rate_limit_state[key] = (last_emit, suppressed + 1)
+            return
+        _rate_limit_state[key] = (now, 0)
+
+    logger.warning(
+        "%s (%s=%s, %s similar suppressed)", event, subject_label, subject, suppressed
+    )
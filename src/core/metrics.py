@@ -0,0 +1,337 @@
+"""
+Lekka instrumentacja in-process (counters/histograms) eksportowana w formacie
+Prometheus text exposition (``GET /metrics``).
+
+Celowo bez zależności od ``prometheus_client`` - potrzebujemy tylko kilku metryk
+na gorących ścieżkach, a koszt pojedynczej obserwacji to jeden lock + kilka
+porównań z granicami bucketów.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import math
+import threading
+from abc import ABC, abstractmethod
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Sekundy; pokrywa zakres od pojedynczego predict (sub-ms) do treningu modeli (minuty).
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    rendered = ",".join(f'{k}="{_escape_label_value(str(v))}"' for k, v in pairs)
+    return f"{{{rendered}}}" if rendered else ""
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(
+                f"Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            )
+        try:
+            return tuple(str(labels[n]) for n in self.labelnames)
+        except KeyError as e:
+            raise ValueError(f"Missing label {e} for metric {self.name}") from None
+
+    def _header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+    @abstractmethod
+    def collect(self) -> List[str]:
+        """Linie text exposition dla tej metryki (HELP/TYPE + próbki)."""
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("Counter can only be incremented by a non-negative amount.")
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._label_values(labels), 0.0)
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = self._header()
+        for key, value in items:
+            labels = _format_labels(zip(self.labelnames, key))
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_labels", "_start")
+
+    def __init__(self, histogram: "Histogram", labels: Dict[str, str]):
+        self._histogram = histogram
+        self._labels = labels
+        self._start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._histogram.observe(perf_counter() - self._start, **self._labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        upper = sorted(float(b) for b in buckets)
+        if not upper or upper[-1] != math.inf:
+            upper.append(math.inf)
+        self.buckets: Tuple[float, ...] = tuple(upper)
+        # key -> [counts per bucket (non-cumulative)..., sum, count]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._label_values(labels)
+        idx = 0
+        for idx, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = [0.0] * (len(self.buckets) + 2)
+                self._values[key] = state
+            state[idx] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def time(self, **labels: str) -> _Timer:
+        """Context manager mierzący czas bloku (perf_counter) i zapisujący obserwację."""
+        return _Timer(self, labels)
+
+    def count(self, **labels: str) -> int:
+        with self._lock:
+            state = self._values.get(self._label_values(labels))
+            return int(state[-1]) if state else 0
+
+    def sum(self, **labels: str) -> float:
+        with self._lock:
+            state = self._values.get(self._label_values(labels))
+            return state[-2] if state else 0.0
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = self._header()
+        for key, state in items:
+            base = list(zip(self.labelnames, key))
+            cumulative = 0.0
+            for bound, bucket_count in zip(self.buckets, state):
+                cumulative += bucket_count
+                labels = _format_labels(base + [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+            labels = _format_labels(base)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(state[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, *args, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def timed(histogram: Histogram, **labels: str) -> Callable:
+    """Dekorator mierzący czas wywołania funkcji (sync lub async)."""
+
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with histogram.time(**labels):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with histogram.time(**labels):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# ---------- metryki aplikacji ----------
+
+GRPC_CLIENT_LATENCY = registry.histogram(
+    "simpitchml_grpc_client_request_seconds",
+    "Latency of outgoing gRPC calls (including stream consumption).",
+    ("method",),
+)
+GRPC_CLIENT_ERRORS = registry.counter(
+    "simpitchml_grpc_client_errors_total",
+    "Failed outgoing gRPC calls.",
+    ("method",),
+)
+DATASET_BUILD_LATENCY = registry.histogram(
+    "simpitchml_dataset_build_seconds",
+    "Time spent building training rows from a single iteration result.",
+)
+DATASET_ROWS = registry.counter(
+    "simpitchml_dataset_rows_total",
+    "Training rows produced by TrainingBuilder.",
+)
+DATASET_COMPACTED_ROWS = registry.counter(
+    "simpitchml_dataset_compacted_rows_total",
+    "Weighted training rows left after collapsing identical rows.",
+)
+MODEL_OPERATION_LATENCY = registry.histogram(
+    "simpitchml_model_operation_seconds",
+    "Time spent loading, training, saving and analytically predicting with XGBoost models.",
+    ("operation",),
+)
+SCHEDULED_TRAININGS = registry.counter(
+    "simpitchml_scheduled_trainings_total",
+    "League trainings run by the background training scheduler.",
+    ("status",),
+)
+SINGLE_FLIGHT_CALLS = registry.counter(
+    "simpitchml_single_flight_calls_total",
+    "Calls coordinated by BatchedFlight; role=shared joined a pending batch or call.",
+    ("name", "role"),
+)
+PREDICTION_CACHE_REQUESTS = registry.counter(
+    "simpitchml_prediction_cache_requests_total",
+    "Cacheable prediction streams by result: hit, coalesced (joined a running stream) or miss.",
+    ("result",),
+)
+PREDICT_ITERATION_LATENCY = registry.histogram(
+    "simpitchml_predict_iteration_seconds",
+    "Time spent predicting a single iteration of a prediction stream.",
+)
+PREDICT_ITERATIONS = registry.counter(
+    "simpitchml_predict_iterations_total",
+    "Iterations produced by prediction streams.",
+)
+PREDICTION_EARLY_STOPS = registry.counter(
+    "simpitchml_prediction_early_stops_total",
+    "Prediction streams stopped early by the convergence criterion.",
+)
+PREDICTION_STANDARD_ERROR = registry.histogram(
+    "simpitchml_prediction_standard_error",
+    "Achieved standard error of title/relegation probabilities at stream end.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.02, 0.05, 0.1),
+)
+ID_REGISTRY_OVERFLOW = registry.counter(
+    "simpitchml_id_registry_overflow_total",
+    "Ids interned after the id registry passed IDS_MAX_ENTRIES.",
+)
+SERIALIZATION_LATENCY = registry.histogram(
+    "simpitchml_serialization_seconds",
+    "Time spent serializing domain objects to transport messages.",
+    ("target",),
+)
@@ -0,0 +1,175 @@
+"""
+Profilowanie na żądanie dla strumieni predykcji (cProfile).
+
+Profiler jest "uzbrajany" z API administracyjnego na N kolejnych wywołań
+strumieni predykcji (gRPC ``StreamPrediction``, REST ``/simulations/predict``
+i ``/simulations/predict/summary``) albo na okno czasowe. Gdy nie jest uzbrojony,
+koszt dla strumienia to jedno sprawdzenie flagi przy starcie wywołania.
+
+Uwaga: cProfile działa per wątek, a strumienie współdzielą pętlę asyncio,
+więc w czasie profilowania zbierane są też inne korutyny z tej samej pętli.
+Nie jest natomiast widoczne nic, co biegnie poza wątkiem pętli: trening modeli
+przez ``asyncio.to_thread`` ani shardy predykcji w puli procesów
+(``PREDICTION_WORKERS`` > 0) - w profilu widać tylko czekanie na ich wynik.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import pstats
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Dict, Iterator, List, Optional
+
+
+@dataclass(frozen=True)
+class ProfiledFunction:
+    function: str
+    file: str
+    line: int
+    primitive_calls: int
+    total_calls: int
+    total_time: float
+    cumulative_time: float
+
+
+class StreamProfiler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._profile: Optional[cProfile.Profile] = None
+        self._stats: Optional[pstats.Stats] = None
+        self._active_streams = 0
+        self._remaining_calls = 0
+        self._deadline: Optional[float] = None
+        self._profiled_calls = 0
+
+    # ---------- sterowanie ----------
+
+    def arm(self, *, calls: Optional[int] = None, seconds: Optional[float] = None) -> None:
+        """Uzbraja profiler na `calls` kolejnych wywołań i/lub na `seconds` sekund."""
+        if not calls and not seconds:
+            raise ValueError("Either calls or seconds must be provided.")
+        if (calls is not None and calls < 0) or (seconds is not None and seconds < 0):
+            raise ValueError("calls and seconds must be non-negative.")
+
+        with self._lock:
+            self._remaining_calls = int(calls or 0)
+            self._deadline = monotonic() + float(seconds) if seconds else None
+
+    def disarm(self) -> None:
+        with self._lock:
+            self._remaining_calls = 0
+            self._deadline = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = None
+            self._profiled_calls = 0
+
+    @property
+    def armed(self) -> bool:
+        if self._remaining_calls > 0:
+            return True
+        deadline = self._deadline
+        return deadline is not None and monotonic() < deadline
+
+    def status(self) -> Dict[str, Any]:
+        deadline = self._deadline
+        return {
+            "armed": self.armed,
+            "remaining_calls": self._remaining_calls,
+            "remaining_seconds": (
+                max(0.0, deadline - monotonic()) if deadline is not None else None
+            ),
+            "active_streams": self._active_streams,
+            "profiled_calls": self._profiled_calls,
+        }
+
+    # ---------- profilowanie ----------
+
+    def _try_start(self) -> bool:
+        with self._lock:
+            if self._remaining_calls > 0:
+                self._remaining_calls -= 1
+            elif self._deadline is None or monotonic() >= self._deadline:
+                self._deadline = None
+                return False
+
+            self._profiled_calls += 1
+            self._active_streams += 1
+            if self._profile is None:
+                self._profile = cProfile.Profile()
+                self._profile.enable()
+            return True
+
+    def _stop(self) -> None:
+        with self._lock:
+            self._active_streams -= 1
+            if self._active_streams > 0 or self._profile is None:
+                return
+
+            self._profile.disable()
+            if self._stats is None:
+                self._stats = pstats.Stats(self._profile)
+            else:
+                self._stats.add(self._profile)
+            self._profile = None
+
+    @contextmanager
+    def profile_call(self) -> Iterator[bool]:
+        """
+        Profiluje blok, jeśli profiler jest uzbrojony. Zwraca True, gdy blok jest profilowany.
+        Współbieżne wywołania dzielą jeden cProfile.Profile (ten sam wątek pętli).
+        """
+        if not self.armed or not self._try_start():
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            self._stop()
+
+    def hot_functions(
+        self,
+        *,
+        limit: int = 25,
+        sort_by: str = "cumulative",
+        match: Optional[str] = None,
+    ) -> List[ProfiledFunction]:
+        with self._lock:
+            stats = self._stats
+            if stats is None:
+                return []
+            raw = dict(stats.stats)  # type: ignore[attr-defined]
+
+        items: List[ProfiledFunction] = []
+        for (file, line, name), (cc, nc, tt, ct, _callers) in raw.items():
+            if match and match not in name and match not in file:
+                continue
+            items.append(
+                ProfiledFunction(
+                    function=name,
+                    file=file,
+                    line=line,
+                    primitive_calls=cc,
+                    total_calls=nc,
+                    total_time=tt,
+                    cumulative_time=ct,
+                )
+            )
+
+        key = {
+            "cumulative": lambda f: f.cumulative_time,
+            "tottime": lambda f: f.total_time,
+            "calls": lambda f: f.total_calls,
+        }.get(sort_by)
+        if key is None:
+            raise ValueError(f"Unsupported sort_by={sort_by!r}")
+
+        items.sort(key=key, reverse=True)
+        return items[:limit]
+
+
+profiler = StreamProfiler()
@@ -0,0 +1,14 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # opcjonalne - szybsze kodowanie długich streamów REST
+    orjson = None
+
+
+def json_line(obj: Any) -> bytes:
+    """Jedna linia NDJSON (z "\\n"); orjson, gdy jest zainstalowany, inaczej json."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
@@ -1,4 +1,4 @@
-from typing import Optional, Protocol
+from typing import AsyncIterator, List, Optional, Protocol
 
 from src.domain.entities import IterationResult, PagedResponse
 
@@ -7,6 +7,12 @@ class IterationResultPort(Protocol):
     async def get_all_iterationResults_BySimulationId(
         self, simulation_id: str
     ) -> Optional[PagedResponse[IterationResult]]: ...
+    async def get_iterationResults_page_BySimulationId(
+        self, simulation_id: str, offset: int, limit: int
+    ) -> Optional[PagedResponse[IterationResult]]: ...
+    def iter_iterationResults_BySimulationId(
+        self, simulation_id: str
+    ) -> AsyncIterator[List[IterationResult]]: ...
     async def send_iteration_result(
         self, iteration_result: IterationResult
     ) -> bool: ...
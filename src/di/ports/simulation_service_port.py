@@ -1,26 +1,55 @@
 from typing import AsyncIterator, Dict, List, Optional, Protocol, Tuple
 
 from src.domain.entities import (
+    AnalyticPrediction,
     InitPrediction,
     IterationResult,
-    LeagueRound,
+    LeagueTopology,
+    MatchRound,
     PagedResponse,
-    PredictRequest
+    PredictRequest,
+    PredictionSummary,
+    SimulationOverview,
+    TrainedModels,
 )
 
 
 class SimulationServicePort(Protocol):
     async def run_prediction_stream(
         self, predict_request: PredictRequest
-    ) -> AsyncIterator[Tuple[str, Optional[IterationResult], int]]: ...
+    ) -> AsyncIterator[Tuple[str, Optional[IterationResult], int, Optional[float]]]: ...
+    def run_prediction_summary_stream(
+        self,
+        predict_request: PredictRequest,
+        progress_every: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[str, PredictionSummary, int]]: ...
+    async def run_outcome_probabilities(
+        self, predict_request: PredictRequest
+    ) -> AnalyticPrediction: ...
     async def init_prediction(
         self,
         predict_request: PredictRequest,
-        rounds: List[LeagueRound],
-        prev_round_id_by_round_id: Dict[str, str],
+        topology: LeagueTopology,
+        all_match_rounds: List[MatchRound],
     ) -> InitPrediction: ...
+    async def simulations_for_league(
+        self, predict_request: PredictRequest, list_simulation_ids: List[str]
+    ) -> List[str]: ...
+    async def train_league(
+        self, predict_request: PredictRequest, list_simulation_ids: List[str]
+    ) -> TrainedModels: ...
     async def run_all_overview_scenario(self): ...
     async def run_get_iterationResults_by_simulationId(
         self, simulation_id: str
     ) -> Optional[PagedResponse[IterationResult]]: ...
+    async def run_get_iterationResults_page(
+        self, simulation_id: str, offset: int, limit: int
+    ) -> Optional[PagedResponse[IterationResult]]: ...
+    def iter_iterationResults_by_simulationId(
+        self, simulation_id: str
+    ) -> AsyncIterator[List[IterationResult]]: ...
+    async def run_simulation_overviews_page(
+        self, offset: int, limit: int
+    ) -> Optional[PagedResponse[SimulationOverview]]: ...
+    def iter_simulation_overviews(self) -> AsyncIterator[SimulationOverview]: ...
     async def get_pending_simulations_to_sync(self) -> List[str]: ...
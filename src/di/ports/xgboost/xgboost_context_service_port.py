@@ -1,11 +1,18 @@
 import xgboost as xgb
 from typing import Optional, Protocol, Tuple
 
+from src.domain.entities import TrainedModels
+
 
 class XgboostContextServicePort(Protocol):
     def save_league_model(self, model: xgb.Booster, league_id: str): ...
     def save_league_models(
         self, model_home: xgb.Booster, model_away: xgb.Booster, league_id: str
-    ): ...
+    ) -> int: ...
     def load_league_model(self, league_id: str) -> Optional[xgb.Booster]: ...
     def load_league_models(self, league_id: str) -> Tuple[xgb.Booster, xgb.Booster]: ...
+    def save_league_joint_model(self, model_joint: xgb.Booster, league_id: str) -> int: ...
+    def load_league_joint_model(self, league_id: str) -> Optional[xgb.Booster]: ...
+    def active_models(self, league_id: str) -> Optional[TrainedModels]: ...
+    def activate_models(self, league_id: str, version: int, models: TrainedModels) -> None: ...
+    def model_version(self, league_id: str) -> Optional[int]: ...
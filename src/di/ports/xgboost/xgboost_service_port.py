@@ -1,38 +1,44 @@
-from typing import List, Optional, Protocol, Tuple
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional, Protocol, Tuple
+
+import numpy as np
 
 from src.domain.entities import (
-    InitPrediction,
+    AnalyticPrediction,
     IterationResult,
-    MatchRound,
     PredictRequest,
-    TeamStrength,
     TrainedModels,
     TrainingData,
     TrainingDataset,
 )
 
+if TYPE_CHECKING:  # port nie importuje warstwy serwisów w runtime
+    from src.services.xgboost.prediction_engine import PredictionEngine
+
 
 class XgboostServicePort(Protocol):
     async def train_evaluate_and_save(
         self, predictRequest: PredictRequest, t_dataset: TrainingDataset
     ) -> TrainedModels: ...
+    def train_and_save(
+        self, predictRequest: PredictRequest, t_dataset: TrainingDataset
+    ) -> TrainedModels: ...
+    def model_version(self, league_id: str) -> Optional[int]: ...
     async def get_evaluated_models(
         self, predictRequest: PredictRequest
     ) -> TrainedModels: ...
+    async def get_trained_models(
+        self, predictRequest: PredictRequest
+    ) -> Optional[TrainedModels]: ...
     async def get_model(self, predictRequest: PredictRequest): ...
     async def predict_results(
-        self,
-        predictRequest: PredictRequest,
-        init_prediction: InitPrediction,
-        iteration_index: int,
-        models: TrainedModels,
+        self, engine: "PredictionEngine", iteration_index: int
     ) -> IterationResult: ...
-    async def predict_single_result(
-        self,
-        match_round: MatchRound,
-        home_strength: Optional[TeamStrength],
-        away_strength: Optional[TeamStrength],
-        prev_round_id: str,
-        predictRequest: PredictRequest,
-        models: TrainedModels,
-    ) -> Tuple[MatchRound, Tuple[TeamStrength, TeamStrength]]: ...
+    def predict_results_sharded(
+        self, engine: "PredictionEngine"
+    ) -> AsyncIterator[IterationResult]: ...
+    def iterate_goals(
+        self, engine: "PredictionEngine"
+    ) -> AsyncIterator[Tuple[int, np.ndarray, np.ndarray]]: ...
+    async def predict_outcome_probabilities(
+        self, engine: "PredictionEngine"
+    ) -> AnalyticPrediction: ...
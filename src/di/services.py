@@ -1,3 +1,6 @@
+from contextlib import asynccontextmanager
+from typing import AsyncContextManager, AsyncIterator, Callable
+
 from fastapi import Depends
 from src.adapters.grpc.client.iteration_result import IterationResultClient
 from src.adapters.grpc.client.league_round import LeagueRoundClient
@@ -86,6 +89,38 @@ def get_simulation_service(
         engine, iteration_results, synchronization, sportsdata_service, xgboost_service
     )
 
+@asynccontextmanager
+async def simulation_service_scope() -> AsyncIterator[SimulationServicePort]:
+    """
+    SimulationService z klientami gRPC zamykanymi na końcu bloku `async with`.
+    Dla StreamingResponse: zależności z yield FastAPI zamyka przed wysłaniem body,
+    więc stream musi sam trzymać swoje kanały.
+    """
+    clients = (
+        SimulationEngineClient(),
+        IterationResultClient(),
+        LeagueRoundClient(),
+        MatchRoundClient(),
+    )
+    engine, iteration_results, league_round, match_round = clients
+    repo = get_json_repo()
+    try:
+        yield get_simulation_service(
+            engine,
+            iteration_results,
+            get_synchronization_service(repo),
+            get_sportsdata_service(league_round, match_round),
+            get_xgboost_service(get_xgboost_context_service(repo)),
+        )
+    finally:
+        for client in clients:
+            await client.close()
+
+
+def get_simulation_service_scope() -> Callable[[], AsyncContextManager[SimulationServicePort]]:
+    return simulation_service_scope
+
+
 def get_predict_grpc_servicer(
     simulation_service: SimulationServicePort = Depends(get_simulation_service),
 ) -> PredictServiceServicer:
@@ -5,6 +5,7 @@ from dataclasses import dataclass, asdict, field, replace
 from itertools import chain
 from typing import (
     Any,
+    ClassVar,
     DefaultDict,
     Dict,
     Generic,
@@ -19,16 +20,19 @@ import json
 import uuid
 
 
+import numpy as np
 import pandas as pd
-from xgboost import XGBRegressor
+from xgboost import Booster, XGBRegressor
 
 T = TypeVar("T")
 
 from src.core import get_logger
+from src.domain.ids import EMPTY_ID, GUID_EMPTY, ids
 
 logger = get_logger(__name__)
 
 
+
 @dataclass(frozen=True)
 class SimulationOverview:
     id: str
@@ -46,19 +50,15 @@ class IterationResult:
     execution_time: str
     team_strengths: List[TeamStrength]
     simulated_match_rounds: List[MatchRound]
+    # wynik predykcji: gole per mecz z `fixtures` (MatchRound materializowane leniwie)
+    fixtures: Optional[MatchFixtures] = None
+    home_goals: Optional[np.ndarray] = None
+    away_goals: Optional[np.ndarray] = None
 
-    @staticmethod
-    def team_strengths_to_json_value(team_strengths: List[TeamStrength]) -> str:
-        """Convert List[TeamStrength] to JSON string."""
-        # asdict rekurencyjnie konwertuje nested dataclasses na dict
-        dict_list = [asdict(ts) for ts in team_strengths]
-        return json.dumps(dict_list, indent=2)
-
-    @staticmethod
-    def simulated_match_rounds_to_json_value(match_rounds: List[MatchRound]) -> str:
-        """Convert List[MatchRound] to JSON string."""
-        dict_list = [asdict(mr) for mr in match_rounds]
-        return json.dumps(dict_list, indent=2)
+    def match_rounds(self) -> List[MatchRound]:
+        if self.simulated_match_rounds is None and self.fixtures is not None:
+            return self.fixtures.to_match_rounds(self.home_goals, self.away_goals)
+        return self.simulated_match_rounds or []
 
     @staticmethod
     def from_team_strength_raw_list(
@@ -71,7 +71,7 @@ class IterationResult:
             try:
                 data = json.loads(data)
             except json.JSONDecodeError:
-                logger.error(f"Failed to decode TeamStrength JSON: {data[:100]}...")
+                logger.error("Failed to decode TeamStrength JSON: %s...", data[:100])
                 return []
 
         # Dict[str, List[...]] -> flatten
@@ -85,7 +85,7 @@ class IterationResult:
             data = flattened
 
         if not isinstance(data, list):
-            logger.error(f"Unexpected TeamStrength payload type: {type(data)}")
+            logger.error("Unexpected TeamStrength payload type: %s", type(data))
             return []
 
         result: List[TeamStrength] = []
@@ -97,9 +97,8 @@ class IterationResult:
             posterior = item.get("Posterior") or item.get("posterior") or {}
 
             ts = TeamStrength(
-                team_id=item.get("TeamId")
-                or item.get("team_id")
-                or str(uuid.UUID(int=0)),
+                team_id=ids.to_int(item.get("TeamId") or item.get("team_id"))
+                or EMPTY_ID,
                 likelihood=StrengthItem(
                     offensive=float(
                         likelihood.get("Offensive")
@@ -134,9 +133,8 @@ class IterationResult:
                 last_update=item.get("LastUpdate")
                 or item.get("last_update")
                 or "2001-01-01T05:14:36.246303",
-                round_id=item.get("RoundId")
-                or item.get("round_id")
-                or str(uuid.UUID(int=0)),
+                round_id=ids.to_int(item.get("RoundId") or item.get("round_id"))
+                or EMPTY_ID,
                 season_stats=SeasonStats.map_from_grpc(item.get("SeasonStats")),
             )
 
@@ -151,13 +149,13 @@ class IterationResult:
     @staticmethod
     def from_team_strength_raw_dict(
         data: Union[str, List[Dict[str, Any]], Dict[str, Any]],
-    ) -> Dict[str, List[TeamStrength]]:
+    ) -> Dict[int, List[TeamStrength]]:
         # 1) użyj Twojej logiki parsowania -> List[TeamStrength]
         item_list: List[TeamStrength] = IterationResult.from_team_strength_raw_list(
             data
         )
 
-        grouped: DefaultDict[str, List[TeamStrength]] = defaultdict(list)
+        grouped: DefaultDict[int, List[TeamStrength]] = defaultdict(list)
         for ts in item_list:
             if not ts.team_id:
                 continue
@@ -183,12 +181,11 @@ class IterationResult:
 
         return [
             MatchRound(
-                id=item.get("Id") or item.get("id") or str(uuid.UUID(int=0)),
-                round_id=item.get("RoundId")
-                or item.get("round_id")
-                or str(uuid.UUID(int=0)),
-                home_team_id=item.get("HomeTeamId") or item.get("home_team_id"),
-                away_team_id=item.get("AwayTeamId") or item.get("away_team_id"),
+                id=item.get("Id") or item.get("id") or GUID_EMPTY,
+                round_id=ids.to_int(item.get("RoundId") or item.get("round_id"))
+                or EMPTY_ID,
+                home_team_id=ids.to_int(item.get("HomeTeamId") or item.get("home_team_id")),
+                away_team_id=ids.to_int(item.get("AwayTeamId") or item.get("away_team_id")),
                 home_goals=item.get("HomeGoals", 0),
                 away_goals=item.get("AwayGoals", 0),
                 is_draw=item.get("IsDraw", False),
@@ -208,12 +205,12 @@ class IterationResult:
         return json.dumps(data_dict, indent=4, default=str)
 
 
-@dataclass(frozen=False)
+@dataclass(frozen=False, slots=True)
 class MatchRound:
-    id: str
-    round_id: str
-    home_team_id: str
-    away_team_id: str
+    id: str  # id meczu zostaje UUID stringiem (nie jest internowane, zob. ids.py)
+    round_id: int
+    home_team_id: int
+    away_team_id: int
     home_goals: int
     away_goals: int
     is_draw: bool
@@ -222,36 +219,205 @@ class MatchRound:
 
 @dataclass(frozen=True)
 class LeagueRound:
-    id: str
-    league_id: str
+    id: int
+    league_id: int
     season_year: str
     round: int
 
 
-@dataclass(frozen=False)
+@dataclass(frozen=True, eq=False)
+class LeagueTopology:
+    """
+    Kolejność rund ligi policzona raz (per liga i zestaw rund) i współdzielona przez
+    trening i predykcję. Indeks rundy = pozycja w `round_ids` (rundy posortowane po `round`),
+    -1 oznacza brak rundy (np. poprzedniej dla pierwszej kolejki).
+    """
+
+    league_id: int
+    rounds: Tuple[LeagueRound, ...]
+    round_ids: Tuple[int, ...]
+    round_nos: Tuple[int, ...]
+    prev_index: Tuple[int, ...]
+    next_index: Tuple[int, ...]
+    index_by_round_id: Dict[int, int]
+    round_no_by_round_id: Dict[int, int]
+    round_id_by_round_no: Dict[int, int]
+    prev_round_id_by_round_id: Dict[int, int]
+    signature: Tuple[Tuple[int, int], ...]
+
+    @staticmethod
+    def signature_of(rounds: List[LeagueRound]) -> Tuple[Tuple[int, int], ...]:
+        """Wersja ligi: zmienia się, gdy dochodzi/znika runda albo zmienia się jej numer."""
+        return tuple(sorted((r.id, r.round) for r in rounds))
+
+    @staticmethod
+    def from_rounds(league_id: int, rounds: List[LeagueRound]) -> "LeagueTopology":
+        ordered = tuple(sorted(rounds, key=lambda r: r.round))
+        round_ids = tuple(r.id for r in ordered)
+        round_nos = tuple(r.round for r in ordered)
+
+        index_by_round_no = {no: i for i, no in enumerate(round_nos)}
+        prev_index = tuple(index_by_round_no.get(no - 1, -1) for no in round_nos)
+        next_index = tuple(index_by_round_no.get(no + 1, -1) for no in round_nos)
+
+        return LeagueTopology(
+            league_id=league_id,
+            rounds=ordered,
+            round_ids=round_ids,
+            round_nos=round_nos,
+            prev_index=prev_index,
+            next_index=next_index,
+            index_by_round_id={rid: i for i, rid in enumerate(round_ids)},
+            round_no_by_round_id=dict(zip(round_ids, round_nos)),
+            round_id_by_round_no=dict(zip(round_nos, round_ids)),
+            prev_round_id_by_round_id={
+                rid: round_ids[p] if p >= 0 else EMPTY_ID
+                for rid, p in zip(round_ids, prev_index)
+            },
+            signature=LeagueTopology.signature_of(rounds),
+        )
+
+    def __len__(self) -> int:
+        return len(self.round_ids)
+
+    def round_index(self, round_id: int) -> int:
+        return self.index_by_round_id.get(round_id, -1)
+
+    def prev_round_id(self, round_id: int) -> int:
+        """Poprzednia runda; Guid.Empty (EMPTY_ID), gdy runda jest pierwsza lub nieznana."""
+        return self.prev_round_id_by_round_id.get(round_id, EMPTY_ID)
+
+    def round_indices(self, match_rounds: List["MatchRound"]) -> List[int]:
+        """Mapowanie mecz -> indeks rundy (w kolejności `match_rounds`)."""
+        index_by_round_id = self.index_by_round_id
+        return [index_by_round_id.get(m.round_id, -1) for m in match_rounds]
+
+
+MAX_GOALS = 15  # górna granica goli jednej drużyny w meczu (clamp predykcji, histogramy)
+
+
+def _frozen_array(values: Iterable[int]) -> np.ndarray:
+    array = np.fromiter(values, dtype=np.int64)
+    array.flags.writeable = False
+    return array
+
+
+@dataclass(frozen=True, eq=False)
+class MatchFixtures:
+    """
+    `matches_to_simulate` zamienione raz per request na niemutowalne tablice
+    (pozycja = mecz w kolejności symulacji). Iteracje nie modyfikują obiektów z requestu -
+    wynik iteracji to tablice goli, a MatchRound powstaje dopiero przy serializacji.
+    """
+
+    match_ids: Tuple[str, ...]
+    round_ids: np.ndarray
+    home_team_ids: np.ndarray
+    away_team_ids: np.ndarray
+    team_ids: Tuple[int, ...]  # indeks drużyny -> team_id
+    home_idx: np.ndarray
+    away_idx: np.ndarray
+    round_idx: np.ndarray  # indeks rundy w LeagueTopology (-1 = spoza topologii)
+    prev_round_idx: np.ndarray
+    prev_round_ids: np.ndarray  # EMPTY_ID, gdy brak poprzedniej rundy
+    source: Tuple[MatchRound, ...]  # kopie meczów z requestu (tylko do odczytu, fallback siły)
+
+    ARRAY_FIELDS: ClassVar[Tuple[str, ...]] = (
+        "round_ids",
+        "home_team_ids",
+        "away_team_ids",
+        "home_idx",
+        "away_idx",
+        "round_idx",
+        "prev_round_idx",
+        "prev_round_ids",
+    )
+
+    @staticmethod
+    def from_match_rounds(
+        match_rounds: List[MatchRound], topology: LeagueTopology
+    ) -> "MatchFixtures":
+        source = tuple(replace(m) for m in match_rounds)
+
+        index_by_team_id: Dict[int, int] = {}
+        for m in source:
+            index_by_team_id.setdefault(m.home_team_id, len(index_by_team_id))
+            index_by_team_id.setdefault(m.away_team_id, len(index_by_team_id))
+
+        round_idx = topology.round_indices(list(source))
+        prev_round_idx = [
+            topology.prev_index[i] if i >= 0 else -1 for i in round_idx
+        ]
+
+        return MatchFixtures(
+            match_ids=tuple(m.id for m in source),
+            round_ids=_frozen_array(m.round_id for m in source),
+            home_team_ids=_frozen_array(m.home_team_id for m in source),
+            away_team_ids=_frozen_array(m.away_team_id for m in source),
+            team_ids=tuple(index_by_team_id),
+            home_idx=_frozen_array(index_by_team_id[m.home_team_id] for m in source),
+            away_idx=_frozen_array(index_by_team_id[m.away_team_id] for m in source),
+            round_idx=_frozen_array(round_idx),
+            prev_round_idx=_frozen_array(prev_round_idx),
+            prev_round_ids=_frozen_array(
+                topology.prev_round_id(m.round_id) for m in source
+            ),
+            source=source,
+        )
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+    def to_match_rounds(
+        self, home_goals: np.ndarray, away_goals: np.ndarray
+    ) -> List[MatchRound]:
+        """Materializuje rozegrane MatchRound z tablic goli jednej iteracji."""
+        return [
+            MatchRound(
+                id=match_id,
+                round_id=round_id,
+                home_team_id=home_team_id,
+                away_team_id=away_team_id,
+                home_goals=hg,
+                away_goals=ag,
+                is_draw=hg == ag,
+                is_played=True,
+            )
+            for match_id, round_id, home_team_id, away_team_id, hg, ag in zip(
+                self.match_ids,
+                self.round_ids.tolist(),
+                self.home_team_ids.tolist(),
+                self.away_team_ids.tolist(),
+                np.asarray(home_goals).tolist(),
+                np.asarray(away_goals).tolist(),
+            )
+        ]
+
+
+@dataclass(frozen=False, slots=True)
 class StrengthItem:
     offensive: float
     defensive: float
 
 
-@dataclass(frozen=False)
+@dataclass(frozen=False, slots=True)
 class TeamStrength:
-    team_id: str
+    team_id: int
     likelihood: StrengthItem
     posterior: StrengthItem
     expected_goals: float
     last_update: str
-    round_id: str
+    round_id: int
     season_stats: SeasonStats = field(
-        default_factory=lambda: SeasonStats.empty(team_id=str(uuid.UUID(int=0)))
+        default_factory=lambda: SeasonStats.empty(team_id=EMPTY_ID)
     )
     # ^ default_factory
 
     @staticmethod
     def strength_map_from_list(
         items: List[TeamStrength],
-    ) -> Dict[Tuple[str, str], List[TeamStrength]]:
-        grouped: DefaultDict[Tuple[str, str], List[TeamStrength]] = defaultdict(list)
+    ) -> Dict[Tuple[int, int], List[TeamStrength]]:
+        grouped: DefaultDict[Tuple[int, int], List[TeamStrength]] = defaultdict(list)
 
         for ts in items:
             if not ts.team_id or not ts.round_id:
@@ -265,7 +431,7 @@ class TeamStrength:
 
     @staticmethod
     def strength_map_to_list(
-        strength_map: Dict[Tuple[str, str], List["TeamStrength"]],
+        strength_map: Dict[Tuple[int, int], List["TeamStrength"]],
     ) -> List["TeamStrength"]:
         def as_list(
             v: Union[List["TeamStrength"], "TeamStrength"],
@@ -276,9 +442,9 @@ class TeamStrength:
 
     @staticmethod
     def strength_map_from_dict(
-        items: Dict[str, List[TeamStrength]],
-    ) -> Dict[Tuple[str, str], List[TeamStrength]]:
-        grouped: DefaultDict[Tuple[str, str], List[TeamStrength]] = defaultdict(list)
+        items: Dict[int, List[TeamStrength]],
+    ) -> Dict[Tuple[int, int], List[TeamStrength]]:
+        grouped: DefaultDict[Tuple[int, int], List[TeamStrength]] = defaultdict(list)
 
         for team_strengths in items.values():
             for ts in team_strengths:
@@ -293,9 +459,9 @@ class TeamStrength:
 
     @staticmethod
     def add_to_strength_map(
-        strength_map: Dict[Tuple[str, str], "TeamStrength"],
+        strength_map: Dict[Tuple[int, int], "TeamStrength"],
         ts: "TeamStrength",
-    ) -> Dict[Tuple[str, str], "TeamStrength"]:
+    ) -> Dict[Tuple[int, int], "TeamStrength"]:
         if not isinstance(ts, TeamStrength):
             raise TypeError(f"Expected TeamStrength, got {type(ts).__name__}")
 
@@ -306,27 +472,27 @@ class TeamStrength:
 
     @classmethod
     def merge_strength_maps(
-        cls, *maps: Dict[Tuple[str, str], "TeamStrength"]
-    ) -> Dict[Tuple[str, str], "TeamStrength"]:
-        combined: Dict[Tuple[str, str], TeamStrength] = {}
+        cls, *maps: Dict[Tuple[int, int], "TeamStrength"]
+    ) -> Dict[Tuple[int, int], "TeamStrength"]:
+        combined: Dict[Tuple[int, int], TeamStrength] = {}
         for m in maps:
             combined.update(m)
         return combined
 
     # @staticmethod
-    # def strength_map_to_list(strength_map: Dict[Tuple[str, str], "TeamStrength"]) -> List###["TeamStrength"]:
+    # def strength_map_to_list(strength_map: Dict[Tuple[int, int], "TeamStrength"]) -> List###["TeamStrength"]:
     #     return list(strength_map.values())
 
     @staticmethod
     def get_team_strength_average_baseline(
-        round_id: str = str(uuid.UUID(int=0)),
+        round_id: int = EMPTY_ID,
         last_update: str = "2001-01-01T22:00:00.000000",
         expected_goals: float = 1.0,
         offensive: float = 1.0,
         defensive: float = 1.0,
-        team_id: str = str(uuid.UUID(int=0)),
+        team_id: int = EMPTY_ID,
         season_year: int = 3,  # enum seasonYear has 3 as 2025/2026
-        league_id: str = str(uuid.UUID(int=0)),
+        league_id: int = EMPTY_ID,
         league_strength: float = 1.0,
     ) -> "TeamStrength":
         return TeamStrength(
@@ -345,11 +511,79 @@ class TeamStrength:
                 season_year=season_year,
                 league_id=league_id,
                 league_strength=league_strength,
-                id=str(uuid.uuid4()),
+                id=None,  # resolved lazily, see SeasonStats.resolved_id
             ),
         )
 
-    def with_round_meta(self, round_id: str, last_update: str) -> "TeamStrength":
+    def with_match_result(
+        self,
+        goals_for: int,
+        goals_against: int,
+        *,
+        team_id: int,
+        round_id: int,
+        last_update: str,
+        games_to_reach_trust: int,
+        league_strength: float,
+    ) -> "TeamStrength":
+        """
+        Jeden krok aktualizacji siły po meczu - odpowiednik
+        with_round_meta().with_incremented_stats().with_likelihood().with_posterior(),
+        ale bez pośrednich kopii (jeden SeasonStats + jeden TeamStrength) i bez uuid4:
+        SeasonStats.id zostaje None i jest wyznaczane dopiero przy serializacji.
+        """
+        if goals_for is None or goals_against is None:
+            raise ValueError(f"Home goals or away goals are null. TeamId:{team_id}")
+        if games_to_reach_trust <= 0:
+            raise ValueError("games_to_reach_trust must be greater than zero.")
+
+        ss = self.season_stats
+        matches_played = ss.matches_played + 1
+        wins, losses, draws = ss.wins, ss.losses, ss.draws
+        if goals_for > goals_against:
+            wins += 1
+        elif goals_for < goals_against:
+            losses += 1
+        else:
+            draws += 1
+        total_for = ss.goals_for + goals_for
+        total_against = ss.goals_against + goals_against
+
+        beta_0 = float(games_to_reach_trust)
+        updated_league_strength = (float(league_strength) + float(ss.league_strength)) / 2.0
+        alpha_0 = beta_0 * updated_league_strength
+        posterior_beta = beta_0 + float(matches_played)
+        posterior_offensive = (alpha_0 + float(total_for)) / posterior_beta
+
+        return TeamStrength(
+            team_id=self.team_id,
+            likelihood=StrengthItem(
+                offensive=total_for / matches_played,
+                defensive=total_against / matches_played,
+            ),
+            posterior=StrengthItem(
+                offensive=posterior_offensive,
+                defensive=(alpha_0 + float(total_against)) / posterior_beta,
+            ),
+            expected_goals=posterior_offensive,
+            last_update=last_update,
+            round_id=round_id,
+            season_stats=SeasonStats(
+                id=None,
+                team_id=team_id,
+                season_year=ss.season_year,
+                league_id=ss.league_id,
+                league_strength=updated_league_strength,
+                matches_played=matches_played,
+                wins=wins,
+                losses=losses,
+                draws=draws,
+                goals_for=total_for,
+                goals_against=total_against,
+            ),
+        )
+
+    def with_round_meta(self, round_id: int, last_update: str) -> "TeamStrength":
         return replace(self, round_id=round_id, last_update=last_update)
 
     def with_incremented_stats(
@@ -397,12 +631,16 @@ class TeamStrength:
         )
 
 
-@dataclass(frozen=False)
+# Namespace dla deterministycznych SeasonStats.id (uuid5), gdy brak namespace iteracji.
+SEASON_STATS_ID_NAMESPACE = uuid.UUID("6f1c2a52-3a8e-4c8e-9a55-5d0c1b7e2f10")
+
+
+@dataclass(frozen=False, slots=True)
 class SeasonStats:
-    id: str
-    team_id: str
+    id: Optional[str]
+    team_id: int
     season_year: str
-    league_id: str
+    league_id: int
     league_strength: float
     matches_played: int
     wins: int
@@ -414,11 +652,11 @@ class SeasonStats:
     @staticmethod
     def empty(
         *,
-        team_id: str,
+        team_id: int,
         season_year: int = 3,
-        league_id: str = str(uuid.UUID(int=0)),
+        league_id: int = EMPTY_ID,
         league_strength: float = 1.0,
-        id: str = str(uuid.UUID(int=0)),
+        id: Optional[str] = str(uuid.UUID(int=0)),
     ) -> "SeasonStats":
         return SeasonStats(
             id=id,
@@ -438,9 +676,9 @@ class SeasonStats:
     def map_from_grpc(item: Any) -> "SeasonStats":
         return SeasonStats(
             id=item.get("Id"),
-            team_id=item.get("TeamId"),
+            team_id=ids.to_int(item.get("TeamId")),
             season_year=item.get("SeasonYear"),
-            league_id=item.get("LeagueId"),
+            league_id=ids.to_int(item.get("LeagueId")),
             league_strength=item.get("LeagueStrength"),
             matches_played=item.get("MatchesPlayed"),
             wins=item.get("Wins"),
@@ -494,6 +732,21 @@ class SeasonStats:
             goals_against=goals_against,
         )
 
+    def resolved_id(self, namespace: Optional[uuid.UUID] = None) -> str:
+        """
+        Id do serializacji. Statystyki tworzone w gorącej pętli mają id=None - wtedy id jest
+        deterministycznym uuid5 ze stanu drużyny w obrębie namespace (np. id iteracji).
+        """
+        if self.id is not None:
+            return self.id
+        return str(
+            uuid.uuid5(
+                namespace or SEASON_STATS_ID_NAMESPACE,
+                f"{ids.to_str(self.team_id)}:{ids.to_str(self.league_id)}"
+                f":{self.season_year}:{self.matches_played}",
+            )
+        )
+
     @staticmethod
     def merge(accumulator: "SeasonStats", new_data: "SeasonStats") -> "SeasonStats":
         if accumulator.team_id != new_data.team_id:
@@ -563,8 +816,8 @@ class TrainingData:
     To jest wyjście uczące dla modelu 'away goals'.
     """
 
-    prev_round_id: str
-    """Identyfikator rundy (UUID) wskazujący snapshot wejściowych sił drużyn użyty do zbudowania x_row.
+    prev_round_id: int
+    """Identyfikator rundy (UUID, jako int z rejestru ids) wskazujący snapshot wejściowych sił drużyn użyty do zbudowania x_row.
     W Twoim modelu TeamStrength jest stanem *po meczu*, więc żeby przewidzieć mecz rundy N,
     budujesz cechy z TeamStrength z rundy N-1 — i właśnie tę rundę reprezentuje prev_round_id.
     
@@ -574,6 +827,11 @@ class TrainingData:
       bez mieszania przyszłości z przeszłością.
     """
 
+    weight: float = 1.0
+    """Waga próbki (sample_weight) - liczba identycznych wierszy zwiniętych w ten jeden
+    przez TrainingCompactor. Suma wag = liczba wierszy przed kompakcją.
+    """
+
 
 @dataclass(frozen=True)
 class PredictRequest:
@@ -581,7 +839,7 @@ class PredictRequest:
     league_id: str
     iteration_count: int
     team_strengths: Dict[
-        str, List[TeamStrength]
+        int, List[TeamStrength]
     ]  # remember -  List[TeamStrength] in IterationResult
     matches_to_simulate: List[MatchRound]
     train_until_round_no: int
@@ -589,13 +847,25 @@ class PredictRequest:
     seed: Optional[int] = None
     train_ratio: Optional[float] = None
     games_to_reach_trust: Optional[int] = None
+    goal_sampling: Optional[str] = None  # None = config.prediction.goal_sampling
+    variance_reduction: Optional[str] = None  # None = config.prediction.variance_reduction
+    # None = config.prediction.convergence_tolerance, 0 = zawsze iteration_count iteracji
+    convergence_tolerance: Optional[float] = None
 
 
 @dataclass(frozen=True)
 class TrainedModels:
-    home: XGBRegressor
-    away: XGBRegressor
+    home: Optional[XGBRegressor]
+    away: Optional[XGBRegressor]
     feature_schema: list[str]
+    # najlepsza iteracja z early stopping ("home"/"away"/"joint", 0-based); brak = wszystkie drzewa
+    best_iterations: Dict[str, int] = field(default_factory=dict)
+    # XGB_JOINT_MODEL: jeden booster (home, away) zamiast home/away
+    joint: Optional[Booster] = None
+
+    def iteration_range(self, home_or_away: str) -> Tuple[int, int]:
+        best = self.best_iterations.get(home_or_away)
+        return (0, best + 1) if best is not None else (0, 0)
 
 
 @dataclass(frozen=True)
@@ -608,6 +878,71 @@ class TrainingDataset:
 class InitPrediction:
     training_dataset: TrainingDataset
     list_simulation_ids: List[str]
-    prev_round_id_by_round_id: Dict[str, str]
-    round_no_by_round_id: Dict[str, int]
-    round_id_by_round_no: Dict[int, str]
+    topology: LeagueTopology
+    fixtures: MatchFixtures
+    # rozegrane mecze sezonu spoza fixtures (baza tabeli dla podsumowań)
+    played_match_rounds: List[MatchRound] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class MatchOutcomeSummary:
+    match_id: str
+    round_id: int
+    home_team_id: int
+    away_team_id: int
+    home_win: float
+    draw: float
+    away_win: float
+    expected_home_goals: float
+    expected_away_goals: float
+    home_goals_distribution: List[float]  # P(gole = k), k = 0..MAX_GOALS
+    away_goals_distribution: List[float]
+
+
+@dataclass(frozen=True)
+class TeamStandingSummary:
+    team_id: int
+    expected_points: float
+    points_std: float
+    position_distribution: List[float]  # P(miejsce = k + 1)
+    title: float
+    relegation: float
+
+
+@dataclass(frozen=True)
+class PredictionSummary:
+    simulation_id: str
+    iterations: int
+    matches: List[MatchOutcomeSummary]
+    teams: List[TeamStandingSummary]
+    standard_error: float = 0.0  # max błąd standardowy P(mistrzostwo)/P(spadek)
+    converged: bool = False  # stream zatrzymany przez kryterium zbieżności
+
+
+@dataclass(frozen=True)
+class AnalyticMatchOutcome:
+    match_id: str
+    round_id: int
+    home_team_id: int
+    away_team_id: int
+    home_lambda: float
+    away_lambda: float
+    home_win: float
+    draw: float
+    away_win: float
+    score_probabilities: List[List[float]]  # [home_goals][away_goals], 0..MAX_GOALS
+
+
+@dataclass(frozen=True)
+class AnalyticPrediction:
+    """
+    Rozkłady z macierzy Poissona. Zgadzają się ze strumieniem Monte Carlo tylko dla
+    goal_sampling="poisson"; przy domyślnym "round" strumień losuje zaokrąglone lambdy,
+    więc P(remis)/P(wynik) będą się różnić. `goal_sampling` to tryb, którego użyłby
+    strumień /simulations/predict dla tego samego requestu.
+    """
+    simulation_id: str
+    matches: List[AnalyticMatchOutcome]
+    # mecze zależne od wcześniej symulowanych wyników (wymagają iteracji Monte Carlo)
+    dependent_match_ids: List[str]
+    goal_sampling: str
@@ -1,9 +1,11 @@
 from src.domain.features.mapper import Mapper
+from src.domain.features.predictions.prediction_aggregator import PredictionAggregator
 from src.domain.features.trainings.training_builder import TrainingBuilder
 from src.domain.features.trainings.training_split import TrainingSplit
 
 __all__ = [
     "Mapper",
+    "PredictionAggregator",
     "Training_builder",
     "TrainingSplit"
 ]
@@ -1,8 +1,21 @@
 from typing import Any, Dict, List, Optional, Tuple
+import json
 import uuid
+import numpy as np
 import pandas as pd
 
-from src.domain.entities import IterationResult, LeagueRound, TrainingData
+from src.core.metrics import SERIALIZATION_LATENCY
+from src.core.utils import json_line
+from src.domain.entities import (
+    AnalyticPrediction,
+    IterationResult,
+    LeagueRound,
+    MatchRound,
+    PredictionSummary,
+    TeamStrength,
+    TrainingData,
+)
+from src.domain.ids import EMPTY_ID, ids
 from src.generatedSimPitchMlProtos.SimPitchMl import (
     commonTypes_pb2 as commonTypes_SimPitchMl,
 )
@@ -10,40 +23,38 @@ from src.generatedSimPitchMlProtos.SimPitchMl.Predict import (
     responses_pb2 as responses_pb2_SimPitchMl,
 )
 
-GUID_EMPTY = "00000000-0000-0000-0000-000000000000"
-
 
 class Mapper:
     def __init__(self):
         pass
 
     @staticmethod
-    def map_round_no_by_round_id(rounds: List[LeagueRound]) -> Dict[str, int]:
+    def map_round_no_by_round_id(rounds: List[LeagueRound]) -> Dict[int, int]:
         rounds_sorted = sorted(rounds, key=lambda x: x.round, reverse=False)
         return {r.id: r.round for r in rounds_sorted}
 
     @staticmethod
-    def map_round_id_by_round_no(rounds: List[LeagueRound]) -> Dict[int, str]:
+    def map_round_id_by_round_no(rounds: List[LeagueRound]) -> Dict[int, int]:
         rounds_sorted = sorted(rounds, key=lambda x: x.round, reverse=False)
         return {r.round: r.id for r in rounds_sorted}
 
     @staticmethod
-    def map_prev_round_id_by_round_id(rounds: Dict[str, int]) -> Dict[str, str]:
+    def map_prev_round_id_by_round_id(rounds: Dict[int, int]) -> Dict[int, int]:
         """
         Input:  {"r2":2,"r3":3}
         Output: {"r2":"r1","r3":"r2"} (prev round id for each round id)
 
-        *Risk if roundId is null* Currently its Guid.Empty
+        *Risk if roundId is null* Currently its Guid.Empty (EMPTY_ID)
         """
 
-        id_by_no: Dict[int, str] = {
+        id_by_no: Dict[int, int] = {
             round_no: round_id for round_id, round_no in rounds.items()
         }
 
-        prev_by_id: Dict[str, str] = {}
+        prev_by_id: Dict[int, int] = {}
 
         for round_id, round_no in rounds.items():
-            prev_round_id = id_by_no.get(round_no - 1, str(uuid.UUID(int=0)))
+            prev_round_id = id_by_no.get(round_no - 1, EMPTY_ID)
             prev_by_id[round_id] = prev_round_id
 
         return prev_by_id
@@ -85,6 +96,39 @@ class Mapper:
 
         return X, y_home, y_away, feature_schema
 
+    @staticmethod
+    def map_to_feature_array(
+        dataset: List[TrainingData],
+        feature_schema: List[str],
+        fill_value: float = 0.0,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Konwertuje List[TrainingData] -> (X float32 [n, len(schema)], y_home, y_away) bez
+        pośredniego DataFrame - wejście dla QuantileDMatrix (kolumny w kolejności schema).
+
+        Braki jak w map_to_xy_matrix: kolumna spoza wszystkich wierszy -> fill_value,
+        brak klucza w pojedynczym wierszu -> NaN (missing dla XGBoost).
+        """
+        present = set().union(*(row.x_row.keys() for row in dataset))
+        defaults = [np.nan if column in present else fill_value for column in feature_schema]
+        X = np.fromiter(
+            (
+                row.x_row.get(column, default)
+                for row in dataset
+                for column, default in zip(feature_schema, defaults)
+            ),
+            dtype=np.float32,
+            count=len(dataset) * len(feature_schema),
+        ).reshape(len(dataset), len(feature_schema))
+        y_home = np.fromiter((row.y_home for row in dataset), dtype=np.float32, count=len(dataset))
+        y_away = np.fromiter((row.y_away for row in dataset), dtype=np.float32, count=len(dataset))
+        return X, y_home, y_away
+
+    @staticmethod
+    def map_to_sample_weight(dataset: List[TrainingData]) -> np.ndarray:
+        """Wagi wierszy (TrainingData.weight) dla sample_weight / weight w DMatrix."""
+        return np.fromiter((row.weight for row in dataset), dtype=np.float32, count=len(dataset))
+
     @staticmethod
     def extract_feature_schema(dataset: List["TrainingData"]) -> List[str]:
         """
@@ -105,6 +149,140 @@ class Mapper:
         # wymuś kolumny i kolejność (braki uzupełnij)
         return X.reindex(columns=feature_schema, fill_value=fill_value)
 
+    # ---------- serializacja (int id -> UUID string) ----------
+
+    @staticmethod
+    def map_match_round_to_dict(match_round: MatchRound) -> Dict[str, Any]:
+        return {
+            "id": match_round.id,
+            "round_id": ids.to_str(match_round.round_id),
+            "home_team_id": ids.to_str(match_round.home_team_id),
+            "away_team_id": ids.to_str(match_round.away_team_id),
+            "home_goals": match_round.home_goals,
+            "away_goals": match_round.away_goals,
+            "is_draw": match_round.is_draw,
+            "is_played": match_round.is_played,
+        }
+
+    @staticmethod
+    def map_league_round_to_dict(league_round: LeagueRound) -> Dict[str, Any]:
+        return {
+            "id": ids.to_str(league_round.id),
+            "league_id": ids.to_str(league_round.league_id),
+            "season_year": league_round.season_year,
+            "round": league_round.round,
+        }
+
+    @staticmethod
+    def map_team_strength_to_dict(
+        team_strength: TeamStrength, id_namespace: Optional[uuid.UUID] = None
+    ) -> Dict[str, Any]:
+        ss = team_strength.season_stats
+        return {
+            "team_id": ids.to_str(team_strength.team_id),
+            "likelihood": {
+                "offensive": team_strength.likelihood.offensive,
+                "defensive": team_strength.likelihood.defensive,
+            },
+            "posterior": {
+                "offensive": team_strength.posterior.offensive,
+                "defensive": team_strength.posterior.defensive,
+            },
+            "expected_goals": team_strength.expected_goals,
+            "last_update": team_strength.last_update,
+            "round_id": ids.to_str(team_strength.round_id),
+            "season_stats": {
+                "id": ss.resolved_id(id_namespace),
+                "team_id": ids.to_str(ss.team_id),
+                "season_year": ss.season_year,
+                "league_id": ids.to_str(ss.league_id),
+                "league_strength": ss.league_strength,
+                "matches_played": ss.matches_played,
+                "wins": ss.wins,
+                "losses": ss.losses,
+                "draws": ss.draws,
+                "goals_for": ss.goals_for,
+                "goals_against": ss.goals_against,
+            },
+        }
+
+    @staticmethod
+    def map_prediction_summary_to_dict(summary: PredictionSummary) -> Dict[str, Any]:
+        return {
+            "simulation_id": summary.simulation_id,
+            "iterations": summary.iterations,
+            "matches": [
+                {
+                    "match_id": m.match_id,
+                    "round_id": ids.to_str(m.round_id),
+                    "home_team_id": ids.to_str(m.home_team_id),
+                    "away_team_id": ids.to_str(m.away_team_id),
+                    "home_win": m.home_win,
+                    "draw": m.draw,
+                    "away_win": m.away_win,
+                    "expected_home_goals": m.expected_home_goals,
+                    "expected_away_goals": m.expected_away_goals,
+                    "home_goals_distribution": m.home_goals_distribution,
+                    "away_goals_distribution": m.away_goals_distribution,
+                }
+                for m in summary.matches
+            ],
+            "teams": [
+                {
+                    "team_id": ids.to_str(t.team_id),
+                    "expected_points": t.expected_points,
+                    "points_std": t.points_std,
+                    "position_distribution": t.position_distribution,
+                    "title": t.title,
+                    "relegation": t.relegation,
+                }
+                for t in summary.teams
+            ],
+            "standard_error": summary.standard_error,
+            "converged": summary.converged,
+        }
+
+    @staticmethod
+    def map_analytic_prediction_to_dict(prediction: AnalyticPrediction) -> Dict[str, Any]:
+        return {
+            "simulation_id": prediction.simulation_id,
+            "matches": [
+                {
+                    "match_id": m.match_id,
+                    "round_id": ids.to_str(m.round_id),
+                    "home_team_id": ids.to_str(m.home_team_id),
+                    "away_team_id": ids.to_str(m.away_team_id),
+                    "home_lambda": m.home_lambda,
+                    "away_lambda": m.away_lambda,
+                    "home_win": m.home_win,
+                    "draw": m.draw,
+                    "away_win": m.away_win,
+                    "score_probabilities": m.score_probabilities,
+                }
+                for m in prediction.matches
+            ],
+            "dependent_match_ids": list(prediction.dependent_match_ids),
+            "goal_sampling": prediction.goal_sampling,
+        }
+
+    @staticmethod
+    def team_strengths_to_json_value(
+        team_strengths: List[TeamStrength],
+        id_namespace: Optional[uuid.UUID] = None,
+    ) -> str:
+        """Convert List[TeamStrength] to JSON string."""
+        return json.dumps(
+            [Mapper.map_team_strength_to_dict(ts, id_namespace) for ts in team_strengths],
+            indent=2,
+        )
+
+    @staticmethod
+    def simulated_match_rounds_to_json_value(match_rounds: List[MatchRound]) -> str:
+        """Convert List[MatchRound] to JSON string."""
+        return json.dumps(
+            [Mapper.map_match_round_to_dict(mr) for mr in match_rounds], indent=2
+        )
+
     @staticmethod
     def map_iteration_result_to_proto(
         status: str, iteration_result: IterationResult,
@@ -122,22 +300,78 @@ class Mapper:
             iteration_index=0, # SimulationService will handle this
             start_date=str(iteration_result.start_date or ""),
             execution_time=str(iteration_result.execution_time or ""),
-            team_strengths=IterationResult.team_strengths_to_json_value(
-                iteration_result.team_strengths or []
+            team_strengths=Mapper.team_strengths_to_json_value(
+                iteration_result.team_strengths or [],
+                id_namespace=(
+                    iteration_result.id
+                    if isinstance(iteration_result.id, uuid.UUID)
+                    else None
+                ),
             ),
-            simulated_match_rounds=IterationResult.simulated_match_rounds_to_json_value(
-                iteration_result.simulated_match_rounds or []
+            simulated_match_rounds=Mapper.simulated_match_rounds_to_json_value(
+                iteration_result.match_rounds()
             ),
         )
         return grpc_object
 
+    @staticmethod
+    def map_iteration_result_to_dict(iteration_result: IterationResult) -> Dict[str, Any]:
+        """To samo co map_iteration_result_to_proto, ale dla REST (listy zamiast JSON stringów)."""
+        return {
+            "id": str(iteration_result.id) if iteration_result.id is not None else "",
+            "simulation_id": str(iteration_result.simulation_id or ""),
+            "iteration_index": iteration_result.iteration_index,
+            "start_date": str(iteration_result.start_date or ""),
+            "execution_time": str(iteration_result.execution_time or ""),
+            "team_strengths": [
+                Mapper.map_team_strength_to_dict(
+                    ts,
+                    id_namespace=(
+                        iteration_result.id
+                        if isinstance(iteration_result.id, uuid.UUID)
+                        else None
+                    ),
+                )
+                for ts in iteration_result.team_strengths or []
+            ],
+            "simulated_match_rounds": [
+                Mapper.map_match_round_to_dict(mr) for mr in iteration_result.match_rounds()
+            ],
+        }
+
+    @staticmethod
+    def map_to_predict_event(
+        status: str,
+        iteration_result: Optional[IterationResult],
+        counter: int,
+        standard_error: Optional[float] = None,
+    ) -> bytes:
+        """
+        Zdarzenie streamu predykcji (pola jak PredictResponse) jako jedna linia NDJSON;
+        COMPLETED ma też osiągnięty błąd standardowy (None bez kryterium zbieżności).
+        """
+        with SERIALIZATION_LATENCY.time(target="predict_event"):
+            event = {
+                "status": status,
+                "predicted_iterations": counter,
+                "iteration_result": (
+                    Mapper.map_iteration_result_to_dict(iteration_result)
+                    if iteration_result is not None
+                    else None
+                ),
+            }
+            if status == "COMPLETED":
+                event["standard_error"] = standard_error
+            return json_line(event)
+
     @staticmethod
     def map_to_predict_response(
         status: str, iteration_result, counter: int
     ) -> responses_pb2_SimPitchMl.PredictResponse:
-        grpc_obj = responses_pb2_SimPitchMl.PredictResponse(
-            status=status,
-            predicted_iterations=counter,
-            iteration_result=Mapper.map_iteration_result_to_proto(status, iteration_result),
-        )
+        with SERIALIZATION_LATENCY.time(target="predict_response"):
+            grpc_obj = responses_pb2_SimPitchMl.PredictResponse(
+                status=status,
+                predicted_iterations=counter,
+                iteration_result=Mapper.map_iteration_result_to_proto(status, iteration_result),
+            )
         return grpc_obj
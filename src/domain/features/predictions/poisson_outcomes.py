@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+from src.domain.entities import MAX_GOALS
+
+
+def poisson_pmf_table(lambdas: np.ndarray, max_goals: int = MAX_GOALS) -> np.ndarray:
+    """
+    P(goals = k) dla k = 0..max_goals, wektorowo dla wszystkich lambd -> [n, max_goals + 1].
+
+    Ogon (k > max_goals) trafia do ostatniej kolumny - tak samo jak losowanie
+    Poisson w PredictionEngine obcina gole do MAX_GOALS, więc wiersze sumują się do 1.
+    """
+    lam = np.asarray(lambdas, dtype=np.float64).reshape(-1, 1)
+    k = np.arange(max_goals + 1, dtype=np.float64)
+    log_factorial = np.concatenate(([0.0], np.cumsum(np.log(k[1:]))))
+
+    # lambda = 0: cała masa w k = 0 (0 * log(0) liczymy jako 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_pmf = np.where(k == 0, 0.0, k * np.log(lam)) - lam - log_factorial
+    pmf = np.exp(log_pmf)
+
+    pmf[:, -1] += np.clip(1.0 - pmf.sum(axis=1), 0.0, None)
+    return pmf
+
+
+def score_matrices(
+    home_lambdas: np.ndarray, away_lambdas: np.ndarray, max_goals: int = MAX_GOALS
+) -> np.ndarray:
+    """[n, home_goals, away_goals] - niezależne Poissony gospodarzy i gości."""
+    home = poisson_pmf_table(home_lambdas, max_goals)
+    away = poisson_pmf_table(away_lambdas, max_goals)
+    return home[:, :, None] * away[:, None, :]
+
+
+def outcome_probabilities(
+    matrices: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(home_win, draw, away_win) z macierzy wyników: pod / na / nad przekątną."""
+    draw = np.trace(matrices, axis1=1, axis2=2)
+    home_win = np.tril(matrices, k=-1).sum(axis=(1, 2))
+    away_win = np.triu(matrices, k=1).sum(axis=(1, 2))
+    return home_win, draw, away_win
+
+
+def poisson_quantiles(
+    lambdas: np.ndarray, uniforms: np.ndarray, max_goals: int = MAX_GOALS
+) -> np.ndarray:
+    """
+    Gole z odwrotnej dystrybuanty: najmniejsze k, dla którego P(X <= k) >= u.
+
+    Każdy mecz zużywa dokładnie jedną liczbę U(0,1) na drużynę - podstawa CRN,
+    par antytetycznych i warstwowania (monotoniczne w u).
+    """
+    cdf = np.cumsum(poisson_pmf_table(lambdas, max_goals), axis=1)
+    u = np.asarray(uniforms, dtype=np.float64).reshape(-1, 1)
+    return np.minimum((cdf < u).sum(axis=1), max_goals)
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.domain.entities import (
+    MAX_GOALS,
+    MatchFixtures,
+    MatchOutcomeSummary,
+    MatchRound,
+    PredictionSummary,
+    TeamStandingSummary,
+)
+
+POINTS_WIN = 3
+POINTS_DRAW = 1
+
+
+class PredictionAggregator:
+    """
+    Strumieniowe agregaty predykcji w tablicach o stałym rozmiarze - pamięć nie rośnie
+    z liczbą iteracji, a iteracje nie muszą być przechowywane ani serializowane.
+
+    Per mecz: liczniki wygrana/remis/porażka i histogramy goli (0..MAX_GOALS).
+    Per drużyna: suma i suma kwadratów punktów oraz histogram końcowego miejsca w tabeli.
+    Tabela = rozegrane mecze (`played_match_rounds`) + mecze z iteracji; kolejność:
+    punkty, bilans bramek, bramki zdobyte.
+    """
+
+    def __init__(
+        self,
+        fixtures: MatchFixtures,
+        played_match_rounds: Optional[List[MatchRound]] = None,
+        *,
+        relegation_places: int = 3,
+    ):
+        self.fixtures = fixtures
+        self.relegation_places = relegation_places
+
+        played = [
+            m
+            for m in played_match_rounds or []
+            if m.is_played and m.home_goals is not None and m.away_goals is not None
+        ]
+
+        # drużyny z fixtures mają te same indeksy co fixtures.home_idx/away_idx
+        index_by_team_id: Dict[int, int] = {
+            team_id: i for i, team_id in enumerate(fixtures.team_ids)
+        }
+        for m in played:
+            index_by_team_id.setdefault(m.home_team_id, len(index_by_team_id))
+            index_by_team_id.setdefault(m.away_team_id, len(index_by_team_id))
+        self.team_ids: List[int] = list(index_by_team_id)
+
+        n_teams = len(self.team_ids)
+        n_matches = len(fixtures)
+        self._n_teams = n_teams
+        self._home_idx = fixtures.home_idx
+        self._away_idx = fixtures.away_idx
+        self._match_range = np.arange(n_matches)
+        self._team_range = np.arange(n_teams)
+
+        # tabela przed symulacją
+        self._base_points = np.zeros(n_teams, dtype=np.int64)
+        self._base_gf = np.zeros(n_teams, dtype=np.int64)
+        self._base_ga = np.zeros(n_teams, dtype=np.int64)
+        if played:
+            home = np.array([index_by_team_id[m.home_team_id] for m in played])
+            away = np.array([index_by_team_id[m.away_team_id] for m in played])
+            hg = np.array([m.home_goals for m in played], dtype=np.int64)
+            ag = np.array([m.away_goals for m in played], dtype=np.int64)
+            home_points, away_points = self._points(hg, ag)
+            self._base_points += self._per_team(home, home_points) + self._per_team(
+                away, away_points
+            )
+            self._base_gf += self._per_team(home, hg) + self._per_team(away, ag)
+            self._base_ga += self._per_team(home, ag) + self._per_team(away, hg)
+
+        self.iterations = 0
+        self.outcome_counts = np.zeros((n_matches, 3), dtype=np.int64)  # H/D/A
+        self.home_goal_counts = np.zeros((n_matches, MAX_GOALS + 1), dtype=np.int64)
+        self.away_goal_counts = np.zeros((n_matches, MAX_GOALS + 1), dtype=np.int64)
+        self.points_sum = np.zeros(n_teams, dtype=np.float64)
+        self.points_sq_sum = np.zeros(n_teams, dtype=np.float64)
+        self.position_counts = np.zeros((n_teams, n_teams), dtype=np.int64)
+
+    # ---------- akumulacja ----------
+
+    @staticmethod
+    def _points(home_goals: np.ndarray, away_goals: np.ndarray):
+        home_points = np.where(
+            home_goals > away_goals,
+            POINTS_WIN,
+            np.where(home_goals == away_goals, POINTS_DRAW, 0),
+        )
+        away_points = np.where(
+            away_goals > home_goals,
+            POINTS_WIN,
+            np.where(home_goals == away_goals, POINTS_DRAW, 0),
+        )
+        return home_points, away_points
+
+    def _per_team(self, team_idx: np.ndarray, values: np.ndarray) -> np.ndarray:
+        return np.bincount(team_idx, weights=values, minlength=self._n_teams).astype(
+            np.int64
+        )
+
+    def add(self, home_goals: np.ndarray, away_goals: np.ndarray) -> None:
+        """Dolicza jedną iterację (gole w kolejności fixtures)."""
+        hg = np.minimum(np.asarray(home_goals, dtype=np.int64), MAX_GOALS)
+        ag = np.minimum(np.asarray(away_goals, dtype=np.int64), MAX_GOALS)
+        matches = self._match_range
+
+        outcome = np.where(hg > ag, 0, np.where(hg == ag, 1, 2))
+        self.outcome_counts[matches, outcome] += 1
+        self.home_goal_counts[matches, hg] += 1
+        self.away_goal_counts[matches, ag] += 1
+
+        home_points, away_points = self._points(hg, ag)
+        home, away = self._home_idx, self._away_idx
+        points = (
+            self._base_points
+            + self._per_team(home, home_points)
+            + self._per_team(away, away_points)
+        )
+        goals_for = self._base_gf + self._per_team(home, hg) + self._per_team(away, ag)
+        goals_against = (
+            self._base_ga + self._per_team(home, ag) + self._per_team(away, hg)
+        )
+
+        # lexsort: ostatni klucz jest główny
+        order = np.lexsort(
+            (self._team_range, -goals_for, -(goals_for - goals_against), -points)
+        )
+        positions = np.empty(self._n_teams, dtype=np.int64)
+        positions[order] = self._team_range
+        self.position_counts[self._team_range, positions] += 1
+
+        self.points_sum += points
+        self.points_sq_sum += points.astype(np.float64) ** 2
+        self.iterations += 1
+
+    # ---------- wyniki ----------
+
+    def title_probabilities(self) -> np.ndarray:
+        return self.position_counts[:, 0] / max(self.iterations, 1)
+
+    def relegation_probabilities(self) -> np.ndarray:
+        places = min(self.relegation_places, self._n_teams)
+        if places <= 0:
+            return np.zeros(self._n_teams)
+        return self.position_counts[:, -places:].sum(axis=1) / max(self.iterations, 1)
+
+    def standard_error(self) -> float:
+        """Największy błąd standardowy P(mistrzostwo) / P(spadek): sqrt(p(1-p)/n)."""
+        if self.iterations == 0:
+            return float("inf")
+        p = np.concatenate((self.title_probabilities(), self.relegation_probabilities()))
+        return float(np.sqrt(p * (1.0 - p) / self.iterations).max(initial=0.0))
+
+    def summary(self, simulation_id: str, converged: bool = False) -> PredictionSummary:
+        n = max(self.iterations, 1)
+        fixtures = self.fixtures
+        goals = np.arange(MAX_GOALS + 1)
+
+        outcome_p = self.outcome_counts / n
+        home_dist = self.home_goal_counts / n
+        away_dist = self.away_goal_counts / n
+        matches = [
+            MatchOutcomeSummary(
+                match_id=match_id,
+                round_id=round_id,
+                home_team_id=home_team_id,
+                away_team_id=away_team_id,
+                home_win=float(outcome_p[i, 0]),
+                draw=float(outcome_p[i, 1]),
+                away_win=float(outcome_p[i, 2]),
+                expected_home_goals=float(home_dist[i] @ goals),
+                expected_away_goals=float(away_dist[i] @ goals),
+                home_goals_distribution=home_dist[i].tolist(),
+                away_goals_distribution=away_dist[i].tolist(),
+            )
+            for i, (match_id, round_id, home_team_id, away_team_id) in enumerate(
+                zip(
+                    fixtures.match_ids,
+                    fixtures.round_ids.tolist(),
+                    fixtures.home_team_ids.tolist(),
+                    fixtures.away_team_ids.tolist(),
+                )
+            )
+        ]
+
+        mean_points = self.points_sum / n
+        points_var = np.maximum(self.points_sq_sum / n - mean_points**2, 0.0)
+        position_p = self.position_counts / n
+        title = self.title_probabilities()
+        relegation = self.relegation_probabilities()
+        teams = [
+            TeamStandingSummary(
+                team_id=team_id,
+                expected_points=float(mean_points[i]),
+                points_std=float(np.sqrt(points_var[i])),
+                position_distribution=position_p[i].tolist(),
+                title=float(title[i]),
+                relegation=float(relegation[i]),
+            )
+            for i, team_id in enumerate(self.team_ids)
+        ]
+        teams.sort(key=lambda t: t.expected_points, reverse=True)
+
+        return PredictionSummary(
+            simulation_id=simulation_id,
+            iterations=self.iterations,
+            matches=matches,
+            teams=teams,
+            standard_error=self.standard_error() if self.iterations else 0.0,
+            converged=converged,
+        )
+
+
+class ConvergenceMonitor:
+    """
+    Kryterium zatrzymania streamu: co `check_every` iteracji (nie wcześniej niż po
+    `min_iterations`) sprawdza błąd standardowy agregatów i zgłasza zbieżność,
+    gdy spadnie do `tolerance`.
+    """
+
+    def __init__(
+        self,
+        aggregator: PredictionAggregator,
+        tolerance: float,
+        *,
+        check_every: int,
+        min_iterations: int = 0,
+    ):
+        self.aggregator = aggregator
+        self.tolerance = tolerance
+        self.check_every = max(1, check_every)
+        self.min_iterations = min_iterations
+        self.standard_error = float("inf")
+
+    def add(self, home_goals: np.ndarray, away_goals: np.ndarray) -> bool:
+        """Dolicza iterację; True = wynik zbieżny, można przerwać stream."""
+        self.aggregator.add(home_goals, away_goals)
+        n = self.aggregator.iterations
+        if n < self.min_iterations or n % self.check_every:
+            return False
+        self.standard_error = self.aggregator.standard_error()
+        return self.standard_error <= self.tolerance
@@ -8,10 +8,10 @@ from src.domain.entities import (
     TrainingData,
 )
 from src.domain.features import Mapper
-from src.core.logger import get_logger
+from src.domain.ids import ids
+from src.core.logger import get_logger, log_aggregated
 
 logger = get_logger(__name__)
-GUID_EMPTY = "00000000-0000-0000-0000-000000000000"
 
 
 class TrainingBuilder:
@@ -55,10 +55,10 @@ class TrainingBuilder:
         match_rounds: List[
             MatchRound
         ],  # simulated_match_rounds but with the played matched BEFORE simulation
-        prev_round_id_by_round_id: Dict[str, str],
-        round_no_by_round_id: Dict[str, int],
-        round_id_by_round_no: Dict[int, str],
-        league_id: str,
+        prev_round_id_by_round_id: Dict[int, int],
+        round_no_by_round_id: Dict[int, int],
+        round_id_by_round_no: Dict[int, int],
+        league_id: int,
         league_avg: str,
     ) -> List[TrainingData]:
         if match_rounds is None or len(match_rounds) == 0:
@@ -83,16 +83,17 @@ class TrainingBuilder:
     def build_dataset_from_scrap(
         match_round: List[MatchRound],
         team_strengths: List[TeamStrength],
-        prev_round_id_by_round_id: Dict[str, str],
-        round_no_by_round_id: Dict[str, int],
-        round_id_by_round_no: Dict[int, str],
-        league_id: str,
+        prev_round_id_by_round_id: Dict[int, int],
+        round_no_by_round_id: Dict[int, int],
+        round_id_by_round_no: Dict[int, int],
+        league_id: int,
         league_avg: str,
     ) -> List[TrainingData]:
 
         dataset: List[TrainingData] = []
 
         strength_map = TeamStrength.strength_map_from_list(team_strengths)
+        last_update = datetime.now().isoformat()
 
         for m_result in (r for r in match_round if r.is_played is True):
             prev_round_id = prev_round_id_by_round_id.get(m_result.round_id)
@@ -108,6 +109,7 @@ class TrainingBuilder:
                 prev_round_id,
                 league_id=league_id,
                 league_avg_strength=league_avg,
+                last_update=last_update,
             )
             away_strength = TrainingBuilder.get_strength_or_fallback(
                 strength_map,
@@ -118,6 +120,7 @@ class TrainingBuilder:
                 prev_round_id,
                 league_id=league_id,
                 league_avg_strength=league_avg,
+                last_update=last_update,
             )
 
             td = TrainingBuilder.build_single_training_data(
@@ -134,14 +137,15 @@ class TrainingBuilder:
     @staticmethod
     def get_strength_or_fallback(
         strength_map: Dict[Tuple[str, str], List[TeamStrength]],
-        round_no_by_round_id: Dict[str, int],
-        round_id_by_round_no: Dict[int, str],
+        round_no_by_round_id: Dict[int, int],
+        round_id_by_round_no: Dict[int, int],
         match_round: MatchRound,
         is_home: bool,
-        prev_round_id: str,
+        prev_round_id: int,
         *,
-        league_id: str,
+        league_id: int,
         league_avg_strength: Optional[float] = None,
+        last_update: Optional[str] = None,
     ) -> TeamStrength:
         team_id = match_round.home_team_id if is_home else match_round.away_team_id
 
@@ -154,15 +158,27 @@ class TrainingBuilder:
                 return None
             return max(strengths, key=lambda x: x.last_update)
 
-        def updateStatsByMatchRound(
-            ts: TeamStrength, is_incoming_match: bool
-        ) -> TeamStrength:
-            if is_incoming_match:  # incoming match does't have home/away goals.
-                return ts.with_posterior(25, league_avg_strength)
-            return (
-                ts.with_incremented_stats(match_round, is_home_team=is_home)
-                .with_likelihood()
-                .with_posterior(25, league_avg_strength)
+        def updateStatsByMatchRound(ts: TeamStrength) -> TeamStrength:
+            now = last_update or datetime.now().isoformat()
+            if (
+                match_round.home_goals is None or match_round.away_goals is None
+            ):  # incoming match does't have home/away goals.
+                return ts.with_round_meta(prev_round_id, now).with_posterior(
+                    25, league_avg_strength
+                )
+            goals_for, goals_against = (
+                (match_round.home_goals, match_round.away_goals)
+                if is_home
+                else (match_round.away_goals, match_round.home_goals)
+            )
+            return ts.with_match_result(
+                goals_for,
+                goals_against,
+                team_id=team_id,
+                round_id=prev_round_id,
+                last_update=now,
+                games_to_reach_trust=25,
+                league_strength=league_avg_strength,
             )
 
         # 1) Exact match
@@ -182,45 +198,36 @@ class TrainingBuilder:
                 strengths = strength_map.get((team_id, rid))
                 ts = newest(strengths) if strengths else None
                 if ts is not None:
-                    logger.warning(
-                        "(prev TeamStrength found), New strength will be created. team_id=%s prev_round_id=%s avg=%s",
-                        team_id,
-                        prev_round_id,
-                        league_avg_strength,
-                    )
-                    base_home = ts.with_round_meta(
-                        prev_round_id, datetime.now().isoformat()
-                    )
-                    return updateStatsByMatchRound(
-                        base_home,
-                        match_round.home_goals is None
-                        or match_round.away_goals is None,
+                    log_aggregated(
+                        logger,
+                        "Older TeamStrength fallback (new strength created)",
+                        ids.to_str(team_id),
                     )
+                    return updateStatsByMatchRound(ts)
 
         if league_avg_strength is None:
             raise ValueError(
                 "league_avg_strength is required when falling back to baseline"
             )
 
-        logger.warning(
-            "League-average baseline used (no TeamStrength found). team_id=%s prev_round_id=%s avg=%s",
-            team_id,
-            prev_round_id,
-            league_avg_strength,
+        # w logu (i przy scalaniu zliczeń z procesów puli) - UUID, nie lokalny int
+        log_aggregated(
+            logger,
+            "League-average baseline fallback (no TeamStrength found)",
+            ids.to_str(team_id),
         )
 
         return updateStatsByMatchRound(
             TeamStrength.get_team_strength_average_baseline(
                 round_id=prev_round_id,
-                last_update=datetime.now().isoformat(),
+                last_update=last_update or datetime.now().isoformat(),
                 expected_goals=0.00,
                 offensive=float(league_avg_strength),
                 defensive=float(league_avg_strength),
                 team_id=team_id,
                 league_id=league_id,
                 league_strength=league_avg_strength,
-            ),
-            match_round.home_goals is None or match_round.away_goals is None,
+            )
         )
 
     @staticmethod
@@ -228,21 +235,39 @@ class TrainingBuilder:
         match_round: MatchRound,
         home_strength: Optional[TeamStrength],
         away_strength: Optional[TeamStrength],
-        prev_round_id: str,
+        prev_round_id: int,
     ) -> Optional[TrainingData]:
 
         if home_strength is None:
             logger.error(
-                f"Missing home_strength teamId={match_round.home_team_id}, matchId={match_round.id}, prev_round_id={prev_round_id}"
+                "Missing home_strength teamId=%s, matchId=%s, prev_round_id=%s",
+                ids.to_str(match_round.home_team_id),
+                match_round.id,
+                ids.to_str(prev_round_id),
             )
             return None
 
         if away_strength is None:
             logger.error(
-                f"Missing away_strength teamId={match_round.away_team_id}, matchId={match_round.id}, prev_round_id={prev_round_id}"
+                "Missing away_strength teamId=%s, matchId=%s, prev_round_id=%s",
+                ids.to_str(match_round.away_team_id),
+                match_round.id,
+                ids.to_str(prev_round_id),
             )
             return None
 
+        return TrainingData(
+            x_row=TrainingBuilder.feature_row(home_strength, away_strength),
+            y_home=match_round.home_goals,
+            y_away=match_round.away_goals,
+            prev_round_id=prev_round_id,
+        )
+
+    @staticmethod
+    def feature_row(
+        home_strength: TeamStrength, away_strength: TeamStrength
+    ) -> Dict[str, float]:
+        """Wiersz cech meczu - zależy tylko od sił obu drużyn."""
         schema = TrainingBuilder.feature_schema()
 
         X_row = dict.fromkeys(schema, 0.0)  # Pre-fill zerami wszystkie cechy z schema
@@ -261,10 +286,4 @@ class TrainingBuilder:
         X_row["diff_post_def"] = (
             home_strength.posterior.defensive - away_strength.posterior.defensive
         )
-
-        return TrainingData(
-            x_row=X_row,
-            y_home=match_round.home_goals,
-            y_away=match_round.away_goals,
-            prev_round_id=prev_round_id,
-        )
+        return X_row
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+from src.domain.entities import TrainingData
+
+RowKey = Tuple[Hashable, ...]
+
+
+class TrainingCompactor:
+    """
+    Zwija identyczne wiersze treningowe (x_row, y_home, y_away, prev_round_id) w jeden
+    z wagą = suma wag zwiniętych wierszy.
+
+    Rozegrane mecze są doklejane do każdej iteracji każdej synchronizowanej symulacji,
+    więc te same wiersze powtarzają się tysiące razy. Z sample_weight cel treningu
+    (ważona suma strat) jest identyczny jak na pełnym datasecie. prev_round_id jest
+    w kluczu, żeby split czasowy (TrainingSplit) widział te same rundy.
+
+    Wiersze dodajemy przyrostowo (per iteracja), więc pełny dataset nie musi istnieć
+    w pamięci; kolejność wyniku = kolejność pierwszego wystąpienia.
+    """
+
+    def __init__(self) -> None:
+        self._rows: Dict[RowKey, TrainingData] = {}
+        self._weights: Dict[RowKey, float] = {}
+        self.input_rows = 0
+
+    @staticmethod
+    def _key(item: TrainingData) -> RowKey:
+        # TrainingBuilder wypełnia x_row zawsze w kolejności schema - bez sortowania kluczy
+        return (item.prev_round_id, item.y_home, item.y_away, *item.x_row.items())
+
+    def add(self, dataset: Iterable[TrainingData]) -> None:
+        rows, weights = self._rows, self._weights
+        for item in dataset:
+            key = self._key(item)
+            if key in weights:
+                weights[key] += item.weight
+            else:
+                rows[key] = item
+                weights[key] = item.weight
+            self.input_rows += 1
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def dataset(self) -> List[TrainingData]:
+        return [
+            item if item.weight == weight else replace(item, weight=weight)
+            for item, weight in zip(self._rows.values(), self._weights.values())
+        ]
+
+    @classmethod
+    def compact(cls, dataset: Iterable[TrainingData]) -> List[TrainingData]:
+        compactor = cls()
+        compactor.add(dataset)
+        return compactor.dataset()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import replace
+from itertools import count
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.domain.entities import TrainingData
+
+
+class TrainingSampler:
+    """
+    Jednoprzebiegowy limit wielkości datasetu treningowego (TRAINING_MAX_ROWS).
+
+    Warstwy = runda wiersza (round_no z prev_round_id), każda z własnym rezerwuarem
+    max_rows / liczba rund - split czasowy i późne rundy nie tracą pokrycia, nawet gdy
+    historia symulacji rośnie. W warstwie: ważony reservoir sampling (A-Res,
+    klucz = log(u) / w), gdzie w maleje z wiekiem symulacji (połowa co
+    `recency_half_life` symulacji; 0 = wszystkie symulacje równo).
+
+    Wybrane wiersze dostają wagę (sample_weight) = wiersze widziane / wybrane w warstwie,
+    więc suma wag odpowiada pełnemu datasetowi.
+    """
+
+    def __init__(
+        self,
+        max_rows: int,
+        round_no_by_round_id: Dict[int, int],
+        recency_half_life: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        rounds = max(1, len(set(round_no_by_round_id.values())))
+        self.capacity = max(1, max_rows // rounds)
+        self._round_no_by_round_id = round_no_by_round_id
+        self._recency_half_life = recency_half_life
+        self._rng = np.random.default_rng(seed)
+        self._reservoirs: Dict[Hashable, List[Tuple[float, int, TrainingData]]] = {}
+        self._seen_weight: Dict[Hashable, float] = {}
+        self._order = count()  # rozstrzyga remisy kluczy bez porównywania TrainingData
+        self.input_rows = 0
+
+    def _recency_weight(self, age: int) -> float:
+        if self._recency_half_life <= 0:
+            return 1.0
+        return 0.5 ** (age / self._recency_half_life)
+
+    def add(self, dataset: Sequence[TrainingData], age: int = 0) -> None:
+        """
+        Wiersze jednej iteracji; `age` = ile symulacji jest nowszych od tej, z której
+        pochodzą (0 = najnowsza).
+        """
+        if not dataset:
+            return
+        keys = np.log(self._rng.random(len(dataset))) / self._recency_weight(age)
+
+        for item, key in zip(dataset, keys.tolist()):
+            stratum = self._round_no_by_round_id.get(item.prev_round_id)
+            self._seen_weight[stratum] = self._seen_weight.get(stratum, 0.0) + item.weight
+            reservoir = self._reservoirs.setdefault(stratum, [])
+            entry = (key, next(self._order), item)
+            if len(reservoir) < self.capacity:
+                heapq.heappush(reservoir, entry)
+            elif key > reservoir[0][0]:
+                heapq.heapreplace(reservoir, entry)
+        self.input_rows += len(dataset)
+
+    def __len__(self) -> int:
+        return sum(len(reservoir) for reservoir in self._reservoirs.values())
+
+    def dataset(self) -> List[TrainingData]:
+        """Wybrane wiersze (w kolejności napływu) z wagami przeskalowanymi per warstwa."""
+        sampled: List[Tuple[int, TrainingData]] = []
+        for stratum, reservoir in self._reservoirs.items():
+            kept_weight = sum(item.weight for _, _, item in reservoir)
+            scale = self._seen_weight[stratum] / kept_weight
+            sampled.extend(
+                (order, item if scale == 1.0 else replace(item, weight=item.weight * scale))
+                for _, order, item in reservoir
+            )
+        sampled.sort(key=lambda entry: entry[0])
+        return [item for _, item in sampled]
@@ -1,3 +1,5 @@
+import logging
+from collections import Counter
 from typing import Dict, List, Optional, Tuple
 from src.domain.entities import TrainingData, TrainingDataset
 from src.core.logger import get_logger
@@ -84,11 +86,11 @@ class TrainingSplit:
             else:
                 test.append(item)
 
-        from collections import Counter
-        counts = Counter(rn for rn, _ in sortable)
-        logger.info(
-            "Split: rounds_hist=" +
-            ", ".join(f"{rn}:{counts[rn]}" for rn in unique_rounds)
-        )
+        if logger.isEnabledFor(logging.INFO):
+            counts = Counter(rn for rn, _ in sortable)
+            logger.info(
+                "Split: rounds_hist=%s",
+                ", ".join(f"{rn}:{counts[rn]}" for rn in unique_rounds),
+            )
 
         return TrainingDataset(train=train, test= test)
@@ -0,0 +1,96 @@
+"""
+Rejestr identyfikatorów: UUID (string) <-> gęsty int.
+
+Drużyny, rundy i ligi są zamieniane na int przy wejściu danych (mapowanie
+w klientach gRPC / parsowanie JSON), więc w gorących pętlach klucze słowników,
+porównania i indeksowanie tablic działają na małych intach. Z powrotem na string
+zamieniamy dopiero na granicy serializacji (Mapper). Id meczów zostają stringami -
+każda symulacja ma ich tyle, że rejestr rósłby bez końca.
+
+- 0 oznacza brak identyfikatora (falsy, jak pusty string),
+- Guid.Empty ma zawsze stały numer EMPTY_ID.
+
+Rejestr jest procesowy i tylko rośnie (liczba drużyn/rund/lig jest mała). Próg
+IDS_MAX_ENTRIES nie odrzuca requestów - usunięcie lub przenumerowanie wpisów
+unieważniłoby inty trzymane przez encje w locie - ale każde id dodane ponad próg
+daje ostrzeżenie i metrykę, więc wyciek pamięci nie jest cichy.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List, Optional
+
+from src.core.config import config
+from src.core.logger import get_logger, log_aggregated
+from src.core.metrics import ID_REGISTRY_OVERFLOW
+
+logger = get_logger(__name__)
+
+GUID_EMPTY = "00000000-0000-0000-0000-000000000000"
+NO_ID = 0
+# drużyny, rundy i ligi wszystkich lig razem to najwyżej kilkadziesiąt tysięcy
+MAX_IDS = config.ids.max_entries
+
+
+class IdRegistry:
+    def __init__(self, max_entries: int = MAX_IDS):
+        self.max_entries = max_entries
+        self._by_value: Dict[str, int] = {}
+        self._values: List[Optional[str]] = [None]  # index 0 = NO_ID
+        self._lock = threading.Lock()
+
+    def to_int(self, value: Any) -> int:
+        """UUID string -> int (idempotentne: int zwracany bez zmian)."""
+        if type(value) is int:
+            return value
+        if not value:
+            return NO_ID
+        idx = self._by_value.get(value)
+        if idx is not None:
+            return idx
+        with self._lock:
+            idx = self._by_value.get(value)
+            if idx is not None:
+                return idx
+            idx = len(self._values)
+            self._values.append(str(value))
+            self._by_value[self._values[idx]] = idx
+
+        if idx > self.max_entries:
+            ID_REGISTRY_OVERFLOW.inc()
+            log_aggregated(
+                logger,
+                f"Id registry above IDS_MAX_ENTRIES={self.max_entries} (id interned anyway)",
+                value,
+                subject_label="ids",
+            )
+        return idx
+
+    def to_str(self, value: Any) -> str:
+        """int -> UUID string (string zwracany bez zmian, NO_ID/None -> "")."""
+        if type(value) is int:
+            return self._values[value] or ""
+        return value or ""
+
+    def snapshot(self) -> List[Optional[str]]:
+        with self._lock:
+            return list(self._values)
+
+    def restore(self, values: List[Optional[str]]) -> None:
+        """
+        Odtwarza rejestr ze snapshot() - dla procesów roboczych, które dostają encje
+        z int id od procesu serwera (numery muszą znaczyć to samo po obu stronach).
+        """
+        with self._lock:
+            self._values = list(values)
+            self._by_value = {
+                value: idx for idx, value in enumerate(self._values) if value is not None
+            }
+
+    def __len__(self) -> int:
+        return len(self._values) - 1
+
+
+ids = IdRegistry()
+EMPTY_ID = ids.to_int(GUID_EMPTY)
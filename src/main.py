@@ -5,15 +5,20 @@ import asyncio
 import os
 from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from contextlib import AsyncExitStack, asynccontextmanager
-from src.adapters.api.routers import simulation_router, sportsdata_router
+from src.adapters.api.routers import admin_router, simulation_router, sportsdata_router
 from src.core.config import config
-from src.core.logger import get_logger
-from src.core.logger import get_logger
+from src.core.logger import get_logger, shutdown_logging
+from src.core.metrics import CONTENT_TYPE_LATEST, registry as metrics_registry
 from dotenv import load_dotenv
 from contextlib import asynccontextmanager
 from src.di.services import get_predict_grpc_servicer
+from src.services.training_scheduler import (
+    start_training_scheduler,
+    stop_training_scheduler,
+)
+from src.services.xgboost.prediction_pool import shutdown_prediction_pool
 from grpc_reflection.v1alpha import reflection
 
 # Twoje generated proto
@@ -110,18 +115,36 @@ async def lifespan(app: FastAPI):
         await server.start()
         app.state.grpc_server = server
 
+        # trening w tle: StreamPrediction startuje od razu na opublikowanym modelu
+        if config.training.scheduler_interval_seconds > 0:
+            app.state.training_scheduler = start_training_scheduler(
+                simulation_service, config.training.scheduler_interval_seconds
+            )
+        elif config.prediction.cache_entries > 0:
+            logger.warning(
+                "PREDICTION_CACHE_ENTRIES is ignored without TRAINING_SCHEDULER_INTERVAL_SECONDS > 0"
+            )
+
         yield
 
+        await stop_training_scheduler()
         await server.stop(0)
+        shutdown_prediction_pool()
+        shutdown_logging()
 
 def create_app() -> FastAPI:
     app = FastAPI(title="SimPitch ML Service", lifespan=lifespan)
     app.include_router(simulation_router.router, prefix="/api/v1", tags=["simulations"])
     app.include_router(sportsdata_router.router, prefix="/api/v1", tags=["sportsData"])
+    app.include_router(admin_router.router, prefix="/api/v1", tags=["admin"])
     
     @app.get("/health")
     async def health():
         return {"status": "healthy", "grpc_port": GRPC_PORT}
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(metrics_registry.render(), media_type=CONTENT_TYPE_LATEST)
     
     return app
 
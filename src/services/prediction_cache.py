@@ -0,0 +1,301 @@
+"""
+Cache wyników i łączenie identycznych streamów predykcji (PREDICTION_CACHE_ENTRIES > 0).
+
+Klucz = sha256 z treści PredictRequest (bez simulation_id), wersji modelu ligi
+z rejestru i konfiguracji predykcji - nowa wersja modelu = nowy klucz, stare wpisy
+po prostu przestają trafiać i wypadają z LRU. Id drużyn/rund/lig idą do klucza
+i do plików na dysku jako UUID stringi - inty z rejestru ids są lokalne dla procesu.
+
+- identyczny request w trakcie liczenia: subskrybuje działający stream (dostaje
+  zdarzenia od początku, potem na żywo), bez drugiego liczenia;
+- zakończony stream: odtwarzany z pamięci (LRU, PREDICTION_CACHE_ENTRIES wpisów),
+  a wpisy wypchnięte z pamięci opcjonalnie lądują na dysku (PREDICTION_CACHE_SPILL_DIR).
+
+Cache'ujemy tylko deterministyczne requesty (seed albo goal_sampling="round") do
+PREDICTION_CACHE_MAX_ITERATIONS iteracji; pozostałe idą prosto do źródła. Cache działa
+tylko z TrainingScheduler - bez niego request sam synchronizuje i trenuje ligę, a
+trafienie w cache by to pominęło.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import pickle
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, fields, replace
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from src.core.config import PredictionConfig
+from src.core.logger import get_logger
+from src.core.metrics import PREDICTION_CACHE_REQUESTS
+from src.domain.entities import IterationResult, PredictRequest, TeamStrength
+from src.domain.features.mapper import Mapper
+from src.domain.ids import ids
+
+logger = get_logger(__name__)
+
+# (status, iteration_result, counter, standard_error - tylko w COMPLETED)
+StreamEvent = Tuple[str, Optional[IterationResult], int, Optional[float]]
+SPILL_EXT = "pkl"
+# format klucza i plików: 2 = id jako UUID stringi, StreamEvent z standard_error
+KEY_VERSION = 2
+_REQUEST_ID_FIELDS = ("simulation_id", "league_id", "team_strengths", "matches_to_simulate")
+
+
+def prediction_key(
+    predict_request: PredictRequest,
+    model_version: Optional[int],
+    prediction_config: PredictionConfig,
+) -> str:
+    payload: Dict[str, Any] = {
+        f.name: getattr(predict_request, f.name)
+        for f in fields(predict_request)
+        if f.name not in _REQUEST_ID_FIELDS
+    }
+    payload["league_id"] = ids.to_str(predict_request.league_id)
+    payload["team_strengths"] = {
+        ids.to_str(team_id): [Mapper.map_team_strength_to_dict(ts) for ts in strengths]
+        for team_id, strengths in predict_request.team_strengths.items()
+    }
+    payload["matches_to_simulate"] = [
+        Mapper.map_match_round_to_dict(m) for m in predict_request.matches_to_simulate
+    ]
+    payload["key_version"] = KEY_VERSION
+    payload["model_version"] = model_version
+    payload["prediction_config"] = asdict(prediction_config)
+    raw = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def for_request(event: StreamEvent, predict_request: PredictRequest) -> StreamEvent:
+    """Zdarzenie z cudzego/zapisanego streamu przepięte na simulation_id requestu."""
+    status, result, counter, standard_error = event
+    if result is not None and result.simulation_id != predict_request.simulation_id:
+        result = replace(result, id=uuid.uuid4(), simulation_id=predict_request.simulation_id)
+    return status, result, counter, standard_error
+
+
+def _team_strength_ids(ts: TeamStrength, convert: Callable[[Any], Any]) -> TeamStrength:
+    season_stats = replace(
+        ts.season_stats,
+        team_id=convert(ts.season_stats.team_id),
+        league_id=convert(ts.season_stats.league_id),
+    )
+    return replace(
+        ts, team_id=convert(ts.team_id), round_id=convert(ts.round_id), season_stats=season_stats
+    )
+
+
+def _with_ids(event: StreamEvent, convert: Callable[[Any], Any]) -> StreamEvent:
+    """
+    Zdarzenie z id przepisanymi przez `convert` (ids.to_str przed zapisem na dysk,
+    ids.to_int po odczycie). Mecze są materializowane - MatchFixtures trzyma inty.
+    """
+    status, result, counter, standard_error = event
+    if result is None:
+        return event
+    result = replace(
+        result,
+        team_strengths=[_team_strength_ids(ts, convert) for ts in result.team_strengths or []],
+        simulated_match_rounds=[
+            replace(
+                m,
+                round_id=convert(m.round_id),
+                home_team_id=convert(m.home_team_id),
+                away_team_id=convert(m.away_team_id),
+            )
+            for m in result.match_rounds()
+        ],
+        fixtures=None,
+    )
+    return status, result, counter, standard_error
+
+
+class _Flight:
+    """Działający stream: bufor zdarzeń + powiadomienie subskrybentów o nowych."""
+
+    def __init__(self):
+        self.events: List[StreamEvent] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.changed = asyncio.Event()
+        self.subscribers = 0
+        self.task: Optional[asyncio.Task] = None
+
+    def notify(self) -> None:
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+
+class PredictionCache:
+    def __init__(
+        self,
+        max_entries: int,
+        max_iterations: int,
+        spill_dir: Optional[Path] = None,
+        spill_entries: int = 0,
+    ):
+        self.max_entries = max_entries
+        self.max_iterations = max_iterations
+        self.spill_dir = Path(spill_dir) if spill_dir and spill_entries > 0 else None
+        self.spill_entries = spill_entries
+        self._entries: "OrderedDict[str, List[StreamEvent]]" = OrderedDict()
+        self._flights: Dict[str, _Flight] = {}
+
+    def cacheable(self, predict_request: PredictRequest, goal_sampling: str) -> bool:
+        deterministic = predict_request.seed is not None or goal_sampling == "round"
+        return deterministic and predict_request.iteration_count <= self.max_iterations
+
+    async def stream(
+        self,
+        key: str,
+        source: Callable[[], AsyncIterator[StreamEvent]],
+        is_current: Callable[[], bool] = lambda: True,
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Zdarzenia dla `key`: z cache, z działającego streamu albo z nowego `source()`.
+        `is_current()` po zakończeniu decyduje, czy wynik trafia do cache
+        (np. czy wersja modelu nie zmieniła się w trakcie).
+        """
+        events = self._get(key)
+        if events is not None:
+            PREDICTION_CACHE_REQUESTS.inc(result="hit")
+            for event in events:
+                yield event
+            return
+
+        flight = self._flights.get(key)
+        if flight is None:
+            PREDICTION_CACHE_REQUESTS.inc(result="miss")
+            flight = self._flights[key] = _Flight()
+            flight.task = asyncio.create_task(self._pump(key, flight, source, is_current))
+        else:
+            PREDICTION_CACHE_REQUESTS.inc(result="coalesced")
+
+        flight.subscribers += 1
+        try:
+            position = 0
+            while True:
+                changed = flight.changed
+                while position < len(flight.events):
+                    yield flight.events[position]
+                    position += 1
+                if flight.done:
+                    if flight.error is not None:
+                        raise flight.error
+                    return
+                await changed.wait()
+        finally:
+            flight.subscribers -= 1
+            if flight.subscribers == 0 and not flight.done:
+                # nikt już nie słucha (np. anulowany stream gRPC) - przerywamy liczenie
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+
+    async def _pump(
+        self,
+        key: str,
+        flight: _Flight,
+        source: Callable[[], AsyncIterator[StreamEvent]],
+        is_current: Callable[[], bool],
+    ) -> None:
+        try:
+            async with contextlib.aclosing(source()) as events:
+                async for event in events:
+                    flight.events.append(event)
+                    flight.notify()
+        except BaseException as e:
+            flight.error = e
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            flight.done = True
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            flight.notify()
+
+        if flight.error is None and is_current():
+            self._put(key, flight.events)
+
+    # ---------- pamięć (LRU) + dysk ----------
+
+    def _get(self, key: str) -> Optional[List[StreamEvent]]:
+        events = self._entries.get(key)
+        if events is not None:
+            self._entries.move_to_end(key)
+            return events
+        events = self._load_spilled(key)
+        if events is not None:
+            self._put(key, events)
+        return events
+
+    def _put(self, key: str, events: List[StreamEvent]) -> None:
+        self._entries[key] = events
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self._spill(evicted_key, evicted)
+
+    def _spill_path(self, key: str) -> Path:
+        return self.spill_dir / f"{key}.{SPILL_EXT}"
+
+    def _spill(self, key: str, events: List[StreamEvent]) -> None:
+        if self.spill_dir is None:
+            return
+        try:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            path = self._spill_path(key)
+            tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+            with open(tmp, "wb") as f:
+                portable = [_with_ids(event, ids.to_str) for event in events]
+                pickle.dump(portable, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+            self._prune_spilled()
+        except OSError:
+            logger.exception("Prediction cache spill failed for key=%s", key)
+
+    def _prune_spilled(self) -> None:
+        files = sorted(self.spill_dir.glob(f"*.{SPILL_EXT}"), key=lambda p: p.stat().st_mtime)
+        for path in files[: max(0, len(files) - self.spill_entries)]:
+            path.unlink(missing_ok=True)
+
+    def _load_spilled(self, key: str) -> Optional[List[StreamEvent]]:
+        if self.spill_dir is None:
+            return None
+        path = self._spill_path(key)
+        try:
+            with open(path, "rb") as f:
+                events = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError):
+            logger.warning("Dropping unreadable prediction cache file %s", path)
+            path.unlink(missing_ok=True)
+            return None
+        path.unlink(missing_ok=True)  # wraca do pamięci; przy kolejnym wypchnięciu zapiszemy ponownie
+        return [_with_ids(event, ids.to_int) for event in events]
+
+
+_cache: Optional[PredictionCache] = None
+
+
+def get_prediction_cache(prediction_config: PredictionConfig) -> Optional[PredictionCache]:
+    """Wspólny cache procesu albo None (PREDICTION_CACHE_ENTRIES=0)."""
+    global _cache
+    if prediction_config.cache_entries <= 0:
+        return None
+    if _cache is None:
+        _cache = PredictionCache(
+            prediction_config.cache_entries,
+            prediction_config.cache_max_iterations,
+            spill_dir=Path(prediction_config.cache_spill_dir) if prediction_config.cache_spill_dir else None,
+            spill_entries=prediction_config.cache_spill_entries,
+        )
+    return _cache
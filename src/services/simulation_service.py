@@ -1,16 +1,33 @@
 # src/services/simulation_service.py
+import asyncio
+from contextlib import aclosing
 from datetime import datetime
 from typing import AsyncIterator, Dict, List, Optional, Tuple
-from src.core import get_logger
+from src.core import aggregate_warnings, aggregated_stream, config as app_config, get_logger
+from src.core.concurrency import BatchedFlight
+from src.core.metrics import (
+    DATASET_BUILD_LATENCY,
+    DATASET_COMPACTED_ROWS,
+    DATASET_ROWS,
+    PREDICT_ITERATION_LATENCY,
+    PREDICT_ITERATIONS,
+    PREDICTION_EARLY_STOPS,
+    PREDICTION_STANDARD_ERROR,
+)
 from src.di.ports.adapters.league_round_port import LeagueRoundPort
 from src.di.ports.sportsdata_service_port import SportsDataServicePort
 from src.di.ports.xgboost.xgboost_service_port import XgboostServicePort
 from src.domain.entities import (
+    AnalyticPrediction,
     InitPrediction,
     IterationResult,
-    LeagueRound,
+    LeagueTopology,
+    MatchFixtures,
+    MatchRound,
     PagedResponse,
     PredictRequest,
+    PredictionSummary,
+    SimulationOverview,
     Synchronization,
     TrainedModels,
     TrainingData,
@@ -19,12 +36,25 @@ from src.domain.entities import (
 from src.di.ports.adapters.simulation_engine_port import SimulationEnginePort
 from src.di.ports.adapters.iteration_result_port import IterationResultPort
 from src.di.ports.synchronization_port import SynchronizationPort
-from src.domain.features.mapper import Mapper
+from src.domain.features.predictions.prediction_aggregator import (
+    ConvergenceMonitor,
+    PredictionAggregator,
+)
 from src.domain.features.trainings.training_builder import TrainingBuilder
+from src.domain.features.trainings.training_compaction import TrainingCompactor
+from src.domain.features.trainings.training_sampler import TrainingSampler
 from src.domain.features.trainings.training_split import TrainingSplit
+from src.services.prediction_cache import for_request, get_prediction_cache, prediction_key
+from src.services.training_scheduler import get_training_scheduler
+from src.services.xgboost.prediction_engine import PredictionEngine
 
 logger = get_logger(__name__)
 
+# jeden trening na ligę naraz; nowe symulacje zgłoszone w trakcie treningu idą razem
+# do jednego następnego treningu (nie giną po przesunięciu znacznika synchronizacji);
+# na poziomie modułu, bo SimulationService powstaje per request (REST)
+_training_flight: BatchedFlight[str, TrainedModels] = BatchedFlight("training")
+
 
 class SimulationService:
     def __init__(
@@ -43,54 +73,349 @@ class SimulationService:
 
     async def run_prediction_stream(
         self, predict_request: PredictRequest
-    ) -> AsyncIterator[Tuple[str, Optional[IterationResult], int]]:
+    ) -> AsyncIterator[Tuple[str, Optional[IterationResult], int, Optional[float]]]:
+        # bez schedulera request sam synchronizuje i trenuje ligę - trafienie w cache
+        # pominęłoby nowe symulacje, więc cache działa tylko z TrainingScheduler
+        cache = (
+            get_prediction_cache(app_config.prediction)
+            if get_training_scheduler() is not None
+            else None
+        )
+        goal_sampling = predict_request.goal_sampling or app_config.prediction.goal_sampling
+        if cache is None or not cache.cacheable(predict_request, goal_sampling):
+            async with aclosing(self._prediction_stream(predict_request)) as events:
+                async for event in events:
+                    yield event
+            return
+
+        # identyczny request (treść + wersja modelu ligi) - wynik z cache albo z działającego streamu
+        league_id = predict_request.league_id
+        model_version = self._xgboost_service.model_version(league_id)
+        key = prediction_key(predict_request, model_version, app_config.prediction)
+        async with aclosing(
+            cache.stream(
+                key,
+                lambda: self._prediction_stream(predict_request),
+                is_current=lambda: self._xgboost_service.model_version(league_id)
+                == model_version,
+            )
+        ) as events:
+            async for event in events:
+                yield for_request(event, predict_request)
+
+    def _prediction_stream(
+        self, predict_request: PredictRequest
+    ) -> AsyncIterator[Tuple[str, Optional[IterationResult], int, Optional[float]]]:
+        return aggregated_stream(
+            logger, "prediction stream", lambda: self._prediction_events(predict_request)
+        )
+
+    async def _prediction_events(
+        self, predict_request: PredictRequest
+    ) -> AsyncIterator[Tuple[str, Optional[IterationResult], int, Optional[float]]]:
         try:
-            models: TrainedModels = None
-            rounds = await self._sportsdata_service.get_league_rounds_by_league_id(
-                league_id=predict_request.league_id
+            init_prediction, models = await self._prepare_prediction(
+                predict_request
+            )
+            # silnik (fixtures + bazowa mapa sił) budowany raz per stream
+            engine = PredictionEngine(predict_request, init_prediction, models)
+            monitor = self._convergence_monitor(
+                engine, self._aggregator(init_prediction)
             )
-            prev_round_id_by_round_id: Dict[str, str] = (
-                Mapper.map_prev_round_id_by_round_id(
-                    Mapper.map_round_no_by_round_id(rounds)
+
+            counter = 0
+
+            async with aclosing(
+                self._predicted_iterations(engine)
+            ) as iteration_results:
+                async for iteration_result in iteration_results:
+                    PREDICT_ITERATIONS.inc()
+                    counter += 1
+
+                    # stream item
+                    yield ("RUNNING", iteration_result, counter, None)
+
+                    if monitor is not None and monitor.add(
+                        iteration_result.home_goals, iteration_result.away_goals
+                    ):
+                        self._on_converged(predict_request, monitor)
+                        break
+        except Exception:
+            logger.exception("Yield/mapper crashed")
+            raise
+
+        # osiągnięta precyzja (tylko przy kryterium zbieżności) trafia do klienta
+        standard_error = None
+        if monitor is not None:
+            standard_error = monitor.aggregator.standard_error()
+            PREDICTION_STANDARD_ERROR.observe(standard_error)
+
+        # final event as last yield (instead of return value)
+        yield ("COMPLETED", None, counter, standard_error)
+
+    async def _predicted_iterations(
+        self, engine: PredictionEngine
+    ) -> AsyncIterator[IterationResult]:
+        iteration_count = engine.predict_request.iteration_count
+        if app_config.prediction.use_shards(iteration_count):
+            # długie streamy: iteracje liczone w puli procesów, kolejność zachowana
+            async with aclosing(
+                self._xgboost_service.predict_results_sharded(engine)
+            ) as sharded:
+                async for iteration_result in sharded:
+                    yield iteration_result
+            return
+
+        for iteration in range(iteration_count):
+            with PREDICT_ITERATION_LATENCY.time():
+                iteration_result = await self._xgboost_service.predict_results(
+                    engine, iteration
                 )
+            yield iteration_result
+
+    def run_prediction_summary_stream(
+        self,
+        predict_request: PredictRequest,
+        progress_every: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[str, PredictionSummary, int]]:
+        """
+        Tryb tylko-agregatów: iteracje nie są zwracane, tylko PredictionSummary
+        (co `progress_every` iteracji jako PROGRESS i na końcu jako COMPLETED).
+        """
+        return aggregated_stream(
+            logger,
+            "prediction summary stream",
+            lambda: self._summary_events(predict_request, progress_every),
+        )
+
+    async def _summary_events(
+        self, predict_request: PredictRequest, progress_every: Optional[int]
+    ) -> AsyncIterator[Tuple[str, PredictionSummary, int]]:
+        try:
+            init_prediction, models = await self._prepare_prediction(
+                predict_request
+            )
+            aggregator = self._aggregator(init_prediction)
+            engine = PredictionEngine(predict_request, init_prediction, models)
+            monitor = self._convergence_monitor(engine, aggregator)
+            converged = False
+
+            counter = 0
+            async with aclosing(
+                self._xgboost_service.iterate_goals(engine)
+            ) as iteration_goals:
+                async for _, home_goals, away_goals in iteration_goals:
+                    if monitor is not None:
+                        converged = monitor.add(home_goals, away_goals)
+                    else:
+                        aggregator.add(home_goals, away_goals)
+                    PREDICT_ITERATIONS.inc()
+                    counter += 1
+
+                    if converged:
+                        self._on_converged(predict_request, monitor)
+                        break
+
+                    if (
+                        progress_every
+                        and counter % progress_every == 0
+                        and counter < predict_request.iteration_count
+                    ):
+                        yield (
+                            "PROGRESS",
+                            aggregator.summary(predict_request.simulation_id),
+                            counter,
+                        )
+        except Exception:
+            logger.exception("Prediction summary crashed")
+            raise
+
+        summary = aggregator.summary(
+            predict_request.simulation_id, converged=converged
+        )
+        PREDICTION_STANDARD_ERROR.observe(summary.standard_error)
+        yield ("COMPLETED", summary, counter)
+
+    @staticmethod
+    def _aggregator(init_prediction: InitPrediction) -> PredictionAggregator:
+        return PredictionAggregator(
+            init_prediction.fixtures,
+            init_prediction.played_match_rounds,
+            relegation_places=app_config.prediction.relegation_places,
+        )
+
+    @staticmethod
+    def _convergence_monitor(
+        engine: PredictionEngine, aggregator: PredictionAggregator
+    ) -> Optional[ConvergenceMonitor]:
+        predict_request = engine.predict_request
+        tolerance = predict_request.convergence_tolerance
+        if tolerance is None:
+            tolerance = app_config.prediction.convergence_tolerance
+        if not tolerance or tolerance <= 0:
+            return None
+        if engine.goal_sampling != "poisson":
+            # round(lambda): każda iteracja jest taka sama, SE = 0 nic nie mówi o precyzji
+            logger.warning(
+                "Convergence check disabled for simulation_id=%s: goal_sampling=%s is "
+                "deterministic (convergence_tolerance=%s needs goal_sampling=poisson)",
+                predict_request.simulation_id,
+                engine.goal_sampling,
+                tolerance,
             )
+            return None
+        return ConvergenceMonitor(
+            aggregator,
+            tolerance,
+            check_every=app_config.prediction.convergence_check_every,
+            min_iterations=app_config.prediction.convergence_min_iterations,
+        )
+
+    @staticmethod
+    def _on_converged(
+        predict_request: PredictRequest, monitor: ConvergenceMonitor
+    ) -> None:
+        PREDICTION_EARLY_STOPS.inc()
+        logger.info(
+            "Prediction converged for simulation_id=%s after %s/%s iterations "
+            "(standard error %.5f <= %.5f)",
+            predict_request.simulation_id,
+            monitor.aggregator.iterations,
+            predict_request.iteration_count,
+            monitor.standard_error,
+            monitor.tolerance,
+        )
+
+    async def run_outcome_probabilities(
+        self, predict_request: PredictRequest
+    ) -> AnalyticPrediction:
+        """Analityczne prawdopodobieństwa wyników (macierze Poissona, bez iteracji)."""
+        with aggregate_warnings(logger, "analytic outcome probabilities"):
+            init_prediction, models = await self._prepare_prediction(predict_request)
+            return await self._xgboost_service.predict_outcome_probabilities(
+                PredictionEngine(predict_request, init_prediction, models)
+            )
+
+    async def _prepare_prediction(
+        self, predict_request: PredictRequest
+    ) -> Tuple[InitPrediction, TrainedModels]:
+        topology = await self._sportsdata_service.get_league_topology(
+            league_id=predict_request.league_id
+        )
 
-            init_prediction = await self.init_prediction(
-                predict_request, rounds, prev_round_id_by_round_id
+        all_match_rounds = (
+            await self._sportsdata_service.get_match_rounds_by_league_rounds(
+                list(topology.rounds)
             )
+        )
 
-            if init_prediction.list_simulation_ids:
-                models = await self._xgboost_service.train_evaluate_and_save(
-                    predictRequest=predict_request,
-                    t_dataset=init_prediction.training_dataset,
+        scheduler = get_training_scheduler()
+        if scheduler is not None:
+            # trening działa w tle (TrainingScheduler) - tu tylko aktywna wersja z rejestru
+            scheduler.register(predict_request)
+            models = await self._xgboost_service.get_trained_models(predict_request)
+            if models is not None:
+                init_prediction = self._init_fixtures(
+                    predict_request, topology, all_match_rounds, []
                 )
-            else:
+                return init_prediction, models
+            # liga bez żadnej wersji (pierwszy request) - jeden trening na ścieżce requestu
+            # (albo dołączenie do trwającego), zamiast predykcji na modelu bez fitu
+            logger.info(
+                "No trained models for league_id=%s yet, training on the request path",
+                predict_request.league_id,
+            )
+
+        init_prediction = await self.init_prediction(
+            predict_request, topology, all_match_rounds
+        )
+
+        if init_prediction.list_simulation_ids:
+            models = await self._train_league(
+                predict_request,
+                topology,
+                all_match_rounds,
+                init_prediction.list_simulation_ids,
+            )
+        else:
+            # brak nowych symulacji, ale inny request może właśnie trenować tę ligę
+            # (zabrał je z synchronizacji) - czekamy na jego modele zamiast czytać stare
+            models = await _training_flight.join(predict_request.league_id)
+            if models is None:
                 models = await self._xgboost_service.get_evaluated_models(
                     predict_request
                 )
+        return init_prediction, models
 
-            counter = 0
-
-            for iteration in range(predict_request.iteration_count):
-                iteration_result = await self._xgboost_service.predict_results(
-                    predict_request, init_prediction, iteration, models
+    async def simulations_for_league(
+        self, predict_request: PredictRequest, list_simulation_ids: List[str]
+    ) -> List[str]:
+        """
+        Symulacje ligi z predict_request (TrainingScheduler): liga symulacji to liga rund
+        z jej pierwszej iteracji. Błąd upstreamu -> wyjątek (scheduler spróbuje ponownie).
+        """
+        topology = await self._sportsdata_service.get_league_topology(
+            league_id=predict_request.league_id
+        )
+        league_simulation_ids = []
+        for simulation_id in list_simulation_ids:
+            page = await self.run_get_iterationResults_page(simulation_id, 0, 1)
+            if page is None:
+                raise RuntimeError(
+                    f"Iteration results unavailable for simulation_id={simulation_id}"
                 )
-                counter += 1
+            if any(
+                m.round_id in topology.index_by_round_id
+                for it_result in page.items
+                for m in it_result.simulated_match_rounds or []
+            ):
+                league_simulation_ids.append(simulation_id)
+        return league_simulation_ids
 
-                # stream item
-                yield ("RUNNING", iteration_result, counter)
-        except Exception:
-            logger.exception("Yield/mapper crashed")
-            raise
+    async def train_league(
+        self, predict_request: PredictRequest, list_simulation_ids: List[str]
+    ) -> TrainedModels:
+        """
+        Trening ligi poza ścieżką requestu (TrainingScheduler): dataset z podanych
+        symulacji, fit w osobnym wątku, zapis artefaktów.
+        """
+        topology = await self._sportsdata_service.get_league_topology(
+            league_id=predict_request.league_id
+        )
+        all_match_rounds = (
+            await self._sportsdata_service.get_match_rounds_by_league_rounds(
+                list(topology.rounds)
+            )
+        )
+        return await self._train_league(
+            predict_request, topology, all_match_rounds, list_simulation_ids
+        )
 
-        # final event as last yield (instead of return value)
-        yield ("COMPLETED", None, counter)
+    async def _train_league(
+        self,
+        predict_request: PredictRequest,
+        topology: LeagueTopology,
+        all_match_rounds: List[MatchRound],
+        list_simulation_ids: List[str],
+    ) -> TrainedModels:
+        async def train(simulation_ids: List[str]) -> TrainedModels:
+            # simulation_ids = suma symulacji wszystkich zgłoszeń z tej paczki
+            training_dataset = await self._training_dataset(
+                predict_request, topology, simulation_ids, all_match_rounds
+            )
+            return await self._xgboost_service.train_evaluate_and_save(
+                predictRequest=predict_request, t_dataset=training_dataset
+            )
+
+        return await _training_flight.do(
+            predict_request.league_id, list_simulation_ids, train
+        )
 
     async def init_prediction(
         self,
         predict_request: PredictRequest,
-        rounds: List[LeagueRound],
-        prev_round_id_by_round_id: Dict[str, str],
+        topology: LeagueTopology,
+        all_match_rounds: List[MatchRound],
     ) -> InitPrediction:
 
         list_simulation_ids = await self.get_pending_simulations_to_sync()
@@ -99,50 +424,119 @@ class SimulationService:
                 predict_request.simulation_id
             )  # do not use currently proceeded simulation
 
-        all_match_rounds = (
-            await self._sportsdata_service.get_match_rounds_by_league_rounds(rounds)
+        # dataset z tych symulacji buduje dopiero trening (_train_league) - razem z
+        # symulacjami innych requestów, które trafiły do tej samej paczki
+        return self._init_fixtures(
+            predict_request, topology, all_match_rounds, list_simulation_ids
         )
-        list_training_data_dataset = []
 
-        round_no_by_round_id = Mapper.map_round_no_by_round_id(rounds)
-        round_id_by_round_no = Mapper.map_round_id_by_round_no(rounds)
+    async def _training_dataset(
+        self,
+        predict_request: PredictRequest,
+        topology: LeagueTopology,
+        list_simulation_ids: List[str],
+        all_match_rounds: List[MatchRound],
+    ) -> TrainingDataset:
+        list_training_data_dataset = []
+        training_config = app_config.training
+        # limit wierszy: próbkowanie w jednym przebiegu, przed kompakcją i splitem
+        sampler = (
+            TrainingSampler(
+                training_config.max_rows,
+                topology.round_no_by_round_id,
+                recency_half_life=training_config.recency_half_life,
+                seed=predict_request.seed,
+            )
+            if training_config.max_rows > 0
+            else None
+        )
+        # rozegrane mecze powtarzają się w każdej iteracji - zwijamy je na bieżąco
+        compactor = TrainingCompactor() if training_config.compaction else None
 
-        if list_simulation_ids is not None and len(list_simulation_ids) != 0:
-            for sim_id in list_simulation_ids:
-                paged_iteration_results = (
-                    await self.run_get_iterationResults_by_simulationId(
-                        simulation_id=sim_id
-                    )
+        def add_simulation(iteration_results: List[IterationResult], age: int) -> None:
+            for it_result in iteration_results:
+                match_rounds = self._sportsdata_service.concat_match_rounds_by_simulated_match_rounds(
+                    all_match_rounds=all_match_rounds,
+                    simulated_match_rounds=it_result.simulated_match_rounds,
                 )
-                for it_result in paged_iteration_results.items:
+                with DATASET_BUILD_LATENCY.time():
                     tmp_dataset = TrainingBuilder.build_dataset(
                         iteration_result=it_result,
-                        match_rounds=await self._sportsdata_service.concat_match_rounds_by_simulated_match_rounds(
-                            all_match_rounds=all_match_rounds,
-                            simulated_match_rounds=it_result.simulated_match_rounds,
-                        ),
-                        prev_round_id_by_round_id=prev_round_id_by_round_id,
-                        round_no_by_round_id=round_no_by_round_id,
-                        round_id_by_round_no=round_id_by_round_no,
-                        league_id=predict_request.league_id,
+                        match_rounds=match_rounds,
+                        prev_round_id_by_round_id=topology.prev_round_id_by_round_id,
+                        round_no_by_round_id=topology.round_no_by_round_id,
+                        round_id_by_round_no=topology.round_id_by_round_no,
+                        league_id=topology.league_id,
                         league_avg=predict_request.league_avg_strength,
                     )
+                DATASET_ROWS.inc(len(tmp_dataset))
+                if sampler is not None:
+                    sampler.add(tmp_dataset, age=age)
+                elif compactor is not None:
+                    compactor.add(tmp_dataset)
+                else:
                     list_training_data_dataset.extend(  # extend() because of stays in the single list
                         tmp_dataset
                     )
-        training_splitted_dataset = TrainingSplit.define_train_split(
-            dataset=list_training_data_dataset,
-            round_no_by_round_id=round_no_by_round_id,
-            train_until_round_no=predict_request.train_until_round_no,
-            train_ratio=predict_request.train_ratio,
-        )
 
+        def finish() -> TrainingDataset:
+            dataset = list_training_data_dataset
+            if sampler is not None:
+                dataset = sampler.dataset()
+                logger.info(
+                    "Training sampling: %s rows -> %s rows (max_rows=%s)",
+                    sampler.input_rows,
+                    len(dataset),
+                    training_config.max_rows,
+                )
+                if compactor is not None:
+                    compactor.add(dataset)
+            if compactor is not None:
+                dataset = compactor.dataset()
+                DATASET_COMPACTED_ROWS.inc(len(dataset))
+                logger.info(
+                    "Training compaction: %s rows -> %s weighted rows",
+                    compactor.input_rows,
+                    len(dataset),
+                )
+            return TrainingSplit.define_train_split(
+                dataset=dataset,
+                round_no_by_round_id=topology.round_no_by_round_id,
+                train_until_round_no=predict_request.train_until_round_no,
+                train_ratio=predict_request.train_ratio,
+            )
+
+        # I/O (iteracje symulacji) na pętli zdarzeń, budowa wierszy (CPU) w osobnym
+        # wątku - po jednej symulacji, więc w pamięci jest naraz tylko jej paczka iteracji
+        for sim_index, sim_id in enumerate(list_simulation_ids or []):
+            # lista z GetLatestSimulationIds - ostatnia symulacja jest najnowsza
+            age = len(list_simulation_ids) - 1 - sim_index
+            paged_iteration_results = await self.run_get_iterationResults_by_simulationId(
+                simulation_id=sim_id
+            )
+            await asyncio.to_thread(add_simulation, paged_iteration_results.items, age)
+        return await asyncio.to_thread(finish)
+
+    @staticmethod
+    def _init_fixtures(
+        predict_request: PredictRequest,
+        topology: LeagueTopology,
+        all_match_rounds: List[MatchRound],
+        list_simulation_ids: List[str],
+    ) -> InitPrediction:
+        fixture_ids = {m.id for m in predict_request.matches_to_simulate}
         return InitPrediction(
-            training_splitted_dataset,
+            TrainingDataset(train=[], test=[]),
             list_simulation_ids,
-            prev_round_id_by_round_id,
-            round_no_by_round_id,
-            round_id_by_round_no,
+            topology,
+            MatchFixtures.from_match_rounds(
+                predict_request.matches_to_simulate, topology
+            ),
+            played_match_rounds=[
+                m
+                for m in all_match_rounds
+                if m.is_played and m.id not in fixture_ids
+            ],
         )
 
     async def run_all_overview_scenario(self):
@@ -173,6 +567,28 @@ class SimulationService:
         )
         return result
 
+    async def run_get_iterationResults_page(
+        self, simulation_id: str, offset: int, limit: int
+    ) -> Optional[PagedResponse[IterationResult]]:
+        return await self._iteration_results.get_iterationResults_page_BySimulationId(
+            simulation_id, offset, limit
+        )
+
+    def iter_iterationResults_by_simulationId(
+        self, simulation_id: str
+    ) -> AsyncIterator[List[IterationResult]]:
+        return self._iteration_results.iter_iterationResults_BySimulationId(simulation_id)
+
+    async def run_simulation_overviews_page(
+        self, offset: int, limit: int
+    ) -> Optional[PagedResponse[SimulationOverview]]:
+        return await self._simulation_engine.get_paged_simulation_overviews(
+            offset=offset, limit=limit
+        )
+
+    def iter_simulation_overviews(self) -> AsyncIterator[SimulationOverview]:
+        return self._simulation_engine.get_all_paged_simulation_overviews()
+
     async def get_pending_simulations_to_sync(self) -> List[str]:
         synch = self._synchronization.get_synchronization() or Synchronization(
             last_sync_date=datetime(1900, 1, 1),
@@ -1,12 +1,27 @@
-from typing import List
+from time import monotonic
+from typing import Dict, List, Optional, Tuple
 from src.core import get_logger
+from src.core.config import config
 from src.di.ports.adapters.league_round_port import LeagueRoundPort
 from src.di.ports.adapters.match_round_port import MatchRoundPort
 from src.di.ports.sportsdata_service_port import SportsDataServicePort
-from src.domain.entities import LeagueRound, MatchRound
+from src.domain.entities import LeagueRound, LeagueTopology, MatchRound
+from src.domain.ids import ids
 
 logger = get_logger(__name__)
 
+# league_id -> (topologia ostatniej wersji ligi, kiedy pobrano rundy); współdzielona
+# między requestami, bo SportsDataService jest tworzony per request przez DI
+_topology_cache: Dict[str, Tuple[LeagueTopology, float]] = {}
+
+
+def invalidate_league_topology(league_id: Optional[str] = None) -> None:
+    """Wymusza pobranie rund przy następnym requeście (jednej ligi albo wszystkich)."""
+    if league_id is None:
+        _topology_cache.clear()
+    else:
+        _topology_cache.pop(league_id, None)
+
 
 class SportsDataService(SportsDataServicePort):
     def __init__(
@@ -24,6 +39,31 @@ class SportsDataService(SportsDataServicePort):
 
         return result
 
+    async def get_league_topology(self, league_id: str) -> LeagueTopology:
+        """
+        Topologia rund ligi. Przez topology_ttl_seconds od pobrania rund zwracamy ją
+        z pamięci bez RPC; potem pobieramy rundy ponownie, a sortowanie i mapy rund
+        liczymy od nowa tylko, gdy zmienił się ich zestaw (wersja ligi).
+        """
+        cached = _topology_cache.get(league_id)
+        now = monotonic()
+        if cached is not None and now - cached[1] < config.sportsdata_grpc.topology_ttl_seconds:
+            return cached[0]
+
+        rounds = await self.get_league_rounds_by_league_id(league_id=league_id)
+
+        if cached is not None and cached[0].signature == LeagueTopology.signature_of(rounds):
+            _topology_cache[league_id] = (cached[0], now)
+            return cached[0]
+
+        topology = LeagueTopology.from_rounds(ids.to_int(league_id), rounds)
+        if rounds:
+            _topology_cache[league_id] = (topology, now)
+        logger.debug(
+            "League topology built for league_id=%s (%s rounds)", league_id, len(topology)
+        )
+        return topology
+
     async def get_match_rounds_by_league_rounds(
         self, league_rounds: List[LeagueRound]
     ) -> List[MatchRound]:
@@ -37,7 +77,7 @@ class SportsDataService(SportsDataServicePort):
             )
         return match_rounds
 
-    async def concat_match_rounds_by_simulated_match_rounds(
+    def concat_match_rounds_by_simulated_match_rounds(
         self,
         all_match_rounds: List["MatchRound"],
         simulated_match_rounds: List["MatchRound"],
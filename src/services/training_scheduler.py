@@ -0,0 +1,140 @@
+"""
+Trening modeli w tle (TRAINING_SCHEDULER_INTERVAL_SECONDS > 0), poza StreamPrediction.
+
+Scheduler co `interval` sekund (albo od razu po zgłoszeniu nowej ligi) pyta
+SimulationEngine o nowe symulacje i dopisuje je do kolejki każdej ligi, o którą pytano
+w predykcji; z kolejki ligi zostają tylko jej symulacje, na nich powstaje dataset
+i model (fit w osobnym wątku). Nieudany trening zostawia kolejkę na następny cykl -
+znacznik synchronizacji jest już przesunięty, więc inaczej te symulacje by przepadły. Zapis to nowa wersja w
+ModelRegistry + podmiana aktywnych modeli w pamięci - request widzi stary albo nowy
+zestaw, nigdy częściowy. Predykcja startuje od razu na aktywnej wersji.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from dataclasses import replace
+from typing import Dict, List, Optional
+
+from src.core.logger import get_logger
+from src.core.metrics import SCHEDULED_TRAININGS
+from src.di.ports.simulation_service_port import SimulationServicePort
+from src.domain.entities import PredictRequest
+
+logger = get_logger(__name__)
+
+
+class TrainingScheduler:
+    def __init__(self, simulation_service: SimulationServicePort, interval_seconds: float):
+        self._simulation_service = simulation_service
+        self._interval_seconds = interval_seconds
+        # liga -> parametry treningu z ostatniego requestu (bez fixtures i sił drużyn)
+        self._requests: Dict[str, PredictRequest] = {}
+        # liga -> symulacje czekające na (udany) trening tej ligi
+        self._pending: Dict[str, List[str]] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    # ---------- ścieżka requestu ----------
+
+    def register(self, predict_request: PredictRequest) -> None:
+        league_id = predict_request.league_id
+        is_new = league_id not in self._requests
+        self._requests[league_id] = replace(
+            predict_request, team_strengths={}, matches_to_simulate=[]
+        )
+        if is_new:
+            self._wakeup.set()
+
+    # ---------- pętla w tle ----------
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="training-scheduler")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._interval_seconds)
+            self._wakeup.clear()
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Scheduled training poll failed")
+
+    async def run_once(self) -> int:
+        """Jeden cykl: nowe symulacje -> trening każdej znanej ligi. Zwraca liczbę nowych symulacji."""
+        if not self._requests:
+            # bez znanych lig nie przesuwamy znacznika synchronizacji
+            return 0
+        list_simulation_ids = await self._simulation_service.get_pending_simulations_to_sync()
+        for league_id in self._requests:
+            pending = self._pending.setdefault(league_id, [])
+            pending.extend(s for s in list_simulation_ids if s not in pending)
+        if not any(self._pending.values()):
+            return 0
+
+        logger.info(
+            "Scheduled training: %s new simulations, pending per league=%s",
+            len(list_simulation_ids),
+            {league_id: len(pending) for league_id, pending in self._pending.items()},
+        )
+        for league_id, predict_request in list(self._requests.items()):
+            if not self._pending.get(league_id):
+                continue
+            try:
+                league_simulation_ids = await self._simulation_service.simulations_for_league(
+                    predict_request, list(self._pending[league_id])
+                )
+                # symulacje innych lig wypadają z kolejki od razu
+                self._pending[league_id] = league_simulation_ids
+                if league_simulation_ids:
+                    await self._simulation_service.train_league(
+                        predict_request, list(league_simulation_ids)
+                    )
+            except Exception:
+                SCHEDULED_TRAININGS.inc(status="failed")
+                logger.exception(
+                    "Scheduled training failed for league_id=%s, %s simulations kept for retry",
+                    league_id,
+                    len(self._pending[league_id]),
+                )
+                continue
+            self._pending[league_id] = []
+            if league_simulation_ids:
+                SCHEDULED_TRAININGS.inc(status="published")
+        return len(list_simulation_ids)
+
+
+_scheduler: Optional[TrainingScheduler] = None
+
+
+def get_training_scheduler() -> Optional[TrainingScheduler]:
+    """Działający scheduler albo None (trening na ścieżce requestu)."""
+    return _scheduler
+
+
+def start_training_scheduler(
+    simulation_service: SimulationServicePort, interval_seconds: float
+) -> TrainingScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = TrainingScheduler(simulation_service, interval_seconds)
+        _scheduler.start()
+    return _scheduler
+
+
+async def stop_training_scheduler() -> None:
+    global _scheduler
+    if _scheduler is not None:
+        await _scheduler.stop()
+        _scheduler = None
@@ -0,0 +1,129 @@
+"""
+Wspólny model goli: jeden booster XGBoost z dwukolumnowym targetem (home, away)
+zamiast dwóch XGBRegressor na tej samej macierzy cech (XGB_JOINT_MODEL).
+
+XGBoost 2.0 nie obsługuje multi-output dla `count:poisson`, więc Poissona liczymy
+własnym celem (gradient/hessian jak w count:poisson, z max_delta_step) na marginesie
+log(lambda); predict zwraca margines, a lambdy to exp(margines).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+JOINT_TARGETS = 2  # kolumny: home, away
+# to samo zabezpieczenie co domyślne max_delta_step w count:poisson
+POISSON_MAX_DELTA_STEP = 0.7
+EVAL_METRIC = "poisson-nloglik"
+
+
+def _labels(dmatrix: xgb.DMatrix) -> np.ndarray:
+    return dmatrix.get_label().reshape(-1, JOINT_TARGETS)
+
+
+def _weights(dmatrix: xgb.DMatrix) -> Optional[np.ndarray]:
+    """Wagi wierszy [n, 1] (wspólne dla obu kolumn) albo None, gdy DMatrix ich nie ma."""
+    weight = dmatrix.get_weight()
+    return weight.reshape(-1, 1) if weight.size else None
+
+
+def poisson_objective(
+    margin: np.ndarray, dtrain: xgb.DMatrix
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Gradient/hessian Poissona po marginesie [n, 2]; Booster.boost oczekuje
+    spłaszczonych tablic (n * 2), kolejność wierszowa jak w etykietach.
+    Własny cel nie dostaje wag od XGBoost - mnożymy przez nie sami.
+    """
+    margin = margin.reshape(-1, JOINT_TARGETS)
+    y = _labels(dtrain)
+    grad = np.exp(margin) - y
+    hess = np.exp(margin + POISSON_MAX_DELTA_STEP)
+    weight = _weights(dtrain)
+    if weight is not None:
+        grad, hess = grad * weight, hess * weight
+    return grad.ravel(), hess.ravel()
+
+
+def poisson_nloglik(margin: np.ndarray, dmatrix: xgb.DMatrix) -> Tuple[str, float]:
+    """Ważona średnia ujemna log-wiarygodność Poissona (bez stałej log(y!)) po obu kolumnach."""
+    margin = margin.reshape(-1, JOINT_TARGETS)
+    y = _labels(dmatrix)
+    loss = np.exp(margin) - y * margin
+    weight = _weights(dmatrix)
+    if weight is None:
+        return EVAL_METRIC, float(np.mean(loss))
+    return EVAL_METRIC, float(np.sum(loss * weight) / (np.sum(weight) * JOINT_TARGETS))
+
+
+def train_joint_booster(
+    params: Dict[str, Any],
+    X_train: np.ndarray,
+    Y_train: np.ndarray,
+    X_test: np.ndarray,
+    Y_test: np.ndarray,
+    feature_names: List[str],
+    *,
+    num_boost_round: int,
+    max_bin: int,
+    early_stopping_rounds: Optional[int],
+    w_train: Optional[np.ndarray] = None,
+    w_test: Optional[np.ndarray] = None,
+) -> xgb.Booster:
+    """
+    `params` - parametry drzew (jak dla XGBRegressor); cel i metrykę ustawiamy tutaj.
+    Early stopping działa tylko z niepustym zbiorem testowym.
+    """
+    d_train = xgb.QuantileDMatrix(
+        X_train, label=Y_train, weight=w_train, feature_names=feature_names, max_bin=max_bin
+    )
+    d_test = (
+        xgb.QuantileDMatrix(
+            X_test,
+            label=Y_test,
+            weight=w_test,
+            feature_names=feature_names,
+            max_bin=max_bin,
+            ref=d_train,
+        )
+        if len(X_test) > 0
+        else None
+    )
+
+    mean_goals = float(np.average(Y_train, axis=0, weights=w_train).mean()) if len(Y_train) else 1.0
+    params = dict(
+        params,
+        objective="reg:squarederror",  # tylko kontener - gradienty daje poisson_objective
+        disable_default_eval_metric=1,
+        tree_method="hist",
+        max_bin=max_bin,  # musi się zgadzać z QuantileDMatrix
+        base_score=float(np.log(max(mean_goals, 1e-3))),
+        multi_strategy=params.get("multi_strategy") or "one_output_per_tree",
+    )
+    return xgb.train(
+        params,
+        d_train,
+        num_boost_round=num_boost_round,
+        obj=poisson_objective,
+        custom_metric=poisson_nloglik,
+        evals=[(d_test, "validation_0")] if d_test is not None else (),
+        early_stopping_rounds=early_stopping_rounds if d_test is not None else None,
+        verbose_eval=False,
+    )
+
+
+def predict_joint(
+    booster: xgb.Booster,
+    X: pd.DataFrame,
+    iteration_range: Tuple[int, int] = (0, 0),
+) -> Tuple[np.ndarray, np.ndarray]:
+    """(lambda_home, lambda_away) z jednego wywołania predict."""
+    margin = booster.inplace_predict(
+        X, iteration_range=iteration_range, predict_type="margin"
+    ).reshape(-1, JOINT_TARGETS)
+    lam = np.exp(margin)
+    return lam[:, 0], lam[:, 1]
@@ -0,0 +1,182 @@
+"""
+Wersjonowany rejestr modeli ligi pod STORAGE_DIR:
+
+    models/{league_id}/v1/, v2/, ...   - niezmienne katalogi wersji (modele + metadane)
+    models/{league_id}/CURRENT         - wskaźnik aktywnej wersji ("v2")
+
+Nowa wersja powstaje w katalogu tymczasowym, jest przemianowana na v{N} (rename
+katalogu jest atomowy) i dopiero potem wskaźnik CURRENT jest podmieniany przez
+os.replace - czytelnik widzi w całości starą albo nową wersję, nigdy mieszankę.
+Starsze wersje ponad `retention` są usuwane (poprzednia zostaje zawsze - ktoś może
+ją jeszcze wczytywać).
+
+Rejestr trzyma też w pamięci aktywną wersję i jej TrainedModels per liga (hot-swap):
+w procesie to pamięć jest źródłem prawdy - odczyt to jeden lookup w dict, bez blokad
+i bez I/O; publikacja/aktywacja podmienia wpis pod blokadą publikacji. CURRENT jest
+czytany tylko przy zimnym starcie ligi (np. po restarcie).
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.core.logger import get_logger
+from src.domain.entities import TrainedModels
+
+logger = get_logger(__name__)
+
+MODELS_DIR = "models"
+CURRENT_POINTER = "CURRENT"
+_VERSION_DIR = re.compile(r"^v(\d+)$")
+
+
+@dataclass(frozen=True)
+class ModelVersion:
+    league_id: str
+    version: int
+    # katalog wersji względem STORAGE_DIR (ścieżki dla JsonFileRepository)
+    relative_dir: str
+
+
+@dataclass
+class StagedVersion:
+    """Katalog roboczy nowej wersji; `version` jest ustawiane po publikacji."""
+
+    league_id: str
+    relative_dir: str
+    version: Optional[int] = None
+
+
+class ModelRegistry:
+    def __init__(self, root: Path, retention: int):
+        self.root = Path(root)
+        self.retention = retention
+        # liga -> (aktywna wersja, jej modele albo None, gdy jeszcze nie wczytane)
+        self._active: Dict[str, Tuple[int, Optional[TrainedModels]]] = {}
+        self._lock = threading.Lock()  # publikacja/aktywacja (zapis z wątku schedulera)
+
+    # ---------- katalogi ----------
+
+    def _league_relative_dir(self, league_id: str) -> str:
+        return f"{MODELS_DIR}/{league_id}"
+
+    def _league_dir(self, league_id: str) -> Path:
+        return self.root / self._league_relative_dir(league_id)
+
+    def versions(self, league_id: str) -> List[int]:
+        league_dir = self._league_dir(league_id)
+        if not league_dir.is_dir():
+            return []
+        found = (_VERSION_DIR.match(entry.name) for entry in league_dir.iterdir())
+        return sorted(int(match.group(1)) for match in found if match)
+
+    def current_version(self, league_id: str) -> Optional[int]:
+        try:
+            raw = (self._league_dir(league_id) / CURRENT_POINTER).read_text().strip()
+        except FileNotFoundError:
+            return None
+        match = _VERSION_DIR.match(raw)
+        return int(match.group(1)) if match else None
+
+    def current(self, league_id: str) -> Optional[ModelVersion]:
+        version = self.current_version(league_id)
+        if version is None:
+            return None
+        return ModelVersion(
+            league_id, version, f"{self._league_relative_dir(league_id)}/v{version}"
+        )
+
+    # ---------- zapis nowej wersji ----------
+
+    @contextmanager
+    def new_version(self, league_id: str) -> Iterator[StagedVersion]:
+        """
+        Katalog roboczy nowej wersji; po poprawnym wyjściu z `with` wersja jest
+        publikowana (rename + CURRENT), po wyjątku katalog roboczy jest usuwany.
+        """
+        league_dir = self._league_dir(league_id)
+        league_dir.mkdir(parents=True, exist_ok=True)
+        staging_name = f".staging-{uuid.uuid4().hex}"
+        staging = league_dir / staging_name
+        staging.mkdir()
+        staged = StagedVersion(
+            league_id, f"{self._league_relative_dir(league_id)}/{staging_name}"
+        )
+        try:
+            yield staged
+            with self._lock:
+                version = max(self.versions(league_id), default=0) + 1
+                os.rename(staging, league_dir / f"v{version}")
+                self._switch(league_id, version)
+                # modele nowej wersji dopiero przyjdą przez activate()
+                self._active[league_id] = (version, None)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        staged.version = version
+        logger.info(">> Model registry: league_id=%s -> v%s", league_id, version)
+        self._prune(league_id, version)
+
+    def _switch(self, league_id: str, version: int) -> None:
+        pointer = self._league_dir(league_id) / CURRENT_POINTER
+        tmp = pointer.with_name(f"{CURRENT_POINTER}.{uuid.uuid4().hex}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(f"v{version}")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, pointer)
+
+    def _prune(self, league_id: str, current_version: int) -> None:
+        old = [v for v in self.versions(league_id) if v != current_version]
+        # retention=0 też zostawia poprzednią wersję - równoległy odczyt mógł ją już zacząć
+        for version in old[: max(0, len(old) - max(1, self.retention))]:
+            shutil.rmtree(self._league_dir(league_id) / f"v{version}", ignore_errors=True)
+            logger.info(">> Model registry: pruned league_id=%s v%s", league_id, version)
+
+    # ---------- aktywne modele w pamięci ----------
+
+    def version(self, league_id: str) -> Optional[int]:
+        """Aktywna wersja ligi z pamięci; CURRENT czytany tylko przy zimnym starcie."""
+        entry = self._active.get(league_id)
+        if entry is not None:
+            return entry[0]
+        version = self.current_version(league_id)
+        if version is None:
+            return None
+        with self._lock:
+            return self._active.setdefault(league_id, (version, None))[0]
+
+    def active(self, league_id: str) -> Optional[TrainedModels]:
+        """Modele aktywnej wersji z pamięci (bez I/O); None, gdy jeszcze nie wczytane."""
+        entry = self._active.get(league_id)
+        return entry[1] if entry is not None else None
+
+    def activate(self, league_id: str, version: int, models: TrainedModels) -> None:
+        with self._lock:
+            entry = self._active.get(league_id)
+            # wczytanie starszej wersji nie cofa świeżo opublikowanej
+            if entry is None or version >= entry[0]:
+                self._active[league_id] = (version, models)
+
+
+_registries: Dict[Path, ModelRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_model_registry(root: Path, retention: int) -> ModelRegistry:
+    """Jeden rejestr (i cache modeli) na katalog STORAGE_DIR w procesie."""
+    key = Path(root).resolve()
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = ModelRegistry(key, retention)
+        return registry
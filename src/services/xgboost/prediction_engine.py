@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+from operator import attrgetter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.core import config as app_config
+from src.core.config import GOAL_SAMPLING_MODES, VARIANCE_REDUCTION_MODES
+from src.domain.entities import (
+    MAX_GOALS,
+    InitPrediction,
+    PredictRequest,
+    TeamStrength,
+    TrainedModels,
+)
+from src.domain.features.mapper import Mapper
+from src.domain.features.predictions.poisson_outcomes import poisson_quantiles
+from src.domain.features.trainings.training_builder import TrainingBuilder
+from src.services.xgboost.joint_goal_model import predict_joint
+
+StrengthKey = Tuple[int, int]
+
+# drugi element spawn_key odróżnia strumień permutacji bloku od strumieni iteracji (i,)
+_STRATA_STREAM = 1
+
+
+def predict_lambdas(
+    models: TrainedModels, x_rows: List[dict]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Lambdy (home, away) dla wielu wierszy cech naraz, obcięte do [0, MAX_GOALS]."""
+    x_predict = Mapper.map_to_x_matrix(x_rows, models.feature_schema)
+    if models.joint is not None:
+        home, away = predict_joint(
+            models.joint, x_predict, models.iteration_range("joint")
+        )
+        return np.clip(home, 0.0, float(MAX_GOALS)), np.clip(away, 0.0, float(MAX_GOALS))
+    home = models.home.predict(x_predict, iteration_range=models.iteration_range("home"))
+    away = models.away.predict(x_predict, iteration_range=models.iteration_range("away"))
+    return np.clip(home, 0.0, float(MAX_GOALS)), np.clip(away, 0.0, float(MAX_GOALS))
+
+
+def sample_goals(
+    models: TrainedModels,
+    x_row: dict,
+    rng: Optional[np.random.Generator] = None,
+    uniforms: Optional[np.ndarray] = None,
+) -> Tuple[int, int]:
+    """
+    Gole (home, away) dla jednego wiersza cech: predict modeli (lambda) + clamp
+    [0, MAX_GOALS], potem round(lambda), losowanie Poisson(lambda) z `rng` albo - gdy
+    podano `uniforms` (u_home, u_away) - kwantyle Poissona (odwrotna dystrybuanta).
+    """
+    home_lambdas, away_lambdas = predict_lambdas(models, [x_row])
+    pred_home_goals = float(home_lambdas[0])
+    pred_away_goals = float(away_lambdas[0])
+
+    if uniforms is not None:
+        home_goals, away_goals = poisson_quantiles(
+            np.array((pred_home_goals, pred_away_goals)), uniforms
+        )
+        return int(home_goals), int(away_goals)
+
+    if rng is None:
+        return int(round(pred_home_goals)), int(round(pred_away_goals))
+
+    home_goals, away_goals = rng.poisson((pred_home_goals, pred_away_goals))
+    return int(min(home_goals, MAX_GOALS)), int(min(away_goals, MAX_GOALS))
+
+
+def resolve_seed_entropy(seed: Optional[int]) -> int:
+    """Seed requestu albo świeża entropia (wtedy wynik nie jest powtarzalny)."""
+    return int(seed) if seed is not None else int(np.random.SeedSequence().entropy)
+
+
+class PredictionEngine:
+    """
+    Synchroniczna predykcja jednej iteracji na `InitPrediction.fixtures`.
+
+    Stan wejściowy (fixtures, mapa sił z requestu) jest budowany raz per request i tylko
+    czytany; każda iteracja pracuje na własnej kopii mapy sił i zwraca tablice goli,
+    więc iteracje są od siebie niezależne (można je liczyć równolegle).
+
+    Losowanie (goal_sampling="poisson") używa osobnego strumienia RNG per iteracja
+    (SeedSequence(seed, spawn_key=(iteration_index,))), więc wynik iteracji nie zależy od
+    tego, w którym procesie i w jakiej kolejności została policzona.
+
+    variance_reduction != "none": każdy mecz dostaje z góry parę U(0,1) (gospodarze,
+    goście), a gole to kwantyle Poissona. Dzięki temu ten sam seed daje te same liczby
+    losowe per (iteracja, mecz) niezależnie od lambd (CRN - porównania scenariuszy),
+    "antithetic" paruje iteracje 2k/2k+1 przez u i 1 - u, a "stratified" dzieli U
+    każdego meczu na `strata` warstw, z których każda jest użyta dokładnie raz w bloku
+    `strata` kolejnych iteracji.
+    """
+
+    def __init__(
+        self,
+        predict_request: PredictRequest,
+        init_prediction: InitPrediction,
+        models: TrainedModels,
+        *,
+        goal_sampling: Optional[str] = None,
+        seed_entropy: Optional[int] = None,
+        variance_reduction: Optional[str] = None,
+        strata: Optional[int] = None,
+    ):
+        self.predict_request = predict_request
+        self.init_prediction = init_prediction
+        self.models = models
+        self.goal_sampling = (
+            goal_sampling
+            or predict_request.goal_sampling
+            or app_config.prediction.goal_sampling
+        )
+        if self.goal_sampling not in GOAL_SAMPLING_MODES:
+            raise ValueError(f"Unsupported goal_sampling={self.goal_sampling!r}")
+        self.variance_reduction = (
+            variance_reduction
+            or predict_request.variance_reduction
+            or app_config.prediction.variance_reduction
+        )
+        if self.variance_reduction not in VARIANCE_REDUCTION_MODES:
+            raise ValueError(
+                f"Unsupported variance_reduction={self.variance_reduction!r}"
+            )
+        self.strata = strata or app_config.prediction.strata
+        self._strata_block: Optional[Tuple[int, np.ndarray]] = None
+        self.seed_entropy = (
+            seed_entropy
+            if seed_entropy is not None
+            else resolve_seed_entropy(predict_request.seed)
+        )
+
+        self._league_avg_strength = getattr(
+            predict_request, "league_avg_strength", 1.7
+        )
+        self._base_strength_map = TeamStrength.strength_map_from_dict(
+            predict_request.team_strengths
+        )
+        # tablice fixtures jako listy intów raz per request (pętla iteracji czyta po indeksie)
+        fixtures = init_prediction.fixtures
+        self._round_ids: List[int] = fixtures.round_ids.tolist()
+        self._home_team_ids: List[int] = fixtures.home_team_ids.tolist()
+        self._away_team_ids: List[int] = fixtures.away_team_ids.tolist()
+        self._prev_round_ids: List[int] = fixtures.prev_round_ids.tolist()
+
+    def iteration_rng(self, iteration_index: int) -> Optional[np.random.Generator]:
+        if self.goal_sampling != "poisson":
+            return None
+        return self._rng(iteration_index)
+
+    def iteration_uniforms(self, iteration_index: int) -> Optional[np.ndarray]:
+        """U(0,1) [mecz, (home, away)] iteracji albo None (round / zwykły rng.poisson)."""
+        if self.goal_sampling != "poisson" or self.variance_reduction == "none":
+            return None
+        shape = (len(self.init_prediction.fixtures), 2)
+
+        if self.variance_reduction == "antithetic":
+            pair = iteration_index // 2
+            u = self._rng(pair).random(shape)
+            return 1.0 - u if iteration_index % 2 else u
+
+        u = self._rng(iteration_index).random(shape)
+        if self.variance_reduction == "stratified":
+            block, position = divmod(iteration_index, self.strata)
+            strata = self._block_strata(block, shape)
+            u = (strata[:, :, position] + u) / self.strata
+        return u
+
+    def _rng(self, index: int) -> np.random.Generator:
+        return np.random.default_rng(
+            np.random.SeedSequence(self.seed_entropy, spawn_key=(index,))
+        )
+
+    def _block_strata(self, block: int, shape: Tuple[int, int]) -> np.ndarray:
+        """Permutacja warstw 0..strata-1 per (mecz, drużyna) dla bloku iteracji (cache ostatniego)."""
+        if self._strata_block is None or self._strata_block[0] != block:
+            rng = np.random.default_rng(
+                np.random.SeedSequence(
+                    self.seed_entropy, spawn_key=(block, _STRATA_STREAM)
+                )
+            )
+            strata = np.broadcast_to(np.arange(self.strata), (*shape, self.strata))
+            self._strata_block = (block, rng.permuted(strata, axis=2))
+        return self._strata_block[1]
+
+    def _strength(
+        self,
+        strength_map: Dict[StrengthKey, object],
+        i: int,
+        is_home: bool,
+        last_update: str,
+    ) -> TeamStrength:
+        """Siła drużyny przed meczem `i`: najnowsza z poprzedniej rundy albo fallback."""
+        team_id = self._home_team_ids[i] if is_home else self._away_team_ids[i]
+        prev_round_id = self._prev_round_ids[i]
+        strengths = strength_map.get((team_id, prev_round_id))
+        if strengths:
+            if isinstance(strengths, TeamStrength):
+                return strengths
+            return max(strengths, key=attrgetter("last_update"))
+
+        # rzadka ścieżka: starsze rundy / średnia ligi - na meczu z requestu
+        topology = self.init_prediction.topology
+        return TrainingBuilder.get_strength_or_fallback(
+            strength_map,
+            topology.round_no_by_round_id,
+            topology.round_id_by_round_no,
+            self.init_prediction.fixtures.source[i],
+            is_home,
+            prev_round_id,
+            league_id=topology.league_id,
+            league_avg_strength=self._league_avg_strength,
+            last_update=last_update,
+        )
+
+    def simulate(
+        self, iteration_index: int, last_update: str
+    ) -> Tuple[np.ndarray, np.ndarray, Dict[StrengthKey, TeamStrength]]:
+        """
+        Zwraca (home_goals, away_goals, nowe TeamStrength) jednej iteracji.
+
+        Nowe siły to tylko wpisy dodane w tej iteracji (w kolejności dodania), pełną listę
+        składa `team_strengths()` - z procesów roboczych wraca więc mały wynik.
+        `last_update` - jeden timestamp dla wszystkich nowych TeamStrength w iteracji.
+        """
+        request = self.predict_request
+        fixtures = self.init_prediction.fixtures
+        uniforms = self.iteration_uniforms(iteration_index)
+        rng = None if uniforms is not None else self.iteration_rng(iteration_index)
+
+        # kopia per iteracja: nowe siły dopisujemy w miejscu (bez kopii mapy per mecz)
+        strength_map: Dict[StrengthKey, object] = dict(self._base_strength_map)
+        new_strengths: Dict[StrengthKey, TeamStrength] = {}
+        home_goals = np.empty(len(fixtures), dtype=np.int64)
+        away_goals = np.empty(len(fixtures), dtype=np.int64)
+
+        for i in range(len(fixtures)):
+            home_strength = self._strength(strength_map, i, True, last_update)
+            away_strength = self._strength(strength_map, i, False, last_update)
+
+            hg, ag = sample_goals(
+                self.models,
+                TrainingBuilder.feature_row(home_strength, away_strength),
+                rng,
+                None if uniforms is None else uniforms[i],
+            )
+            home_goals[i] = hg
+            away_goals[i] = ag
+
+            round_id = self._round_ids[i]
+            home_team_id = self._home_team_ids[i]
+            away_team_id = self._away_team_ids[i]
+            new_strengths[(home_team_id, round_id)] = strength_map[
+                (home_team_id, round_id)
+            ] = home_strength.with_match_result(
+                hg,
+                ag,
+                team_id=home_team_id,
+                round_id=round_id,
+                last_update=last_update,
+                games_to_reach_trust=request.games_to_reach_trust,
+                league_strength=request.league_avg_strength,
+            )
+            new_strengths[(away_team_id, round_id)] = strength_map[
+                (away_team_id, round_id)
+            ] = away_strength.with_match_result(
+                ag,
+                hg,
+                team_id=away_team_id,
+                round_id=round_id,
+                last_update=last_update,
+                games_to_reach_trust=request.games_to_reach_trust,
+                league_strength=request.league_avg_strength,
+            )
+
+        home_goals.flags.writeable = False
+        away_goals.flags.writeable = False
+        return home_goals, away_goals, new_strengths
+
+    def independent_fixtures(self) -> List[int]:
+        """
+        Indeksy meczów, których wejścia nie zależą od wcześniej symulowanych wyników:
+        obie drużyny grają tu swój pierwszy mecz w fixtures, więc siły pochodzą tylko
+        z mapy sił requestu (takie same w każdej iteracji).
+        """
+        fixtures = self.init_prediction.fixtures
+        seen = set()
+        independent: List[int] = []
+        for i, (home, away) in enumerate(
+            zip(fixtures.home_idx.tolist(), fixtures.away_idx.tolist())
+        ):
+            if home not in seen and away not in seen:
+                independent.append(i)
+            seen.update((home, away))
+        return independent
+
+    def fixture_lambdas(
+        self, fixture_indices: List[int], last_update: str
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Lambdy (home, away) wskazanych meczów na bazowej mapie sił - jeden predict na model."""
+        x_rows = [
+            TrainingBuilder.feature_row(
+                self._strength(self._base_strength_map, i, True, last_update),
+                self._strength(self._base_strength_map, i, False, last_update),
+            )
+            for i in fixture_indices
+        ]
+        if not x_rows:
+            return np.empty(0), np.empty(0)
+        return predict_lambdas(self.models, x_rows)
+
+    def team_strengths(
+        self, new_strengths: Dict[StrengthKey, TeamStrength]
+    ) -> List[TeamStrength]:
+        """Bazowa mapa sił + nowe siły iteracji (kolejność jak przy dopisywaniu w simulate())."""
+        strength_map: Dict[StrengthKey, object] = dict(self._base_strength_map)
+        strength_map.update(new_strengths)
+        return TeamStrength.strength_map_to_list(strength_map)
+
+    def run_iteration(
+        self, iteration_index: int, last_update: str
+    ) -> Tuple[np.ndarray, np.ndarray, List[TeamStrength]]:
+        home_goals, away_goals, new_strengths = self.simulate(
+            iteration_index, last_update
+        )
+        return home_goals, away_goals, self.team_strengths(new_strengths)
@@ -0,0 +1,361 @@
+"""
+Sharding iteracji predykcji na pulę procesów (PREDICTION_WORKERS > 0).
+
+Proces serwera publikuje stan requestu w `multiprocessing.shared_memory`:
+- surowe bajty boosterów (home/away albo jeden wspólny - XGB_JOINT_MODEL),
+- tablice MatchFixtures (jeden blok int64),
+- pickle reszty kontekstu (PredictRequest, LeagueTopology, schema, best_iterations,
+  snapshot rejestru id).
+
+Worker mapuje bloki raz per job (cache po tokenie) i liczy paczki kolejnych iteracji
+tym samym PredictionEngine co tryb w procesie. RNG jest per iteracja (seed + indeks
+iteracji), więc wynik nie zależy od podziału na paczki. Paczki są zlecane w oknie
+(workers * 2) i odbierane w kolejności zlecania - stream zachowuje kolejność iteracji.
+Ostrzeżenia z paczki wracają jako zliczenia i trafiają do scope streamu w serwerze
+(jedno podsumowanie na stream, nie na paczkę).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import multiprocessing
+import pickle
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime
+from multiprocessing.shared_memory import SharedMemory
+from time import perf_counter
+from typing import AsyncIterator, Deque, Dict, Hashable, List, Optional, Set, Tuple
+
+import numpy as np
+import xgboost as xgb
+
+from src.core.config import PredictionConfig
+from src.core.logger import aggregate_warnings, get_logger, merge_aggregated
+from src.domain.entities import (
+    InitPrediction,
+    MatchFixtures,
+    TeamStrength,
+    TrainedModels,
+    TrainingDataset,
+)
+from src.domain.ids import ids
+from src.services.xgboost.prediction_engine import PredictionEngine, StrengthKey
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class ShardIteration:
+    iteration_index: int
+    start_date: str
+    execution_seconds: float
+    home_goals: np.ndarray
+    away_goals: np.ndarray
+    new_strengths: Dict[StrengthKey, TeamStrength]
+
+
+@dataclass(frozen=True)
+class ShardChunk:
+    iterations: List[ShardIteration]
+    # zliczenia ostrzeżeń z paczki (WarningAggregator.events())
+    warnings: Dict[str, Tuple[int, Set[Hashable], str]]
+
+
+@dataclass(frozen=True)
+class SharedBlock:
+    name: str
+    size: int
+
+
+@dataclass(frozen=True)
+class ShardJob:
+    token: str
+    context: SharedBlock
+    home_model: Optional[SharedBlock]
+    away_model: Optional[SharedBlock]
+    fixtures: SharedBlock
+    fixtures_length: int
+    goal_sampling: str
+    seed_entropy: int
+    variance_reduction: str
+    strata: int
+    joint_model: Optional[SharedBlock] = None
+
+
+# ---------- proces serwera ----------
+
+
+class SharedPredictionState:
+    """Bloki shared memory jednego requestu; usuwane (unlink) przy wyjściu z `with`."""
+
+    def __init__(self, engine: PredictionEngine):
+        self._blocks: List[SharedMemory] = []
+        fixtures = engine.init_prediction.fixtures
+        context = (
+            engine.predict_request,
+            engine.init_prediction.topology,
+            engine.models.feature_schema,
+            engine.models.best_iterations,
+            fixtures.team_ids,
+            ids.snapshot(),
+        )
+        arrays = np.concatenate(
+            [getattr(fixtures, name) for name in MatchFixtures.ARRAY_FIELDS]
+        ).astype(np.int64, copy=False)
+        models = engine.models
+
+        self.job = ShardJob(
+            token=uuid.uuid4().hex,
+            context=self._publish(pickle.dumps(context, protocol=pickle.HIGHEST_PROTOCOL)),
+            home_model=self._publish_model(models.home and models.home.get_booster()),
+            away_model=self._publish_model(models.away and models.away.get_booster()),
+            fixtures=self._publish(arrays.tobytes()),
+            fixtures_length=len(fixtures),
+            goal_sampling=engine.goal_sampling,
+            seed_entropy=engine.seed_entropy,
+            variance_reduction=engine.variance_reduction,
+            strata=engine.strata,
+            joint_model=self._publish_model(models.joint),
+        )
+
+    def _publish_model(self, booster: Optional[xgb.Booster]) -> Optional[SharedBlock]:
+        if booster is None:
+            return None
+        return self._publish(bytes(booster.save_raw("ubj")))
+
+    def _publish(self, data: bytes) -> SharedBlock:
+        shm = SharedMemory(create=True, size=max(1, len(data)))
+        self._blocks.append(shm)
+        shm.buf[: len(data)] = data
+        return SharedBlock(name=shm.name, size=len(data))
+
+    def close(self) -> None:
+        for shm in self._blocks:
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._blocks.clear()
+
+    def __enter__(self) -> "SharedPredictionState":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def get_prediction_pool(workers: int) -> ProcessPoolExecutor:
+    """Współdzielona pula procesów (spawn - bezpieczne przy działających wątkach gRPC)."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_prediction_pool() -> None:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+            _pool_workers = 0
+
+
+async def run_sharded(
+    engine: PredictionEngine, iteration_count: int, prediction_config: PredictionConfig
+) -> AsyncIterator[ShardIteration]:
+    """Iteracje 0..iteration_count-1 policzone w puli, oddawane w kolejności indeksów."""
+    pool = get_prediction_pool(prediction_config.workers)
+    chunk_size = prediction_config.shard_chunk_size
+    chunks = iter(
+        (start, min(start + chunk_size, iteration_count))
+        for start in range(0, iteration_count, chunk_size)
+    )
+
+    with SharedPredictionState(engine) as state:
+        pending: Deque[Future] = deque()
+
+        def submit_next() -> None:
+            chunk = next(chunks, None)
+            if chunk is not None:
+                pending.append(pool.submit(run_chunk, state.job, *chunk))
+
+        try:
+            for _ in range(prediction_config.workers * 2):
+                submit_next()
+
+            while pending:
+                # future zostaje w `pending` do odebrania - finally poczeka też na nią
+                shard_chunk: ShardChunk = await asyncio.wrap_future(pending[0])
+                pending.popleft()
+                submit_next()
+                merge_aggregated(logger, "prediction shards", shard_chunk.warnings)
+                for shard_iteration in shard_chunk.iterations:
+                    yield shard_iteration
+        finally:
+            # wcześniejsze wyjście (zbieżność, rozłączenie klienta): paczki z kolejki puli
+            # anulujemy, a na już liczone czekamy - bloki shared memory są usuwane
+            # dopiero po wyjściu z `with`
+            for future in pending:
+                future.cancel()
+            running = [asyncio.wrap_future(f) for f in pending if not f.cancelled()]
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+
+# ---------- proces roboczy ----------
+
+_worker_state: Optional[Tuple[str, PredictionEngine, List[SharedMemory]]] = None
+# bloki, których close() się nie udał (BufferError) - ponawiany przy kolejnym jobie
+_unreleased: List[SharedMemory] = []
+
+
+def _attach(block: SharedBlock) -> SharedMemory:
+    return SharedMemory(name=block.name)
+
+
+def _load_model(shm: SharedMemory, block: SharedBlock) -> xgb.XGBRegressor:
+    model = xgb.XGBRegressor()
+    model.load_model(bytearray(shm.buf[: block.size]))
+    model.set_params(n_jobs=1)  # równoległość daje pula procesów
+    return model
+
+
+def _load_joint(shm: SharedMemory, block: SharedBlock) -> xgb.Booster:
+    booster = xgb.Booster()
+    booster.load_model(bytearray(shm.buf[: block.size]))
+    booster.set_param({"nthread": 1})
+    return booster
+
+
+def _release_worker_state() -> None:
+    global _worker_state
+    if _worker_state is not None:
+        _, _, blocks = _worker_state
+        _worker_state = None  # zwalnia widoki numpy na bufory przed close()
+        _unreleased.extend(blocks)
+    if not _unreleased:
+        return
+    gc.collect()  # widoki w cyklach referencji (silnik, fixtures)
+    still_open = []
+    for shm in _unreleased:
+        try:
+            shm.close()
+        except BufferError:
+            still_open.append(shm)
+    _unreleased[:] = still_open
+    if still_open:
+        logger.warning(
+            "%s shared memory blocks still referenced in prediction worker, "
+            "close retried with the next job",
+            len(still_open),
+        )
+
+
+def _load_engine(job: ShardJob) -> PredictionEngine:
+    global _worker_state
+    if _worker_state is not None and _worker_state[0] == job.token:
+        return _worker_state[1]
+    _release_worker_state()
+
+    context_shm = _attach(job.context)
+    fixtures_shm = _attach(job.fixtures)
+    model_shms: Dict[str, SharedMemory] = {
+        key: _attach(block)
+        for key, block in (
+            ("home", job.home_model),
+            ("away", job.away_model),
+            ("joint", job.joint_model),
+        )
+        if block is not None
+    }
+
+    (
+        predict_request,
+        topology,
+        feature_schema,
+        best_iterations,
+        team_ids,
+        id_snapshot,
+    ) = pickle.loads(context_shm.buf[: job.context.size])
+    ids.restore(id_snapshot)
+
+    n = job.fixtures_length
+    arrays = {}
+    for k, name in enumerate(MatchFixtures.ARRAY_FIELDS):
+        array = np.ndarray((n,), dtype=np.int64, buffer=fixtures_shm.buf, offset=k * n * 8)
+        array.flags.writeable = False
+        arrays[name] = array
+
+    source = tuple(replace(m) for m in predict_request.matches_to_simulate)
+    fixtures = MatchFixtures(
+        **arrays,
+        match_ids=tuple(m.id for m in source),
+        team_ids=team_ids,
+        source=source,
+    )
+    models = TrainedModels(
+        home=_load_model(model_shms["home"], job.home_model) if job.home_model else None,
+        away=_load_model(model_shms["away"], job.away_model) if job.away_model else None,
+        feature_schema=feature_schema,
+        best_iterations=best_iterations,
+        joint=_load_joint(model_shms["joint"], job.joint_model) if job.joint_model else None,
+    )
+    init_prediction = InitPrediction(
+        training_dataset=TrainingDataset(train=[], test=[]),
+        list_simulation_ids=[],
+        topology=topology,
+        fixtures=fixtures,
+    )
+    engine = PredictionEngine(
+        predict_request,
+        init_prediction,
+        models,
+        goal_sampling=job.goal_sampling,
+        seed_entropy=job.seed_entropy,
+        variance_reduction=job.variance_reduction,
+        strata=job.strata,
+    )
+    _worker_state = (job.token, engine, [context_shm, fixtures_shm, *model_shms.values()])
+    return engine
+
+
+def run_chunk(job: ShardJob, start: int, stop: int) -> ShardChunk:
+    """Zadanie puli: iteracje [start, stop) jednego requestu."""
+    engine = _load_engine(job)
+    results: List[ShardIteration] = []
+    with aggregate_warnings(logger, "prediction shard", flush=False) as aggregator:
+        for iteration_index in range(start, stop):
+            started = perf_counter()
+            now = datetime.now()
+            home_goals, away_goals, new_strengths = engine.simulate(
+                iteration_index, now.isoformat()
+            )
+            results.append(
+                ShardIteration(
+                    iteration_index=iteration_index,
+                    start_date=now.strftime("%Y-%m-%d %H:%M:%S"),
+                    execution_seconds=perf_counter() - started,
+                    home_goals=home_goals,
+                    away_goals=away_goals,
+                    new_strengths=new_strengths,
+                )
+            )
+    return ShardChunk(iterations=results, warnings=aggregator.events())
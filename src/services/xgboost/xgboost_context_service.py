@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
 
 import xgboost as xgb
 
-from src.core import get_logger
+from src.core import config as app_config, get_logger
+from src.core.metrics import MODEL_OPERATION_LATENCY, timed
 from src.di.ports.adapters.json_file_repository_port import JsonFileRepositoryPort
+from src.domain.entities import TrainedModels
 from src.domain.features.trainings.training_builder import TrainingBuilder
+from src.services.xgboost.model_registry import ModelRegistry, get_model_registry
 
 
 logger = get_logger(__name__)
@@ -23,20 +26,62 @@ class XgboostArtifacts:
     model_away: Optional[xgb.XGBRegressor]
     feature_schema: Optional[List[str]]
     last_overview_created_date: Optional[str]
+    best_iterations: Dict[str, int] = field(default_factory=dict)
+    # wersja z rejestru (None = brak modeli albo stary płaski układ plików)
+    version: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class XgboostJointArtifacts:
+    """Wspólny model goli (XGB_JOINT_MODEL): jeden Booster z wyjściami (home, away)."""
+
+    model_joint: Optional[xgb.Booster]
+    feature_schema: Optional[List[str]]
+    last_overview_created_date: Optional[str]
+    best_iterations: Dict[str, int] = field(default_factory=dict)
+    version: Optional[int] = None
 
 
 class XgBoostContextService:
     def __init__(self, repo: JsonFileRepositoryPort):
         self.repo = repo
+        # modele zapisujemy jako niezmienne wersje: STORAGE_DIR/models/{league_id}/v{N}/
+        self.registry: ModelRegistry = get_model_registry(
+            repo.get_full_path(""), app_config.xgboost.registry_retention
+        )
 
     # ---------- filenames ----------
+    # directory = katalog wersji z rejestru; None = stary płaski układ (tylko odczyt)
 
-    def _model_filename(self, *, league_id: str, home_or_away: str) -> str:
+    def _model_filename(
+        self, *, league_id: str, home_or_away: str, directory: Optional[str] = None
+    ) -> str:
+        if directory is not None:
+            return f"{directory}/xgboost_{home_or_away}.{MODEL_EXT}"
         return f"xgboost_{home_or_away}_{league_id}.{MODEL_EXT}"
 
-    def _meta_filename(self, *, league_id: str) -> str:
+    def _meta_filename(self, *, league_id: str, directory: Optional[str] = None) -> str:
+        if directory is not None:
+            return f"{directory}/{META_PREFIX}.{META_EXT}"
         return f"{META_PREFIX}_{league_id}.{META_EXT}"
 
+    def _current_directory(self, league_id: str) -> Tuple[Optional[str], Optional[int]]:
+        current = self.registry.current(league_id)
+        if current is None:
+            return None, None
+        return current.relative_dir, current.version
+
+    # ---------- active models (in-memory hot-swap) ----------
+
+    def model_version(self, *, league_id: str) -> Optional[int]:
+        return self.registry.version(league_id)
+
+    def active_models(self, *, league_id: str) -> Optional[TrainedModels]:
+        return self.registry.active(league_id)
+
+    def activate_models(self, *, league_id: str, version: int, models: TrainedModels) -> None:
+        self.registry.activate(league_id, version, models)
+
     # ---------- metadata ----------
 
     def save_metadata(
@@ -45,21 +90,27 @@ class XgBoostContextService:
         league_id: str,
         feature_schema: List[str],
         last_overview_created_date: Optional[str] = None,
+        best_iterations: Optional[Dict[str, int]] = None,
+        directory: Optional[str] = None,
     ) -> None:
         payload: Dict[str, Any] = {
             "league_id": league_id,
             "feature_schema": TrainingBuilder.feature_schema(),
             "last_overview_created_date": last_overview_created_date,
+            "best_iteration": dict(best_iterations or {}),
         }
-        self.repo.save(filename=self._meta_filename(league_id=league_id), data=payload)
-        logger.info(f">> XGBoost metadata saved: {self._meta_filename(league_id=league_id)}")
+        filename = self._meta_filename(league_id=league_id, directory=directory)
+        self.repo.save(filename=filename, data=payload)
+        logger.info(">> XGBoost metadata saved: %s", filename)
 
-    def load_metadata(self, *, league_id: str) -> Optional[Dict[str, Any]]:
-        meta = self.repo.load(self._meta_filename(league_id=league_id))
+    def load_metadata(
+        self, *, league_id: str, directory: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        meta = self.repo.load(self._meta_filename(league_id=league_id, directory=directory))
         if meta is None:
             return None
         if not isinstance(meta, dict):
-            logger.warning(f">> Invalid metadata type: {type(meta)}")
+            logger.warning(">> Invalid metadata type: %s", type(meta))
             return None
         return meta
 
@@ -71,32 +122,39 @@ class XgBoostContextService:
         model: xgb.XGBRegressor,
         home_or_away: str,
         league_id: str,
+        directory: Optional[str] = None,
     ) -> None:
-        filename = self._model_filename(league_id=league_id, home_or_away=home_or_away)
+        filename = self._model_filename(
+            league_id=league_id, home_or_away=home_or_away, directory=directory
+        )
         full_path = self.repo.get_full_path(filename)
         model.save_model(str(full_path))
-        logger.info(f">> XGBoost model ({home_or_away}) saved: {full_path}")
+        logger.info(">> XGBoost model (%s) saved: %s", home_or_away, full_path)
 
     def load_league_model(
         self,
         *,
         home_or_away: str,
         league_id: str,
+        directory: Optional[str] = None,
     ) -> Optional[xgb.XGBRegressor]:
-        filename = self._model_filename(league_id=league_id, home_or_away=home_or_away)
+        filename = self._model_filename(
+            league_id=league_id, home_or_away=home_or_away, directory=directory
+        )
         full_path = self.repo.get_full_path(filename)
 
         if not full_path.exists():
-            logger.info(f">> XGBoost model ({home_or_away}) not found: {full_path}")
+            logger.info(">> XGBoost model (%s) not found: %s", home_or_away, full_path)
             return None
 
         model = xgb.XGBRegressor()
         model.load_model(str(full_path))
-        logger.info(f">> XGBoost model ({home_or_away}) loaded: {full_path}")
+        logger.info(">> XGBoost model (%s) loaded: %s", home_or_away, full_path)
         return model
 
     # ---------- save/load both models + metadata ----------
 
+    @timed(MODEL_OPERATION_LATENCY, operation="save")
     def save_league_models(
         self,
         *,
@@ -105,21 +163,113 @@ class XgBoostContextService:
         model_away: xgb.XGBRegressor,
         feature_schema: List[str],
         last_overview_created_date: Optional[str] = None,
-    ) -> None:
-        self.save_league_model(model=model_home, home_or_away="home", league_id=league_id)
-        self.save_league_model(model=model_away, home_or_away="away", league_id=league_id)
+        best_iterations: Optional[Dict[str, int]] = None,
+    ) -> int:
+        """Zapis modeli + metadanych jako nowa wersja w rejestrze; zwraca numer wersji."""
+        with self.registry.new_version(league_id) as staged:
+            for home_or_away, model in (("home", model_home), ("away", model_away)):
+                self.save_league_model(
+                    model=model,
+                    home_or_away=home_or_away,
+                    league_id=league_id,
+                    directory=staged.relative_dir,
+                )
+
+            self.save_metadata(
+                league_id=league_id,
+                feature_schema=feature_schema,
+                last_overview_created_date=last_overview_created_date,
+                best_iterations=best_iterations,
+                directory=staged.relative_dir,
+            )
+        return staged.version
+
+    @timed(MODEL_OPERATION_LATENCY, operation="load")
+    def load_league_models(self, *, league_id: str) -> XgboostArtifacts:
+        directory, version = self._current_directory(league_id)
+        model_home = self.load_league_model(
+            home_or_away="home", league_id=league_id, directory=directory
+        )
+        model_away = self.load_league_model(
+            home_or_away="away", league_id=league_id, directory=directory
+        )
+
+        meta = self.load_metadata(league_id=league_id, directory=directory) or {}
+        schema, last_overview_created_date, best_iterations = self._parse_metadata(
+            meta, ("home", "away")
+        )
 
-        self.save_metadata(
-            league_id=league_id,
-            feature_schema=feature_schema,
+        return XgboostArtifacts(
+            model_home=model_home,
+            model_away=model_away,
+            feature_schema=schema,
             last_overview_created_date=last_overview_created_date,
+            best_iterations=best_iterations,
+            version=version if model_home is not None else None,
         )
 
-    def load_league_models(self, *, league_id: str) -> XgboostArtifacts:
-        model_home = self.load_league_model(home_or_away="home", league_id=league_id)
-        model_away = self.load_league_model(home_or_away="away", league_id=league_id)
+    # ---------- save/load joint model + metadata ----------
+
+    @timed(MODEL_OPERATION_LATENCY, operation="save")
+    def save_league_joint_model(
+        self,
+        *,
+        league_id: str,
+        model_joint: xgb.Booster,
+        feature_schema: List[str],
+        last_overview_created_date: Optional[str] = None,
+        best_iterations: Optional[Dict[str, int]] = None,
+    ) -> int:
+        with self.registry.new_version(league_id) as staged:
+            filename = self._model_filename(
+                league_id=league_id, home_or_away="joint", directory=staged.relative_dir
+            )
+            full_path = self.repo.get_full_path(filename)
+            model_joint.save_model(str(full_path))
+            logger.info(">> XGBoost model (joint) saved: %s", full_path)
+
+            self.save_metadata(
+                league_id=league_id,
+                feature_schema=feature_schema,
+                last_overview_created_date=last_overview_created_date,
+                best_iterations=best_iterations,
+                directory=staged.relative_dir,
+            )
+        return staged.version
+
+    @timed(MODEL_OPERATION_LATENCY, operation="load")
+    def load_league_joint_model(self, *, league_id: str) -> XgboostJointArtifacts:
+        directory, version = self._current_directory(league_id)
+        filename = self._model_filename(
+            league_id=league_id, home_or_away="joint", directory=directory
+        )
+        full_path = self.repo.get_full_path(filename)
+
+        model_joint: Optional[xgb.Booster] = None
+        if full_path.exists():
+            model_joint = xgb.Booster()
+            model_joint.load_model(str(full_path))
+            logger.info(">> XGBoost model (joint) loaded: %s", full_path)
+        else:
+            logger.info(">> XGBoost model (joint) not found: %s", full_path)
 
-        meta = self.load_metadata(league_id=league_id) or {}
+        meta = self.load_metadata(league_id=league_id, directory=directory) or {}
+        schema, last_overview_created_date, best_iterations = self._parse_metadata(
+            meta, ("joint",)
+        )
+
+        return XgboostJointArtifacts(
+            model_joint=model_joint,
+            feature_schema=schema,
+            last_overview_created_date=last_overview_created_date,
+            best_iterations=best_iterations,
+            version=version if model_joint is not None else None,
+        )
+
+    @staticmethod
+    def _parse_metadata(
+        meta: Dict[str, Any], best_iteration_keys: Tuple[str, ...]
+    ) -> Tuple[Optional[List[str]], Optional[str], Dict[str, int]]:
         raw_schema = meta.get("feature_schema")
 
         schema: Optional[List[str]] = None
@@ -130,9 +280,12 @@ class XgBoostContextService:
         if not isinstance(last_overview_created_date, str):
             last_overview_created_date = None
 
-        return XgboostArtifacts(
-            model_home=model_home,
-            model_away=model_away,
-            feature_schema=schema,
-            last_overview_created_date=last_overview_created_date,
-        )
+        raw_best = meta.get("best_iteration")
+        best_iterations: Dict[str, int] = {}
+        if isinstance(raw_best, dict):
+            best_iterations = {
+                k: v
+                for k, v in raw_best.items()
+                if k in best_iteration_keys and isinstance(v, int)
+            }
+        return schema, last_overview_created_date, best_iterations
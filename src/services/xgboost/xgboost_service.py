@@ -1,30 +1,39 @@
 from __future__ import annotations
 
-from typing import Optional, Tuple
+import asyncio
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from time import perf_counter
 from datetime import datetime, timedelta
 import uuid
+import numpy as np
 import xgboost as xgb
 
+from src.core import config as app_config
 from src.core.logger import get_logger
+from src.core.metrics import MODEL_OPERATION_LATENCY, PREDICT_ITERATION_LATENCY
 from src.domain.entities import (
-    InitPrediction,
+    AnalyticMatchOutcome,
+    AnalyticPrediction,
     IterationResult,
-    MatchRound,
     PredictRequest,
     StrengthItem,
-    TeamStrength,
     TrainedModels,
     TrainingDataset,
 )
 from src.domain.features.mapper import Mapper
+from src.domain.features.predictions.poisson_outcomes import (
+    outcome_probabilities,
+    score_matrices,
+)
 from src.di.ports.xgboost.xgboost_context_service_port import XgboostContextServicePort
-from src.domain.features.trainings.training_builder import TrainingBuilder
+from src.services.xgboost.joint_goal_model import train_joint_booster
+from src.services.xgboost.prediction_engine import PredictionEngine
+from src.services.xgboost.prediction_pool import run_sharded
 
 logger = get_logger(__name__)
 
 BASE_PARAMS = {
-    "n_estimators": 100,
     "max_depth": 3,
     "learning_rate": 0.1,
     "objective": "count:poisson",
@@ -37,8 +46,14 @@ class XgboostService:
         self._context = context
 
     def _create_model(self, seed: Optional[int]) -> xgb.XGBRegressor:
-        params = dict(BASE_PARAMS)
-        logger.info(f" \n CREATED [XGBOOST MODEL] FOR SEED {seed} \n")
+        params = dict(
+            BASE_PARAMS,
+            n_estimators=app_config.xgboost.n_estimators,
+            max_bin=app_config.xgboost.max_bin,
+        )
+        if app_config.xgboost.tree_method:
+            params["tree_method"] = app_config.xgboost.tree_method
+        logger.debug("Created XGBoost model for seed=%s", seed)
         if seed is not None:
             params["random_state"] = seed
         return xgb.XGBRegressor(**params)
@@ -46,6 +61,15 @@ class XgboostService:
     async def train_evaluate_and_save(
         self, predictRequest: PredictRequest, t_dataset: TrainingDataset
     ) -> TrainedModels:
+        # fit poza pętlą zdarzeń - inne requesty (i BatchedFlight) działają w trakcie treningu
+        return await asyncio.to_thread(self.train_and_save, predictRequest, t_dataset)
+
+    def train_and_save(
+        self, predictRequest: PredictRequest, t_dataset: TrainingDataset
+    ) -> TrainedModels:
+        """Synchroniczny trening + zapis (TrainingScheduler woła go w osobnym wątku)."""
+        if app_config.xgboost.joint_model:
+            return self._train_and_save_joint(predictRequest, t_dataset)
 
         # 0) Load artifacts (modele + schema)
         artifacts = self._context.load_league_models(league_id=predictRequest.league_id)
@@ -57,7 +81,131 @@ class XgboostService:
             artifacts.feature_schema if artifacts and artifacts.feature_schema else None
         )
 
-        # 2) X/y + schema
+        # 2-4) X/y + schema, modele (cold start jeśli brak) i fit home/away
+        #      (early stopping na czasowym zbiorze testowym)
+        if app_config.xgboost.quantile_dmatrix:
+            model_home, model_away, schema, best_iterations = self._train_quantile(
+                t_dataset, schema, predictRequest.seed
+            )
+        else:
+            model_home, model_away, schema, best_iterations = self._train_dataframe(
+                t_dataset, schema, predictRequest.seed, artifacts
+            )
+
+        if best_iterations:
+            logger.info(
+                "Early stopping league_id=%s: best_iteration=%s (n_estimators=%s)",
+                predictRequest.league_id,
+                best_iterations,
+                app_config.xgboost.n_estimators,
+            )
+
+        # 5) Save (modele + schema + best_iteration + opcjonalnie last_overview_created_date)
+        #    jako nowa wersja w rejestrze i podmiana aktywnych modeli w pamięci
+        version = self._context.save_league_models(
+            league_id=predictRequest.league_id,
+            model_home=model_home,
+            model_away=model_away,
+            feature_schema=schema,
+            last_overview_created_date=None,  # w MVP możesz dać None, później ustawisz z SimulationOverview
+            best_iterations=best_iterations,
+        )
+
+        models = TrainedModels(
+            home=model_home,
+            away=model_away,
+            feature_schema=schema,
+            best_iterations=best_iterations,
+        )
+        self._context.activate_models(
+            league_id=predictRequest.league_id, version=version, models=models
+        )
+        return models
+
+    def _train_and_save_joint(
+        self, predictRequest: PredictRequest, t_dataset: TrainingDataset
+    ) -> TrainedModels:
+        """XGB_JOINT_MODEL: jeden booster (home, away) - jeden fit i jeden predict na mecz."""
+        artifacts = self._context.load_league_joint_model(league_id=predictRequest.league_id)
+        schema = (
+            artifacts.feature_schema if artifacts and artifacts.feature_schema else None
+        )
+
+        booster, schema, best_iterations = self._train_joint(
+            t_dataset, schema, predictRequest.seed
+        )
+        if best_iterations:
+            logger.info(
+                "Early stopping league_id=%s: best_iteration=%s (n_estimators=%s)",
+                predictRequest.league_id,
+                best_iterations,
+                app_config.xgboost.n_estimators,
+            )
+
+        version = self._context.save_league_joint_model(
+            league_id=predictRequest.league_id,
+            model_joint=booster,
+            feature_schema=schema,
+            last_overview_created_date=None,
+            best_iterations=best_iterations,
+        )
+
+        models = TrainedModels(
+            home=None,
+            away=None,
+            feature_schema=schema,
+            best_iterations=best_iterations,
+            joint=booster,
+        )
+        self._context.activate_models(
+            league_id=predictRequest.league_id, version=version, models=models
+        )
+        return models
+
+    def _train_joint(
+        self,
+        t_dataset: TrainingDataset,
+        schema: Optional[List[str]],
+        seed: Optional[int],
+    ) -> Tuple[xgb.Booster, List[str], Dict[str, int]]:
+        schema = schema or Mapper.extract_feature_schema(t_dataset.train)
+        X_train, y_train_home, y_train_away = Mapper.map_to_feature_array(
+            t_dataset.train, schema
+        )
+        X_test, y_test_home, y_test_away = Mapper.map_to_feature_array(
+            t_dataset.test, schema
+        )
+
+        cfg = app_config.xgboost
+        params = dict(
+            self._create_model(seed).get_xgb_params(), multi_strategy=cfg.multi_strategy
+        )
+        early_stopping = len(X_test) > 0 and cfg.early_stopping_rounds > 0
+        with MODEL_OPERATION_LATENCY.time(operation="train"):
+            booster = train_joint_booster(
+                params,
+                X_train,
+                np.stack((y_train_home, y_train_away), axis=1),
+                X_test,
+                np.stack((y_test_home, y_test_away), axis=1),
+                schema,
+                w_train=Mapper.map_to_sample_weight(t_dataset.train),
+                w_test=Mapper.map_to_sample_weight(t_dataset.test),
+                num_boost_round=cfg.n_estimators,
+                max_bin=cfg.max_bin,
+                early_stopping_rounds=cfg.early_stopping_rounds if early_stopping else None,
+            )
+        best_iterations = {"joint": int(booster.best_iteration)} if early_stopping else {}
+        return booster, schema, best_iterations
+
+    def _train_dataframe(
+        self,
+        t_dataset: TrainingDataset,
+        schema: Optional[List[str]],
+        seed: Optional[int],
+        artifacts,
+    ) -> Tuple[xgb.XGBRegressor, xgb.XGBRegressor, List[str], Dict[str, int]]:
+        """Dwa XGBRegressor.fit na DataFrame (każdy fit buduje własną macierz XGBoost)."""
         X_train, y_train_home, y_train_away, schema = Mapper.map_to_xy_matrix(
             dataset=t_dataset.train,
             feature_schema=schema,  # None przy cold start, albo wczytana schema
@@ -66,68 +214,214 @@ class XgboostService:
             dataset=t_dataset.test,
             feature_schema=schema,  # zawsze ta sama schema
         )
+        w_train = Mapper.map_to_sample_weight(t_dataset.train)
+        w_test = Mapper.map_to_sample_weight(t_dataset.test)
 
-        # 3) modele: cold start jeśli brak
         model_home = (
             artifacts.model_home
             if artifacts and artifacts.model_home
-            else self._create_model(predictRequest.seed)
+            else self._create_model(seed)
         )
         model_away = (
             artifacts.model_away
             if artifacts and artifacts.model_away
-            else self._create_model(predictRequest.seed)
+            else self._create_model(seed)
         )
 
-        # 4) Fit home/away
-        eval_home = [(X_test, y_test_home)] if len(X_test) > 0 else None
-        model_home.fit(X_train, y_train_home, eval_set=eval_home, verbose=False)
+        best_iterations: Dict[str, int] = {}
+        with MODEL_OPERATION_LATENCY.time(operation="train"):
+            for home_or_away, model, y_train, y_test in (
+                ("home", model_home, y_train_home, y_test_home),
+                ("away", model_away, y_train_away, y_test_away),
+            ):
+                best_iteration = self._fit(
+                    model, X_train, y_train, X_test, y_test, w_train, w_test
+                )
+                if best_iteration is not None:
+                    best_iterations[home_or_away] = best_iteration
+        return model_home, model_away, schema, best_iterations
 
-        eval_away = [(X_test, y_test_away)] if len(X_test) > 0 else None
-        model_away.fit(X_train, y_train_away, eval_set=eval_away, verbose=False)
+    def _train_quantile(
+        self,
+        t_dataset: TrainingDataset,
+        schema: Optional[List[str]],
+        seed: Optional[int],
+    ) -> Tuple[xgb.XGBRegressor, xgb.XGBRegressor, List[str], Dict[str, int]]:
+        """
+        Jedna QuantileDMatrix (float32, tree_method=hist) dla obu modeli: cechy są
+        kwantyzowane raz, a między fitami home/away podmieniamy tylko etykiety.
+        """
+        schema = schema or Mapper.extract_feature_schema(t_dataset.train)
+        X_train, y_train_home, y_train_away = Mapper.map_to_feature_array(
+            t_dataset.train, schema
+        )
+        X_test, y_test_home, y_test_away = Mapper.map_to_feature_array(
+            t_dataset.test, schema
+        )
 
-        # 5) Save (modele + schema + opcjonalnie last_overview_created_date)
-        self._context.save_league_models(
-            league_id=predictRequest.league_id,
-            model_home=model_home,
-            model_away=model_away,
-            feature_schema=schema,
-            last_overview_created_date=None,  # w MVP możesz dać None, później ustawisz z SimulationOverview
+        cfg = app_config.xgboost
+        rounds = cfg.early_stopping_rounds
+        with MODEL_OPERATION_LATENCY.time(operation="quantize"):
+            d_train = xgb.QuantileDMatrix(
+                X_train,
+                label=y_train_home,
+                weight=Mapper.map_to_sample_weight(t_dataset.train),
+                feature_names=schema,
+                max_bin=cfg.max_bin,
+            )
+            d_test = (
+                xgb.QuantileDMatrix(
+                    X_test,
+                    label=y_test_home,
+                    weight=Mapper.map_to_sample_weight(t_dataset.test),
+                    feature_names=schema,
+                    max_bin=cfg.max_bin,
+                    ref=d_train,
+                )
+                if len(X_test) > 0
+                else None
+            )
+        early_stopping = d_test is not None and rounds > 0
+        params = self._create_model(seed).get_xgb_params()
+
+        models: Dict[str, xgb.XGBRegressor] = {}
+        best_iterations: Dict[str, int] = {}
+        with MODEL_OPERATION_LATENCY.time(operation="train"):
+            for home_or_away, y_train, y_test in (
+                ("home", y_train_home, y_test_home),
+                ("away", y_train_away, y_test_away),
+            ):
+                d_train.set_label(y_train)
+                if d_test is not None:
+                    d_test.set_label(y_test)
+                booster = xgb.train(
+                    params,
+                    d_train,
+                    num_boost_round=cfg.n_estimators,
+                    evals=[(d_test, "validation_0")] if d_test is not None else (),
+                    early_stopping_rounds=rounds if early_stopping else None,
+                    verbose_eval=False,
+                )
+                if early_stopping:
+                    best_iterations[home_or_away] = int(booster.best_iteration)
+
+                # ten sam format co zapis/odczyt modeli - dalej pracujemy na XGBRegressor
+                model = self._create_model(seed)
+                model.load_model(bytearray(booster.save_raw("ubj")))
+                models[home_or_away] = model
+        return models["home"], models["away"], schema, best_iterations
+
+    @staticmethod
+    def _fit(
+        model: xgb.XGBRegressor, X_train, y_train, X_test, y_test, w_train, w_test
+    ) -> Optional[int]:
+        """
+        Fit z early stopping, gdy jest zbiór testowy; zwraca best_iteration (albo None).
+        Wagi = TrainingData.weight (wiersze zwinięte przez TrainingCompactor).
+        """
+        eval_set = [(X_test, y_test)] if len(X_test) > 0 else None
+        rounds = app_config.xgboost.early_stopping_rounds
+        early_stopping = eval_set is not None and rounds > 0
+
+        # wczytany model trenujemy od zera - limit drzew i early stopping z bieżącej konfiguracji
+        model.set_params(
+            n_estimators=app_config.xgboost.n_estimators,
+            early_stopping_rounds=rounds if early_stopping else None,
+        )
+        model.fit(
+            X_train,
+            y_train,
+            sample_weight=w_train,
+            eval_set=eval_set,
+            sample_weight_eval_set=[w_test] if eval_set is not None else None,
+            verbose=False,
         )
+        return int(model.best_iteration) if early_stopping else None
 
-        return TrainedModels(home=model_home, away=model_away, feature_schema=schema)
+    def model_version(self, league_id: str) -> Optional[int]:
+        """Aktywna wersja modeli ligi w rejestrze (None = brak / stary układ plików)."""
+        return self._context.model_version(league_id=league_id)
 
     async def get_evaluated_models(
         self, predictRequest: PredictRequest
     ) -> TrainedModels:
+        trained = await self.get_trained_models(predictRequest)
+        if trained is not None:
+            return trained
 
+        # cold start: brakujące modele są tworzone bez fitu (jak dotąd)
         artifacts = self._context.load_league_models(league_id=predictRequest.league_id)
-
-        schema = (
-            artifacts.feature_schema if artifacts and artifacts.feature_schema else None
+        return TrainedModels(
+            home=(
+                artifacts.model_home
+                if artifacts and artifacts.model_home
+                else self._create_model(predictRequest.seed)
+            ),
+            away=(
+                artifacts.model_away
+                if artifacts and artifacts.model_away
+                else self._create_model(predictRequest.seed)
+            ),
+            feature_schema=(
+                artifacts.feature_schema if artifacts and artifacts.feature_schema else None
+            ),
+            best_iterations=artifacts.best_iterations if artifacts else {},
         )
 
-        model_home = (
-            artifacts.model_home
-            if artifacts and artifacts.model_home
-            else self._create_model(predictRequest.seed)
-        )
-        model_away = (
-            artifacts.model_away
-            if artifacts and artifacts.model_away
-            else self._create_model(predictRequest.seed)
-        )
+    async def get_trained_models(
+        self, predictRequest: PredictRequest
+    ) -> Optional[TrainedModels]:
+        """Wytrenowane modele ligi (aktywne albo z dysku) albo None, gdy liga ich nie ma."""
+        # aktywna wersja z pamięci - bez odczytu z dysku, dopóki CURRENT się nie zmieni
+        active = self._context.active_models(league_id=predictRequest.league_id)
+        if active is not None:
+            return active
+
+        if app_config.xgboost.joint_model:
+            joint = self._context.load_league_joint_model(league_id=predictRequest.league_id)
+            if joint.model_joint is not None:
+                models = TrainedModels(
+                    home=None,
+                    away=None,
+                    feature_schema=joint.feature_schema,
+                    best_iterations=joint.best_iterations,
+                    joint=joint.model_joint,
+                )
+                if joint.version is not None:
+                    self._context.activate_models(
+                        league_id=predictRequest.league_id,
+                        version=joint.version,
+                        models=models,
+                    )
+                return models
+            logger.warning(
+                "No joint model for league_id=%s, falling back to home/away models",
+                predictRequest.league_id,
+            )
 
-        return TrainedModels(home=model_home, away=model_away, feature_schema=schema)
+        artifacts = self._context.load_league_models(league_id=predictRequest.league_id)
+        if not (artifacts and artifacts.model_home and artifacts.model_away):
+            return None
+
+        models = TrainedModels(
+            home=artifacts.model_home,
+            away=artifacts.model_away,
+            feature_schema=artifacts.feature_schema or None,
+            best_iterations=artifacts.best_iterations,
+        )
+        # cache tylko dla wersji z rejestru (nie stary układ plików)
+        if artifacts.version is not None:
+            self._context.activate_models(
+                league_id=predictRequest.league_id, version=artifacts.version, models=models
+            )
+        return models
 
     async def predict_results(
-        self,
-        predictRequest: PredictRequest,
-        init_prediction: InitPrediction,
-        iteration_index: int,
-        models: TrainedModels,
+        self, engine: PredictionEngine, iteration_index: int
     ) -> IterationResult:
         start_execution_time = perf_counter()
+        predictRequest = engine.predict_request
+        init_prediction = engine.init_prediction
 
         iteration_result = IterationResult(
             id=uuid.uuid4(),
@@ -137,129 +431,136 @@ class XgboostService:
             execution_time="",
             team_strengths=[],
             simulated_match_rounds=None,
+            fixtures=init_prediction.fixtures,
         )
-        iteration_result.simulated_match_rounds = []
-        strength_map = TeamStrength.strength_map_from_dict(
-            predictRequest.team_strengths
+        # jeden timestamp na iterację (zamiast datetime.now() per mecz/drużyna)
+        last_update = datetime.now().isoformat()
+
+        home_goals, away_goals, team_strengths = engine.run_iteration(
+            iteration_index, last_update
         )
-        for match_round in predictRequest.matches_to_simulate:
-            prev_round_id = init_prediction.prev_round_id_by_round_id.get(
-                match_round.round_id, str(uuid.UUID(int=0))
-            )
-            home_strength = TrainingBuilder.get_strength_or_fallback(
-                strength_map,
-                init_prediction.round_no_by_round_id,
-                init_prediction.round_id_by_round_no,
-                match_round,
-                True,
-                prev_round_id,
-                league_id=predictRequest.league_id,
-                league_avg_strength=getattr(predictRequest, "league_avg_strength", 1.7),
-            )
-            away_strength = TrainingBuilder.get_strength_or_fallback(
-                strength_map,
-                init_prediction.round_no_by_round_id,
-                init_prediction.round_id_by_round_no,
-                match_round,
-                False,
-                prev_round_id,
-                league_id=predictRequest.league_id,
-                league_avg_strength=getattr(predictRequest, "league_avg_strength", 1.7),
-            )
-            predicted_match_round, (predicted_home_ts, predicted_away_ts) = (
-                await self.predict_single_result(
-                    match_round,
-                    home_strength,
-                    away_strength,
-                    prev_round_id,
-                    predictRequest,
-                    models,
-                )
-            )
-            iteration_result.simulated_match_rounds.append(predicted_match_round)
 
-            strength_map = TeamStrength.add_to_strength_map(
-                strength_map, predicted_home_ts
-            )
-            strength_map = TeamStrength.add_to_strength_map(
-                strength_map, predicted_away_ts
-            )
+        iteration_result.home_goals = home_goals
+        iteration_result.away_goals = away_goals
+        iteration_result.team_strengths = team_strengths
 
         end_execution_time = perf_counter()
         iteration_result.execution_time = str(
             timedelta(seconds=end_execution_time - start_execution_time)
         )
-
-        iteration_result.team_strengths = TeamStrength.strength_map_to_list(
-            strength_map
-        )
         return iteration_result
 
-    async def predict_single_result(
-        self,
-        match_round: MatchRound,
-        home_strength: Optional[TeamStrength],
-        away_strength: Optional[TeamStrength],
-        prev_round_id: str,
-        predictRequest: PredictRequest,
-        models: TrainedModels,
-    ) -> Tuple[MatchRound, Tuple[TeamStrength, TeamStrength]]:
+    async def predict_results_sharded(
+        self, engine: PredictionEngine
+    ) -> AsyncIterator[IterationResult]:
         """
-        Predykuje wynik pojedynczego MatchRound i zwraca wypełniony obiekt + nowe TeamStrength.
-
-        Args:
-            match_round: Pusty MatchRound (is_played=False).
-            models: Wytrenowane modele + schema.
-            prev_round_id: Snapshot TeamStrength PRZED tym meczem.
-            league_avg_strength: Fallback TeamStrength (jeśli brak danych o drużynie).
-
-        Returns:
-            (wypełniony MatchRound, (home_strength_updated, away_strength_updated))
+        Wszystkie iteracje requestu policzone w puli procesów (config.prediction.workers),
+        oddawane w kolejności iteration_index.
         """
-
-        x_row = TrainingBuilder.build_single_training_data(
-            match_round=match_round,
-            home_strength=home_strength,
-            away_strength=away_strength,
-            prev_round_id=prev_round_id,
+        predictRequest = engine.predict_request
+        init_prediction = engine.init_prediction
+        logger.info(
+            "Sharded prediction: %s iterations on %s workers (goal_sampling=%s)",
+            predictRequest.iteration_count,
+            app_config.prediction.workers,
+            engine.goal_sampling,
         )
+        # aclosing: przy wcześniejszym wyjściu run_sharded od razu czeka na workery
+        # i zwalnia shared memory (a nie dopiero przy GC generatora)
+        async with aclosing(
+            run_sharded(engine, predictRequest.iteration_count, app_config.prediction)
+        ) as shard_iterations:
+            async for shard_iteration in shard_iterations:
+                # czas liczenia iteracji w workerze (czas oczekiwania na paczkę pomijamy)
+                PREDICT_ITERATION_LATENCY.observe(shard_iteration.execution_seconds)
+                yield IterationResult(
+                    id=uuid.uuid4(),
+                    simulation_id=predictRequest.simulation_id,
+                    iteration_index=shard_iteration.iteration_index,
+                    start_date=shard_iteration.start_date,
+                    execution_time=str(
+                        timedelta(seconds=shard_iteration.execution_seconds)
+                    ),
+                    team_strengths=engine.team_strengths(shard_iteration.new_strengths),
+                    simulated_match_rounds=None,
+                    fixtures=init_prediction.fixtures,
+                    home_goals=shard_iteration.home_goals,
+                    away_goals=shard_iteration.away_goals,
+                )
 
-        x_predict = Mapper.map_to_x_matrix([x_row], models.feature_schema)
-
-        pred_home_goals = float(models.home.predict(x_predict)[0])
-        pred_away_goals = float(models.away.predict(x_predict)[0])
-
-        #   Post-process (clamp + round)
-        MAX_GOALS = 15
-        pred_home_goals = max(0.0, min(float(MAX_GOALS), pred_home_goals))
-        pred_away_goals = max(0.0, min(float(MAX_GOALS), pred_away_goals))
-
-        home_goals = int(round(pred_home_goals))
-        away_goals = int(round(pred_away_goals))
-
-        match_round.home_goals = home_goals
-        match_round.away_goals = away_goals
-        match_round.is_draw = home_goals == away_goals
-        match_round.is_played = True
+    async def iterate_goals(
+        self, engine: PredictionEngine
+    ) -> AsyncIterator[Tuple[int, np.ndarray, np.ndarray]]:
+        """
+        Same gole iteracji: (iteration_index, home_goals, away_goals) w kolejności
+        fixtures - bez IterationResult i listy TeamStrength (tryb podsumowań).
+        """
+        predictRequest = engine.predict_request
+
+        if app_config.prediction.use_shards(predictRequest.iteration_count):
+            async with aclosing(
+                run_sharded(engine, predictRequest.iteration_count, app_config.prediction)
+            ) as shard_iterations:
+                async for shard_iteration in shard_iterations:
+                    PREDICT_ITERATION_LATENCY.observe(shard_iteration.execution_seconds)
+                    yield (
+                        shard_iteration.iteration_index,
+                        shard_iteration.home_goals,
+                        shard_iteration.away_goals,
+                    )
+            return
+
+        for iteration_index in range(predictRequest.iteration_count):
+            with PREDICT_ITERATION_LATENCY.time():
+                home_goals, away_goals, _ = engine.simulate(
+                    iteration_index, datetime.now().isoformat()
+                )
+            yield iteration_index, home_goals, away_goals
+            await asyncio.sleep(0)  # nie blokujemy pętli zdarzeń na całym requeście
 
-        now = datetime.now().isoformat()
+    async def predict_outcome_probabilities(
+        self, engine: PredictionEngine
+    ) -> AnalyticPrediction:
+        """
+        Dokładne P(wygrana/remis/porażka) i P(wynik) z macierzy Poissona (bez Monte Carlo)
+        dla meczów niezależnych od wcześniej symulowanych wyników; pozostałe mecze
+        są zwracane w `dependent_match_ids`. Wynik odpowiada strumieniowi Monte Carlo
+        tylko przy goal_sampling="poisson" (zob. AnalyticPrediction).
+        """
+        predictRequest = engine.predict_request
+        fixtures = engine.init_prediction.fixtures
+        independent = engine.independent_fixtures()
 
-        base_home = home_strength.with_round_meta(match_round.round_id, now)
-        team_strength_home = (
-            base_home.with_incremented_stats(match_round, is_home_team=True)
-            .with_likelihood()
-            .with_posterior(
-                predictRequest.games_to_reach_trust, predictRequest.league_avg_strength
+        with MODEL_OPERATION_LATENCY.time(operation="predict_analytic"):
+            home_lambdas, away_lambdas = engine.fixture_lambdas(
+                independent, datetime.now().isoformat()
             )
-        )
-
-        base_away = away_strength.with_round_meta(match_round.round_id, now)
-        team_strength_away = (
-            base_away.with_incremented_stats(match_round, is_home_team=False)
-            .with_likelihood()
-            .with_posterior(
-                predictRequest.games_to_reach_trust, predictRequest.league_avg_strength
+            matrices = score_matrices(home_lambdas, away_lambdas)
+            home_win, draw, away_win = outcome_probabilities(matrices)
+
+        matches = [
+            AnalyticMatchOutcome(
+                match_id=fixtures.match_ids[i],
+                round_id=int(fixtures.round_ids[i]),
+                home_team_id=int(fixtures.home_team_ids[i]),
+                away_team_id=int(fixtures.away_team_ids[i]),
+                home_lambda=float(home_lambdas[k]),
+                away_lambda=float(away_lambdas[k]),
+                home_win=float(home_win[k]),
+                draw=float(draw[k]),
+                away_win=float(away_win[k]),
+                score_probabilities=matrices[k].tolist(),
             )
+            for k, i in enumerate(independent)
+        ]
+        independent_set = set(independent)
+        return AnalyticPrediction(
+            simulation_id=predictRequest.simulation_id,
+            matches=matches,
+            dependent_match_ids=[
+                match_id
+                for i, match_id in enumerate(fixtures.match_ids)
+                if i not in independent_set
+            ],
+            goal_sampling=engine.goal_sampling,
         )
-
-        return match_round, (team_strength_home, team_strength_away)
@@ -0,0 +1,84 @@
+import asyncio
+from contextlib import aclosing
+
+from src.adapters.grpc.client.paging import PrefetchingPager
+from src.core.config import PagingConfig
+from src.domain.entities import PagedResponse
+
+
+class FakeUpstream:
+    def __init__(self, total: int, report_total: bool = True, fail_at=None):
+        self.total = total
+        self.report_total = report_total
+        self.fail_at = fail_at
+        self.requests = []
+        self.running = 0
+        self.max_running = 0
+
+    async def fetch(self, offset, limit):
+        self.requests.append((offset, limit))
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        # późniejsze strony odpowiadają szybciej - kolejność musi zostać zachowana
+        await asyncio.sleep(0.02 if offset == 0 else 0.01 / (1 + offset))
+        self.running -= 1
+        if offset == self.fail_at:
+            return None
+        items = list(range(offset, min(offset + limit, self.total)))
+        return PagedResponse(items, self.total if self.report_total else 0, "", "")
+
+
+def collect(upstream: FakeUpstream, paging: PagingConfig):
+    async def scenario():
+        pager = PrefetchingPager(upstream.fetch, paging)
+        items = []
+        async with aclosing(pager.pages()) as pages:
+            async for page in pages:
+                items.extend(page)
+        return pager, items
+
+    return asyncio.run(scenario())
+
+
+class TestPrefetchingPager:
+    def test_prefetches_known_total_in_order(self):
+        upstream = FakeUpstream(total=95)
+        paging = PagingConfig(page_size=10, prefetch_pages=3, target_page_seconds=0)
+
+        pager, items = collect(upstream, paging)
+
+        assert items == list(range(95))
+        assert pager.complete and pager.total_count == 95
+        assert upstream.max_running == 3
+        # ostatnia strona przycięta do total_count, bez zapytań za koniec
+        assert upstream.requests[-1] == (90, 5)
+
+    def test_unknown_total_reads_page_by_page_until_short_page(self):
+        upstream = FakeUpstream(total=25, report_total=False)
+        paging = PagingConfig(page_size=10, prefetch_pages=4, target_page_seconds=0)
+
+        pager, items = collect(upstream, paging)
+
+        assert items == list(range(25))
+        assert pager.complete
+        assert upstream.max_running == 1
+        assert [offset for offset, _ in upstream.requests] == [0, 10, 20]
+
+    def test_upstream_error_leaves_pager_incomplete(self):
+        upstream = FakeUpstream(total=50, fail_at=20)
+        paging = PagingConfig(page_size=10, prefetch_pages=2, target_page_seconds=0)
+
+        pager, items = collect(upstream, paging)
+
+        assert items == list(range(20))
+        assert not pager.complete
+
+    def test_page_size_adapts_within_bounds(self):
+        upstream = FakeUpstream(total=10_000)
+        paging = PagingConfig(page_size=10, prefetch_pages=1, target_page_seconds=10, max_page_size=40)
+
+        pager, items = collect(upstream, paging)
+
+        assert items == list(range(10_000))
+        limits = [limit for _, limit in upstream.requests]
+        assert limits[:3] == [10, 20, 40] and max(limits) == 40
@@ -0,0 +1,203 @@
+import json
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.adapters.api.routers import simulation_router
+from src.core.profiler import StreamProfiler
+from src.di.services import get_simulation_service, get_simulation_service_scope
+from src.domain.entities import (
+    IterationResult,
+    MatchRound,
+    PagedResponse,
+    PredictionSummary,
+    SimulationOverview,
+)
+from src.domain.ids import ids
+
+
+TEAM_A = "3f1c2d9e-0000-4000-8000-00000000000a"
+TEAM_B = "3f1c2d9e-0000-4000-8000-00000000000b"
+ROUND = "3f1c2d9e-0000-4000-8000-000000000001"
+MATCH = "3f1c2d9e-0000-4000-8000-000000000002"
+
+
+def predict_body() -> dict:
+    strength = {"offensive": 1.1, "defensive": 0.9}
+    return {
+        "simulation_id": "5b0e7c1a-0000-4000-8000-000000000001",
+        "league_id": "5b0e7c1a-0000-4000-8000-000000000002",
+        "iteration_count": 2,
+        "team_strengths": {
+            team: [
+                {
+                    "team_id": team,
+                    "round_id": ROUND,
+                    "likelihood": strength,
+                    "posterior": strength,
+                    "expected_goals": 1.4,
+                    "last_update": "2026-01-01T00:00:00",
+                }
+            ]
+            for team in (TEAM_A, TEAM_B)
+        },
+        "matches_to_simulate": [
+            {"id": MATCH, "round_id": ROUND, "home_team_id": TEAM_A, "away_team_id": TEAM_B}
+        ],
+        "train_until_round_no": 1,
+        "seed": 7,
+    }
+
+
+def overview(i: int) -> SimulationOverview:
+    return SimulationOverview(
+        id=f"sim-{i}", created_date="2026-01-01", league_strengths="", prior_league_strength=1.0
+    )
+
+
+def iteration(i: int) -> IterationResult:
+    return IterationResult(f"it-{i}", "S", i, "", "", [], [])
+
+
+class FakeSimulationService:
+    def __init__(self, total: int):
+        self.overviews = [overview(i) for i in range(total)]
+        self.closed = False
+        self.requests = []
+
+    async def run_simulation_overviews_page(self, offset, limit):
+        items = self.overviews[offset : offset + limit]
+        return PagedResponse(items, len(self.overviews), "", "")
+
+    async def iter_simulation_overviews(self):
+        for item in self.overviews:
+            yield item
+
+    async def run_prediction_stream(self, request):
+        self.requests.append(request)
+        match = request.matches_to_simulate[0]
+        played = MatchRound(
+            match.id, match.round_id, match.home_team_id, match.away_team_id, 2, 1, False, True
+        )
+        result = IterationResult("it-0", request.simulation_id, 0, "", "", [], [played])
+        yield "RUNNING", result, 1, None
+        yield "COMPLETED", None, 1, 0.02
+
+    async def run_prediction_summary_stream(self, request, progress_every=None):
+        for counter in range(progress_every or 2, 2, progress_every or 2):
+            yield "PROGRESS", PredictionSummary(request.simulation_id, counter, [], []), counter
+        yield "COMPLETED", PredictionSummary(request.simulation_id, 2, [], []), 2
+
+    async def iter_iterationResults_by_simulationId(self, simulation_id):
+        yield [iteration(0), iteration(1)]
+        yield [iteration(2)]
+
+
+def client(service: FakeSimulationService) -> TestClient:
+    @asynccontextmanager
+    async def scope():
+        yield service
+        service.closed = True
+
+    app = FastAPI()
+    app.include_router(simulation_router.router)
+    app.dependency_overrides[get_simulation_service] = lambda: service
+    app.dependency_overrides[get_simulation_service_scope] = lambda: scope
+    return TestClient(app)
+
+
+class TestSimulationRouterPaging:
+    def test_cursor_walks_all_pages(self):
+        http = client(FakeSimulationService(total=5))
+
+        ids, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            page = http.get("/simulations/overviews", params=params).json()
+            ids.extend(item["id"] for item in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert ids == [f"sim-{i}" for i in range(5)]
+        assert http.get("/simulations/overviews", params={"cursor": "bad!"}).status_code == 400
+
+    def test_streams_are_ndjson_and_close_scope_after_body(self):
+        service = FakeSimulationService(total=3)
+        http = client(service)
+
+        overviews = http.get("/simulations/overviews/stream")
+        results = http.get("/simulations/iterationresults/stream", params={"simulation_id": "S"})
+
+        assert overviews.headers["content-type"] == "application/x-ndjson"
+        assert [json.loads(line)["id"] for line in overviews.text.splitlines()] == [
+            "sim-0",
+            "sim-1",
+            "sim-2",
+        ]
+        assert [json.loads(line)["iteration_index"] for line in results.text.splitlines()] == [0, 1, 2]
+        assert service.closed
+
+
+class TestSimulationRouterPredict:
+    def test_uuid_body_is_mapped_to_int_ids_and_back(self):
+        service = FakeSimulationService(total=0)
+        http = client(service)
+
+        response = http.post("/simulations/predict", json=predict_body())
+
+        assert response.status_code == 200
+        request = service.requests[0]
+        assert set(request.team_strengths) == {ids.to_int(TEAM_A), ids.to_int(TEAM_B)}
+        assert request.matches_to_simulate[0].home_team_id == ids.to_int(TEAM_A)
+        assert request.team_strengths[ids.to_int(TEAM_A)][0].round_id == ids.to_int(ROUND)
+
+        events = [json.loads(line) for line in response.text.splitlines()]
+        assert [e["status"] for e in events] == ["RUNNING", "COMPLETED"]
+        assert events[-1]["standard_error"] == 0.02
+        match = events[0]["iteration_result"]["simulated_match_rounds"][0]
+        assert (match["id"], match["home_team_id"]) == (MATCH, TEAM_A)
+
+    def test_sse_frames_carry_the_same_json_events(self):
+        http = client(FakeSimulationService(total=0))
+
+        response = http.post(
+            "/simulations/predict", json=predict_body(), headers={"Accept": "text/event-stream"}
+        )
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        frames = [frame.split("\n") for frame in response.text.strip().split("\n\n")]
+        assert [frame[0] for frame in frames] == ["id: 1", "id: 1"]
+        assert json.loads(frames[1][1].removeprefix("data: "))["status"] == "COMPLETED"
+
+    def test_summary_streams_progress_only_when_asked(self):
+        service = FakeSimulationService(total=0)
+        http = client(service)
+
+        single = http.post("/simulations/predict/summary", json=predict_body())
+        streamed = http.post(
+            "/simulations/predict/summary", params={"progress_every": 1}, json=predict_body()
+        )
+
+        assert single.json()["iterations"] == 2
+        assert streamed.headers["content-type"] == "application/x-ndjson"
+        events = [json.loads(line) for line in streamed.text.splitlines()]
+        assert [(e["status"], e["summary"]["iterations"]) for e in events] == [
+            ("PROGRESS", 1),
+            ("COMPLETED", 2),
+        ]
+        assert service.closed
+
+    def test_armed_profiler_covers_rest_prediction_streams(self, monkeypatch):
+        profiler = StreamProfiler()
+        monkeypatch.setattr(simulation_router, "profiler", profiler)
+        http = client(FakeSimulationService(total=0))
+        profiler.arm(calls=2)
+
+        http.post("/simulations/predict", json=predict_body())
+        http.post("/simulations/predict/summary", json=predict_body())
+
+        status = profiler.status()
+        assert (status["profiled_calls"], status["active_streams"]) == (2, 0)
+        assert not status["armed"]
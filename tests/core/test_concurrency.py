@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from src.core.concurrency import BatchedFlight
+
+
+class TestBatchedFlight:
+    def test_concurrent_calls_share_one_execution(self):
+        calls = []
+
+        async def train(league_id, simulation_ids):
+            calls.append((league_id, simulation_ids))
+            await asyncio.sleep(0.01)
+            return f"models-{league_id}-{len(calls)}"
+
+        async def scenario():
+            flight = BatchedFlight("test")
+            shared = await asyncio.gather(
+                flight.do("L1", ["s1"], lambda ids: train("L1", ids)),
+                flight.do("L1", ["s1", "s2"], lambda ids: train("L1", ids)),
+                flight.join("L1"),
+                flight.do("L2", ["s1"], lambda ids: train("L2", ids)),
+            )
+            assert not flight.in_flight("L1")
+            assert await flight.join("L1") is None
+            return shared
+
+        shared = asyncio.run(scenario())
+
+        assert shared == ["models-L1-2", "models-L1-2", "models-L1-2", "models-L2-2"]
+        assert calls == [("L1", ["s1", "s2"]), ("L2", ["s1"])]
+
+    def test_items_submitted_during_a_call_go_to_one_follow_up_call(self):
+        calls = []
+
+        async def train(simulation_ids):
+            calls.append(simulation_ids)
+            await asyncio.sleep(0.02)
+            return len(calls)
+
+        async def scenario():
+            flight = BatchedFlight("test")
+            first = asyncio.ensure_future(flight.do("L", ["s1"], train))
+            await asyncio.sleep(0.005)  # trening s1 już trwa
+            later = await asyncio.gather(
+                flight.do("L", ["s2"], train),
+                flight.do("L", ["s3"], train),
+                flight.join("L"),
+            )
+            return await first, later
+
+        first, later = asyncio.run(scenario())
+
+        assert calls == [["s1"], ["s2", "s3"]]
+        assert first == 1 and later == [2, 2, 2]
+
+    def test_error_reaches_all_waiters_and_is_not_cached(self):
+        async def broken(_ids):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("fit failed")
+
+        async def scenario():
+            flight = BatchedFlight("test")
+            results = await asyncio.gather(
+                flight.do("L", ["s"], broken), flight.do("L", ["s"], broken), return_exceptions=True
+            )
+            return results, await flight.do("L", ["s"], lambda ids: asyncio.sleep(0, result="ok"))
+
+        results, retry = asyncio.run(scenario())
+
+        assert [str(r) for r in results] == ["fit failed", "fit failed"]
+        assert retry == "ok"
+
+    def test_cancelled_waiter_does_not_cancel_shared_call(self):
+        async def scenario():
+            flight = BatchedFlight("test")
+            first = asyncio.ensure_future(
+                flight.do("L", ["s"], lambda ids: asyncio.sleep(0.02, result="models"))
+            )
+            second = asyncio.ensure_future(flight.do("L", ["s"], lambda ids: asyncio.sleep(0)))
+            await asyncio.sleep(0)
+            first.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            return await second
+
+        assert asyncio.run(scenario()) == "models"
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+
+import pytest
+
+from src.core.logger import aggregate_warnings, aggregated_stream, log_aggregated, merge_aggregated
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def captured():
+    logger = logging.getLogger("tests.core.logger")
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = _ListHandler()
+    logger.addHandler(handler)
+    return logger, handler
+
+
+class TestAggregatedWarnings:
+    def test_scope_emits_single_summary(self, captured):
+        logger, handler = captured
+
+        with aggregate_warnings(logger, "stream") as aggregator:
+            for i in range(1000):
+                log_aggregated(logger, "baseline fallback", f"team-{i % 18}")
+
+            assert handler.messages == []
+            assert aggregator.count("baseline fallback") == 1000
+
+        assert handler.messages == [
+            "baseline fallback used 1,000 times for 18 teams in this stream"
+        ]
+
+    def test_outside_scope_warnings_are_rate_limited(self, captured):
+        logger, handler = captured
+
+        for _ in range(50):
+            log_aggregated(logger, "rate limited event", "team-1")
+
+        assert len(handler.messages) == 1
+        assert "rate limited event" in handler.messages[0]
+
+    def test_nested_scope_restores_outer_aggregator(self, captured):
+        logger, handler = captured
+
+        with aggregate_warnings(logger, "outer") as outer:
+            with aggregate_warnings(logger, "inner"):
+                log_aggregated(logger, "inner event", "team-1")
+            log_aggregated(logger, "outer event", "team-2")
+
+            assert outer.count("outer event") == 1
+            assert outer.count("inner event") == 0
+
+    def test_counts_from_other_scopes_merge_into_one_summary(self, captured):
+        logger, handler = captured
+
+        with aggregate_warnings(logger, "stream"):
+            for chunk in range(3):
+                with aggregate_warnings(logger, "shard", flush=False) as shard:
+                    log_aggregated(logger, "baseline fallback", f"team-{chunk}")
+                    log_aggregated(logger, "baseline fallback", "team-0")
+                merge_aggregated(logger, "shards", shard.events())
+
+        assert handler.messages == [
+            "baseline fallback used 6 times for 3 teams in this stream"
+        ]
+
+    def test_stream_scope_does_not_leak_to_consumer(self, captured):
+        logger, handler = captured
+
+        async def events():
+            for i in range(3):
+                log_aggregated(logger, "stream event", f"team-{i}")
+                yield i
+
+        async def scenario():
+            received = []
+            async for item in aggregated_stream(logger, "stream", events):
+                # kod konsumenta między yieldami jest poza scope streamu
+                log_aggregated(logger, "consumer event", "team-1")
+                received.append(item)
+            return received
+
+        assert asyncio.run(scenario()) == [0, 1, 2]
+        assert handler.messages[0].startswith("consumer event")
+        assert handler.messages[-1] == "stream event used 3 times for 3 teams in this stream"
+
+    def test_stream_error_reaches_consumer(self, captured):
+        logger, _ = captured
+
+        async def broken():
+            yield 1
+            raise RuntimeError("predict failed")
+
+        async def scenario():
+            received = []
+            with pytest.raises(RuntimeError, match="predict failed"):
+                async for item in aggregated_stream(logger, "stream", broken):
+                    received.append(item)
+            return received
+
+        assert asyncio.run(scenario()) == [1]
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from src.core.metrics import MetricsRegistry, _Metric, timed
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+class TestCounter:
+    def test_inc_accumulates_per_label_set(self, registry):
+        counter = registry.counter("calls_total", "Calls.", ("method",))
+
+        counter.inc(method="A")
+        counter.inc(2, method="A")
+        counter.inc(method="B")
+
+        assert counter.value(method="A") == 3
+        assert counter.value(method="B") == 1
+
+    def test_inc_rejects_unknown_labels(self, registry):
+        counter = registry.counter("calls_total", "Calls.", ("method",))
+
+        with pytest.raises(ValueError):
+            counter.inc(other="A")
+
+    def test_registry_returns_same_metric_for_same_name(self, registry):
+        first = registry.counter("calls_total", "Calls.")
+        second = registry.counter("calls_total", "Calls.")
+
+        assert first is second
+
+    def test_metric_without_collect_fails_at_construction(self):
+        class Gauge(_Metric):
+            kind = "gauge"
+
+        with pytest.raises(TypeError):
+            Gauge("g", "incomplete metric")
+
+
+class TestHistogram:
+    def test_observe_renders_cumulative_buckets(self, registry):
+        histogram = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5.0)
+
+        text = registry.render()
+
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="1"} 2' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+        assert "latency_seconds_count 3" in text
+        assert "# TYPE latency_seconds histogram" in text
+
+    def test_time_records_observation_even_on_error(self, registry):
+        histogram = registry.histogram("op_seconds", "Op.", ("operation",))
+
+        with pytest.raises(RuntimeError):
+            with histogram.time(operation="train"):
+                raise RuntimeError("boom")
+
+        assert histogram.count(operation="train") == 1
+
+    def test_timed_decorator_supports_coroutines(self, registry):
+        histogram = registry.histogram("coro_seconds", "Coro.")
+
+        @timed(histogram)
+        async def work():
+            return 42
+
+        assert asyncio.run(work()) == 42
+        assert histogram.count() == 1
@@ -0,0 +1,48 @@
+import pytest
+
+from src.core.profiler import StreamProfiler
+
+
+def get_strength_or_fallback():
+    return sum(range(100))
+
+
+@pytest.fixture
+def profiler():
+    return StreamProfiler()
+
+
+class TestStreamProfiler:
+    def test_disarmed_profiler_does_not_profile(self, profiler):
+        with profiler.profile_call() as profiled:
+            get_strength_or_fallback()
+
+        assert profiled is False
+        assert profiler.hot_functions() == []
+
+    def test_arm_for_calls_profiles_exactly_n_calls(self, profiler):
+        profiler.arm(calls=2)
+
+        results = []
+        for _ in range(3):
+            with profiler.profile_call() as profiled:
+                get_strength_or_fallback()
+            results.append(profiled)
+
+        assert results == [True, True, False]
+        assert profiler.status()["profiled_calls"] == 2
+
+    def test_hot_functions_can_be_filtered_by_name(self, profiler):
+        profiler.arm(calls=1)
+
+        with profiler.profile_call():
+            get_strength_or_fallback()
+
+        hot = profiler.hot_functions(match="get_strength_or_fallback")
+
+        assert [f.function for f in hot] == ["get_strength_or_fallback"]
+        assert hot[0].total_calls == 1
+
+    def test_arm_requires_calls_or_seconds(self, profiler):
+        with pytest.raises(ValueError):
+            profiler.arm()
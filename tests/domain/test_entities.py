@@ -0,0 +1,173 @@
+import uuid
+
+import pytest
+
+from src.domain.entities import (
+    LeagueRound,
+    LeagueTopology,
+    MatchFixtures,
+    MatchRound,
+    SeasonStats,
+    StrengthItem,
+    TeamStrength,
+)
+from src.domain.features.mapper import Mapper
+from src.domain.ids import EMPTY_ID
+
+
+def make_strength(team_id="T1", round_id="R1") -> TeamStrength:
+    return TeamStrength(
+        team_id=team_id,
+        likelihood=StrengthItem(offensive=1.2, defensive=0.9),
+        posterior=StrengthItem(offensive=1.1, defensive=1.0),
+        expected_goals=1.1,
+        last_update="2025-01-01T00:00:00",
+        round_id=round_id,
+        season_stats=SeasonStats(
+            id="S1",
+            team_id=team_id,
+            season_year=3,
+            league_id="L1",
+            league_strength=1.4,
+            matches_played=4,
+            wins=2,
+            losses=1,
+            draws=1,
+            goals_for=7,
+            goals_against=5,
+        ),
+    )
+
+
+class TestWithMatchResult:
+    @pytest.mark.parametrize("home_goals,away_goals", [(3, 1), (0, 2), (1, 1)])
+    def test_matches_chained_update(self, home_goals, away_goals):
+        match = MatchRound(
+            id="M1",
+            round_id="R2",
+            home_team_id="T1",
+            away_team_id="T2",
+            home_goals=home_goals,
+            away_goals=away_goals,
+            is_draw=home_goals == away_goals,
+            is_played=True,
+        )
+        base = make_strength()
+
+        chained = (
+            base.with_round_meta("R2", "2025-02-01T00:00:00")
+            .with_incremented_stats(match, is_home_team=True)
+            .with_likelihood()
+            .with_posterior(25, 1.6)
+        )
+        fused = base.with_match_result(
+            home_goals,
+            away_goals,
+            team_id="T1",
+            round_id="R2",
+            last_update="2025-02-01T00:00:00",
+            games_to_reach_trust=25,
+            league_strength=1.6,
+        )
+
+        assert fused.season_stats.id is None
+        chained.season_stats.id = None
+        assert fused == chained
+
+    def test_requires_positive_games_to_reach_trust(self):
+        with pytest.raises(ValueError):
+            make_strength().with_match_result(
+                1,
+                0,
+                team_id="T1",
+                round_id="R2",
+                last_update="",
+                games_to_reach_trust=0,
+                league_strength=1.0,
+            )
+
+
+class TestSeasonStatsResolvedId:
+    def test_lazy_id_is_deterministic_within_namespace(self):
+        stats = SeasonStats.empty(team_id="T1", id=None)
+        namespace = uuid.uuid4()
+
+        assert stats.resolved_id(namespace) == stats.resolved_id(namespace)
+        assert stats.resolved_id(namespace) != stats.resolved_id(uuid.uuid4())
+
+    def test_explicit_id_is_kept(self):
+        stats = SeasonStats.empty(team_id="T1", id="S1")
+
+        assert stats.resolved_id(uuid.uuid4()) == "S1"
+
+
+class TestLeagueTopology:
+    rounds = [
+        LeagueRound(id=13, league_id=1, season_year="3", round=3),
+        LeagueRound(id=11, league_id=1, season_year="3", round=1),
+        LeagueRound(id=12, league_id=1, season_year="3", round=2),
+    ]
+
+    def test_matches_mapper_round_maps(self):
+        topology = LeagueTopology.from_rounds(1, self.rounds)
+        round_no_by_round_id = Mapper.map_round_no_by_round_id(self.rounds)
+
+        assert topology.round_ids == (11, 12, 13)
+        assert topology.round_no_by_round_id == round_no_by_round_id
+        assert topology.round_id_by_round_no == Mapper.map_round_id_by_round_no(self.rounds)
+        assert topology.prev_round_id_by_round_id == Mapper.map_prev_round_id_by_round_id(
+            round_no_by_round_id
+        )
+
+    def test_prev_and_next_indices(self):
+        topology = LeagueTopology.from_rounds(1, self.rounds)
+
+        assert topology.prev_index == (-1, 0, 1)
+        assert topology.next_index == (1, 2, -1)
+        assert topology.prev_round_id(11) == EMPTY_ID
+        assert topology.prev_round_id(999) == EMPTY_ID
+
+    def test_signature_ignores_round_order(self):
+        assert LeagueTopology.signature_of(self.rounds) == LeagueTopology.signature_of(
+            list(reversed(self.rounds))
+        )
+
+
+class TestMatchFixtures:
+    topology = LeagueTopology.from_rounds(
+        1,
+        [
+            LeagueRound(id=11, league_id=1, season_year="3", round=1),
+            LeagueRound(id=12, league_id=1, season_year="3", round=2),
+        ],
+    )
+
+    def make_fixtures(self):
+        matches = [
+            MatchRound(101, 12, 1, 2, 0, 0, False, False),
+            MatchRound(102, 11, 3, 1, 0, 0, False, False),
+        ]
+        return matches, MatchFixtures.from_match_rounds(matches, self.topology)
+
+    def test_arrays_index_teams_and_rounds(self):
+        _, fixtures = self.make_fixtures()
+
+        assert fixtures.team_ids == (1, 2, 3)
+        assert fixtures.home_idx.tolist() == [0, 2]
+        assert fixtures.away_idx.tolist() == [1, 0]
+        assert fixtures.round_idx.tolist() == [1, 0]
+        assert fixtures.prev_round_idx.tolist() == [0, -1]
+        assert fixtures.prev_round_ids.tolist() == [11, EMPTY_ID]
+        assert not fixtures.home_idx.flags.writeable
+
+    def test_to_match_rounds_does_not_touch_request_objects(self):
+        matches, fixtures = self.make_fixtures()
+
+        played = fixtures.to_match_rounds([2, 1], [1, 1])
+
+        assert [(m.id, m.home_goals, m.away_goals, m.is_draw) for m in played] == [
+            (101, 2, 1, False),
+            (102, 1, 1, True),
+        ]
+        assert all(m.is_played for m in played)
+        assert not any(m.is_played for m in matches)
@@ -0,0 +1,75 @@
+import logging
+
+from src.core.logger import aggregate_warnings
+from src.core.metrics import ID_REGISTRY_OVERFLOW
+from src.domain.entities import IterationResult
+from src.domain.features.mapper import Mapper
+from src.domain.ids import EMPTY_ID, GUID_EMPTY, NO_ID, IdRegistry, ids
+
+TEAM = "6f1c2a4e-0000-4000-8000-000000000001"
+ROUND = "6f1c2a4e-0000-4000-8000-000000000002"
+
+
+class TestIdRegistry:
+    def test_to_int_is_dense_and_stable(self):
+        registry = IdRegistry()
+
+        first = registry.to_int("a")
+        second = registry.to_int("b")
+
+        assert (first, second) == (1, 2)
+        assert registry.to_int("a") == first
+        assert registry.to_int(first) == first
+        assert len(registry) == 2
+
+    def test_round_trip_and_empty_values(self):
+        registry = IdRegistry()
+
+        assert registry.to_str(registry.to_int(TEAM)) == TEAM
+        assert registry.to_int("") == NO_ID
+        assert registry.to_int(None) == NO_ID
+        assert registry.to_str(NO_ID) == ""
+        assert registry.to_str(TEAM) == TEAM
+
+    def test_ids_past_the_cap_are_interned_with_a_warning(self):
+        registry = IdRegistry(max_entries=2)
+        overflow = ID_REGISTRY_OVERFLOW.value()
+        registry.to_int("a")
+        registry.to_int("b")
+
+        with aggregate_warnings(logging.getLogger("test"), "test", flush=False) as warnings:
+            c = registry.to_int("c")
+
+        assert registry.to_str(c) == "c" and registry.to_int("a") == 1 and len(registry) == 3
+        assert ID_REGISTRY_OVERFLOW.value() == overflow + 1
+        [(event, (count, subjects, _))] = warnings.events().items()
+        assert "IDS_MAX_ENTRIES=2" in event and (count, subjects) == (1, {"c"})
+
+    def test_guid_empty_has_fixed_id(self):
+        assert ids.to_int(GUID_EMPTY) == EMPTY_ID
+        assert ids.to_str(EMPTY_ID) == GUID_EMPTY
+
+
+class TestIdsAtBoundaries:
+    def test_parsed_match_round_serializes_back_to_uuid_strings(self):
+        [match_round] = IterationResult.from_sim_matches_raw_new(
+            [
+                {
+                    "Id": ROUND,
+                    "RoundId": ROUND,
+                    "HomeTeamId": TEAM,
+                    "AwayTeamId": GUID_EMPTY,
+                    "HomeGoals": 2,
+                    "AwayGoals": 1,
+                }
+            ]
+        )
+
+        assert match_round.home_team_id == ids.to_int(TEAM)
+        assert match_round.away_team_id == EMPTY_ID
+
+        payload = Mapper.map_match_round_to_dict(match_round)
+
+        assert payload["home_team_id"] == TEAM
+        assert payload["away_team_id"] == GUID_EMPTY
+        assert payload["round_id"] == ROUND
@@ -0,0 +1,90 @@
+import json
+
+import numpy as np
+
+from src.domain.entities import (
+    AnalyticMatchOutcome,
+    AnalyticPrediction,
+    IterationResult,
+    MatchRound,
+    TrainingData,
+)
+from src.domain.features.mapper import Mapper
+from src.domain.ids import ids
+
+
+def training_data(x_row, y_home, y_away):
+    return TrainingData(x_row=x_row, y_home=y_home, y_away=y_away, prev_round_id=0)
+
+
+class TestMapToFeatureArray:
+    def test_matches_dataframe_mapping_in_float32(self):
+        dataset = [
+            training_data({"a": 1.5, "b": 2.0, "extra": 9.0}, 2, 1),
+            training_data({"b": 0.25}, 0, 3),
+        ]
+        # "a" brakuje w drugim wierszu -> NaN; "c" nie ma nigdzie -> fill_value
+
+        X, y_home, y_away = Mapper.map_to_feature_array(dataset, ["b", "a", "c"])
+        X_df, y_home_df, y_away_df, _ = Mapper.map_to_xy_matrix(dataset, ["b", "a", "c"])
+
+        assert X.dtype == np.float32
+        np.testing.assert_array_equal(X, X_df.to_numpy(dtype=np.float32))
+        assert y_home.tolist() == y_home_df.tolist()
+        assert y_away.tolist() == y_away_df.tolist()
+
+    def test_empty_dataset(self):
+        X, y_home, _ = Mapper.map_to_feature_array([], ["a", "b"])
+
+        assert X.shape == (0, 2)
+        assert len(y_home) == 0
+
+
+class TestMapToPredictEvent:
+    def test_iteration_and_final_event(self):
+        match_id = "00000000-0000-0000-0000-0000000000aa"
+        team_id = ids.to_int(match_id)
+        result = IterationResult(
+            id="it-1",
+            simulation_id="S",
+            iteration_index=4,
+            start_date="2026-01-01",
+            execution_time="0:00:00.01",
+            team_strengths=[],
+            simulated_match_rounds=[MatchRound(match_id, team_id, team_id, team_id, 2, 1, False, True)],
+        )
+
+        event = json.loads(Mapper.map_to_predict_event("RUNNING", result, 5))
+        final = json.loads(Mapper.map_to_predict_event("COMPLETED", None, 5, 0.01))
+
+        assert event["status"] == "RUNNING" and event["predicted_iterations"] == 5
+        assert event["iteration_result"]["iteration_index"] == 4
+        assert event["iteration_result"]["simulated_match_rounds"][0]["id"].endswith("aa")
+        assert final == {
+            "status": "COMPLETED",
+            "predicted_iterations": 5,
+            "iteration_result": None,
+            "standard_error": 0.01,
+        }
+        assert "standard_error" not in event
+
+
+class TestMapAnalyticPrediction:
+    def test_reports_goal_sampling_and_string_ids(self):
+        team_id = ids.to_int("00000000-0000-0000-0000-0000000000bb")
+        prediction = AnalyticPrediction(
+            simulation_id="S",
+            matches=[
+                AnalyticMatchOutcome(
+                    "M1", team_id, team_id, team_id, 1.2, 0.8, 0.5, 0.3, 0.2, [[1.0]]
+                )
+            ],
+            dependent_match_ids=["M2"],
+            goal_sampling="round",
+        )
+
+        mapped = Mapper.map_analytic_prediction_to_dict(prediction)
+
+        assert mapped["goal_sampling"] == "round"
+        assert mapped["matches"][0]["home_team_id"].endswith("bb")
+        assert mapped["dependent_match_ids"] == ["M2"]
@@ -0,0 +1,32 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.domain.entities import MAX_GOALS
+from src.domain.features.predictions.poisson_outcomes import (
+    outcome_probabilities,
+    poisson_pmf_table,
+    score_matrices,
+)
+
+
+class TestPoissonOutcomes:
+    def test_pmf_matches_formula_and_folds_tail(self):
+        table = poisson_pmf_table(np.array([1.3, 0.0, 14.0]))
+
+        assert table.shape == (3, MAX_GOALS + 1)
+        assert table[0, 2] == pytest.approx(math.exp(-1.3) * 1.3**2 / 2)
+        assert table[1].tolist() == [1.0] + [0.0] * MAX_GOALS
+        assert table.sum(axis=1) == pytest.approx([1.0, 1.0, 1.0])
+
+    def test_outcomes_sum_to_one_and_follow_lambdas(self):
+        matrices = score_matrices(np.array([2.0, 1.0]), np.array([0.5, 1.0]))
+        home_win, draw, away_win = outcome_probabilities(matrices)
+
+        assert (home_win + draw + away_win) == pytest.approx([1.0, 1.0])
+        assert home_win[0] > away_win[0]
+        assert home_win[1] == pytest.approx(away_win[1])
+        assert matrices[0, 1, 0] == pytest.approx(
+            math.exp(-2.0) * 2.0 * math.exp(-0.5)
+        )
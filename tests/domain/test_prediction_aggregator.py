@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from src.domain.entities import LeagueRound, LeagueTopology, MatchFixtures, MatchRound
+from src.domain.features.predictions.prediction_aggregator import (
+    ConvergenceMonitor,
+    PredictionAggregator,
+)
+
+
+@pytest.fixture
+def aggregator():
+    rounds = [LeagueRound(id=10 + r, league_id=1, season_year="3", round=r) for r in (1, 2)]
+    topology = LeagueTopology.from_rounds(1, rounds)
+    fixtures = MatchFixtures.from_match_rounds(
+        [
+            MatchRound(101, 12, 2, 3, 0, 0, False, False),
+            MatchRound(102, 12, 4, 5, 0, 0, False, False),
+        ],
+        topology,
+    )
+    played = [
+        MatchRound(90, 11, 2, 4, 1, 0, False, True),  # 2: 3 pkt
+        MatchRound(91, 11, 3, 5, 1, 1, True, True),  # 3, 5: 1 pkt
+    ]
+    return PredictionAggregator(fixtures, played, relegation_places=1)
+
+
+class TestPredictionAggregator:
+    def test_counts_outcomes_goals_and_positions(self, aggregator):
+        aggregator.add(np.array([2, 0]), np.array([0, 0]))
+        aggregator.add(np.array([0, 1]), np.array([1, 3]))
+
+        summary = aggregator.summary("S")
+        first, second = summary.matches
+
+        assert summary.iterations == 2
+        assert (first.home_win, first.draw, first.away_win) == (0.5, 0.0, 0.5)
+        assert (second.home_win, second.draw, second.away_win) == (0.0, 0.5, 0.5)
+        assert first.home_goals_distribution[:3] == [0.5, 0.0, 0.5]
+        assert first.expected_home_goals == 1.0
+
+        teams = {t.team_id: t for t in summary.teams}
+        # 1. iteracja: 2 -> 6 pkt (lider), 3 i 4 po 1 pkt (3 ostatni po bilansie)
+        # 2. iteracja: 3 i 5 po 4 pkt (5 liderem po bilansie), 4 -> 0 pkt (ostatni)
+        assert teams[2].expected_points == 4.5
+        assert teams[2].points_std == 1.5
+        assert (teams[2].title, teams[5].title) == (0.5, 0.5)
+        assert (teams[3].relegation, teams[4].relegation) == (0.5, 0.5)
+        assert sum(teams[4].position_distribution) == pytest.approx(1.0)
+        assert summary.teams[0].team_id == 2
+
+    def test_goals_are_capped_to_fixed_histogram(self, aggregator):
+        aggregator.add(np.array([40, 0]), np.array([0, 0]))
+
+        [first, _] = aggregator.summary("S").matches
+
+        assert first.home_goals_distribution[-1] == 1.0
+
+
+class TestConvergenceMonitor:
+    def test_stops_only_on_check_iterations_below_tolerance(self, aggregator):
+        monitor = ConvergenceMonitor(aggregator, 0.01, check_every=2, min_iterations=4)
+        home, away = np.array([2, 0]), np.array([0, 0])
+
+        # identyczne iteracje: błąd standardowy = 0, ale dopiero od 4. iteracji
+        assert [monitor.add(home, away) for _ in range(4)] == [False, False, False, True]
+        assert monitor.standard_error == 0.0
+
+    def test_varying_results_keep_running(self, aggregator):
+        monitor = ConvergenceMonitor(aggregator, 0.01, check_every=1, min_iterations=2)
+
+        assert not monitor.add(np.array([2, 0]), np.array([0, 0]))
+        assert not monitor.add(np.array([0, 1]), np.array([1, 3]))
+        assert monitor.standard_error == pytest.approx(0.5 / np.sqrt(2))
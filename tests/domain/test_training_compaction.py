@@ -0,0 +1,34 @@
+from src.domain.entities import TrainingData
+from src.domain.features.trainings.training_compaction import TrainingCompactor
+
+
+def row(home_p_off: float, y_home: int, prev_round_id: int = 10, weight: float = 1.0):
+    return TrainingData(
+        x_row={"home_p_off": home_p_off, "away_p_def": 1.0},
+        y_home=y_home,
+        y_away=0,
+        prev_round_id=prev_round_id,
+        weight=weight,
+    )
+
+
+class TestTrainingCompactor:
+    def test_collapses_identical_rows_into_weights(self):
+        compactor = TrainingCompactor()
+        compactor.add([row(1.2, 1), row(1.5, 2), row(1.2, 1)])
+        compactor.add([row(1.2, 1, weight=2.0), row(1.2, 3)])
+
+        dataset = compactor.dataset()
+
+        assert compactor.input_rows == 5
+        assert [(r.x_row["home_p_off"], r.y_home, r.weight) for r in dataset] == [
+            (1.2, 1, 4.0),
+            (1.5, 2, 1.0),
+            (1.2, 3, 1.0),
+        ]
+
+    def test_keeps_rounds_apart_for_time_split(self):
+        dataset = TrainingCompactor.compact([row(1.2, 1, 10), row(1.2, 1, 11)])
+
+        assert [r.prev_round_id for r in dataset] == [10, 11]
+        assert sum(r.weight for r in dataset) == 2
@@ -0,0 +1,41 @@
+from src.domain.entities import TrainingData
+from src.domain.features.trainings.training_sampler import TrainingSampler
+
+
+def rows(prev_round_id: int, n: int, start: int = 0):
+    return [
+        TrainingData(
+            x_row={"home_p_off": float(start + i)},
+            y_home=1,
+            y_away=0,
+            prev_round_id=prev_round_id,
+        )
+        for i in range(n)
+    ]
+
+
+class TestTrainingSampler:
+    def test_caps_rows_per_round_and_keeps_total_weight(self):
+        sampler = TrainingSampler(20, {10: 1, 11: 2}, seed=3)
+        for iteration in range(5):
+            sampler.add(rows(10, 30, start=iteration * 100) + rows(11, 4, start=iteration * 100))
+
+        dataset = sampler.dataset()
+        by_round = {
+            round_id: [r for r in dataset if r.prev_round_id == round_id]
+            for round_id in (10, 11)
+        }
+
+        assert sampler.input_rows == 170
+        assert len(by_round[10]) == 10 and len(by_round[11]) == 10
+        assert sum(r.weight for r in by_round[10]) == 150
+        assert sum(r.weight for r in by_round[11]) == 20
+
+    def test_recency_half_life_prefers_newer_simulations(self):
+        sampler = TrainingSampler(50, {10: 1}, recency_half_life=0.25, seed=3)
+        sampler.add(rows(10, 200, start=0), age=2)
+        sampler.add(rows(10, 200, start=1000), age=0)
+
+        newer = sum(r.x_row["home_p_off"] >= 1000 for r in sampler.dataset())
+
+        assert newer >= 45
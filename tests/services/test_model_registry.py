@@ -0,0 +1,66 @@
+import pytest
+
+from src.domain.entities import TrainedModels
+from src.services.xgboost.model_registry import ModelRegistry
+
+
+def publish(registry: ModelRegistry, league_id: str, payload: str) -> int:
+    with registry.new_version(league_id) as staged:
+        (registry.root / staged.relative_dir / "model.json").write_text(payload)
+    return staged.version
+
+
+class TestModelRegistry:
+    def test_versions_pointer_and_retention(self, tmp_path):
+        registry = ModelRegistry(tmp_path, retention=1)
+
+        assert registry.current("L") is None
+        assert [publish(registry, "L", str(i)) for i in range(3)] == [1, 2, 3]
+
+        current = registry.current("L")
+        assert current.version == 3
+        assert (tmp_path / current.relative_dir / "model.json").read_text() == "2"
+        # aktywna wersja + jedna starsza
+        assert registry.versions("L") == [2, 3]
+
+    def test_failed_write_leaves_current_version(self, tmp_path):
+        registry = ModelRegistry(tmp_path, retention=3)
+        publish(registry, "L", "ok")
+
+        with pytest.raises(RuntimeError):
+            with registry.new_version("L"):
+                raise RuntimeError("save failed")
+
+        assert registry.current_version("L") == 1
+        assert [p.name for p in (tmp_path / "models" / "L").iterdir() if p.is_dir()] == ["v1"]
+
+    def test_active_models_are_served_from_memory(self, tmp_path, monkeypatch):
+        registry = ModelRegistry(tmp_path, retention=3)
+        models = TrainedModels(None, None, ["x"])
+        registry.activate("L", publish(registry, "L", "a"), models)
+
+        # gorąca ścieżka bez odczytu CURRENT
+        monkeypatch.setattr(registry, "current_version", lambda league_id: 1 / 0)
+        assert registry.active("L") is models and registry.version("L") == 1
+
+        # nowa wersja w tym procesie - stare modele przestają być aktywne,
+        # a spóźniona aktywacja starszej wersji jej nie cofa
+        assert publish(registry, "L", "b") == 2
+        registry.activate("L", 1, models)
+        assert registry.active("L") is None and registry.version("L") == 2
+
+    def test_cold_start_reads_current_pointer(self, tmp_path):
+        publish(ModelRegistry(tmp_path, retention=3), "L", "a")
+        restarted = ModelRegistry(tmp_path, retention=3)
+
+        assert restarted.version("L") == 1
+        assert restarted.active("L") is None
+        assert restarted.version("other") is None
+
+    def test_zero_retention_keeps_previous_version(self, tmp_path):
+        registry = ModelRegistry(tmp_path, retention=0)
+
+        for payload in "abc":
+            publish(registry, "L", payload)
+
+        assert registry.versions("L") == [2, 3]
@@ -0,0 +1,141 @@
+import asyncio
+import pickle
+
+import numpy as np
+
+from src.core.config import PredictionConfig
+from src.domain.entities import IterationResult, MatchRound, PredictRequest
+from src.domain.ids import ids
+from src.services.prediction_cache import PredictionCache, for_request, prediction_key
+
+
+def request(simulation_id: str = "S1", seed: int = 7) -> PredictRequest:
+    return PredictRequest(
+        simulation_id=simulation_id,
+        league_id="L",
+        iteration_count=2,
+        team_strengths={},
+        matches_to_simulate=[],
+        train_until_round_no=1,
+        seed=seed,
+    )
+
+
+def iteration(index: int) -> IterationResult:
+    return IterationResult(
+        id=f"it-{index}",
+        simulation_id="S1",
+        iteration_index=index,
+        start_date="",
+        execution_time="",
+        team_strengths=[],
+        simulated_match_rounds=None,
+        home_goals=np.array([index]),
+        away_goals=np.array([0]),
+    )
+
+
+class CountingSource:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        for index in range(2):
+            await asyncio.sleep(0.01)
+            yield ("RUNNING", iteration(index), index + 1, None)
+        yield ("COMPLETED", None, 2, 0.01)
+
+
+async def collect(cache, key, source, **kwargs):
+    return [event async for event in cache.stream(key, source, **kwargs)]
+
+
+class TestPredictionKey:
+    def test_ignores_simulation_id_but_not_content_or_model_version(self):
+        config = PredictionConfig()
+        key = prediction_key(request("S1"), 1, config)
+
+        assert prediction_key(request("S2"), 1, config) == key
+        assert prediction_key(request(seed=8), 1, config) != key
+        assert prediction_key(request(), 2, config) != key
+
+    def test_replayed_results_are_rebound_to_the_request(self):
+        status, result, counter, _ = for_request(("RUNNING", iteration(0), 1, None), request("S2"))
+
+        assert result.simulation_id == "S2" and result.id != "it-0"
+        assert for_request(("RUNNING", iteration(0), 1, None), request("S1"))[1].id == "it-0"
+
+
+class TestPredictionCache:
+    def test_concurrent_requests_share_one_stream_and_later_ones_hit_cache(self):
+        cache = PredictionCache(max_entries=4, max_iterations=100)
+        source = CountingSource()
+
+        async def scenario():
+            first, second = await asyncio.gather(
+                collect(cache, "k", source), collect(cache, "k", source)
+            )
+            return first, second, await collect(cache, "k", source)
+
+        first, second, cached = asyncio.run(scenario())
+
+        assert source.calls == 1
+        assert [e[0] for e in first] == ["RUNNING", "RUNNING", "COMPLETED"]
+        assert first == second == cached
+
+    def test_stale_result_is_not_cached(self):
+        cache = PredictionCache(max_entries=4, max_iterations=100)
+        source = CountingSource()
+
+        async def scenario():
+            await collect(cache, "k", source, is_current=lambda: False)
+            await collect(cache, "k", source)
+
+        asyncio.run(scenario())
+        assert source.calls == 2
+
+    def test_evicted_entries_spill_to_disk(self, tmp_path):
+        cache = PredictionCache(max_entries=1, max_iterations=100, spill_dir=tmp_path, spill_entries=1)
+        source = CountingSource()
+
+        async def scenario():
+            await collect(cache, "a", source)
+            await collect(cache, "b", source)  # "a" -> dysk
+            await collect(cache, "c", source)  # "b" -> dysk, "a" usunięte (limit 1)
+            return await collect(cache, "b", source)
+
+        restored = asyncio.run(scenario())
+
+        assert source.calls == 3
+        assert [e[1].home_goals.tolist() for e in restored[:2]] == [[0], [1]]
+        assert sorted(p.stem for p in tmp_path.iterdir()) == ["c"]
+
+    def test_spilled_events_store_uuid_ids(self, tmp_path):
+        team, round_ = "6f1c2a4e-0000-4000-8000-0000000000c1", "6f1c2a4e-0000-4000-8000-0000000000c2"
+        played = MatchRound("M1", ids.to_int(round_), ids.to_int(team), ids.to_int(team), 1, 0, False, True)
+        cache = PredictionCache(max_entries=1, max_iterations=100, spill_dir=tmp_path, spill_entries=2)
+
+        async def source():
+            yield ("RUNNING", IterationResult("it", "S1", 0, "", "", [], [played]), 1, None)
+            yield ("COMPLETED", None, 1, None)
+
+        async def scenario():
+            await collect(cache, "a", source)
+            await collect(cache, "b", source)  # "a" -> dysk
+            with open(tmp_path / "a.pkl", "rb") as f:
+                spilled = pickle.load(f)
+            return spilled, await collect(cache, "a", source)
+
+        spilled, restored = asyncio.run(scenario())
+
+        on_disk = spilled[0][1].simulated_match_rounds[0]
+        assert (on_disk.home_team_id, on_disk.round_id) == (team, round_)
+        assert restored[0][1].simulated_match_rounds == [played]
+
+    def test_unseeded_poisson_and_long_streams_are_not_cacheable(self):
+        cache = PredictionCache(max_entries=4, max_iterations=2)
+
+        assert cache.cacheable(request(seed=None), "round")
+        assert not cache.cacheable(request(seed=None), "poisson")
+        assert not cache.cacheable(PredictRequest("S", "L", 3, {}, [], 1, seed=1), "round")
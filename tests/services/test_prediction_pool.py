@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+
+from src.domain.entities import (
+    InitPrediction,
+    LeagueRound,
+    LeagueTopology,
+    MatchFixtures,
+    MatchRound,
+    PredictRequest,
+    TrainedModels,
+    TrainingDataset,
+)
+from src.domain.features.trainings.training_builder import TrainingBuilder
+from src.services.xgboost.prediction_engine import PredictionEngine
+from src.services.xgboost.prediction_pool import SharedPredictionState, run_chunk
+
+
+def fitted_model(seed: int) -> xgb.XGBRegressor:
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(
+        rng.uniform(0.5, 2.0, size=(80, len(TrainingBuilder.feature_schema()))),
+        columns=TrainingBuilder.feature_schema(),
+    )
+    model = xgb.XGBRegressor(n_estimators=5, max_depth=2, objective="count:poisson")
+    model.fit(X, rng.poisson(1.4, size=80))
+    return model
+
+
+@pytest.fixture
+def engine():
+    rounds = [LeagueRound(id=10 + r, league_id=1, season_year="3", round=r) for r in (1, 2)]
+    topology = LeagueTopology.from_rounds(1, rounds)
+    matches = [
+        MatchRound(101, 12, 2, 3, 0, 0, False, False),
+        MatchRound(102, 12, 4, 5, 0, 0, False, False),
+    ]
+    request = PredictRequest(
+        simulation_id="S",
+        league_id="L",
+        iteration_count=4,
+        team_strengths={},
+        matches_to_simulate=matches,
+        train_until_round_no=1,
+        league_avg_strength=1.4,
+        seed=5,
+        games_to_reach_trust=25,
+    )
+    init_prediction = InitPrediction(
+        TrainingDataset(train=[], test=[]),
+        [],
+        topology,
+        MatchFixtures.from_match_rounds(matches, topology),
+    )
+    models = TrainedModels(
+        home=fitted_model(1),
+        away=fitted_model(2),
+        feature_schema=TrainingBuilder.feature_schema(),
+    )
+    return PredictionEngine(request, init_prediction, models, goal_sampling="poisson")
+
+
+class TestSharedPredictionState:
+    def test_chunk_from_shared_memory_matches_in_process_engine(self, engine):
+        with SharedPredictionState(engine) as state:
+            shard = run_chunk(state.job, 1, 3).iterations
+
+        assert [s.iteration_index for s in shard] == [1, 2]
+        for shard_iteration in shard:
+            home, away, new_strengths = engine.simulate(
+                shard_iteration.iteration_index, "2025-01-01T00:00:00"
+            )
+            assert shard_iteration.home_goals.tolist() == home.tolist()
+            assert shard_iteration.away_goals.tolist() == away.tolist()
+            assert list(shard_iteration.new_strengths) == list(new_strengths)
+
+    def test_iteration_rng_depends_only_on_seed_and_index(self, engine):
+        first = engine.iteration_rng(3).poisson(2.0, size=8)
+        again = engine.iteration_rng(3).poisson(2.0, size=8)
+        other = engine.iteration_rng(4).poisson(2.0, size=8)
+
+        assert first.tolist() == again.tolist()
+        assert first.tolist() != other.tolist()
+
+
+class TestAnalyticLambdas:
+    def test_independent_fixtures_match_round_sampling(self, engine):
+        assert engine.independent_fixtures() == [0, 1]
+
+        home_lambdas, away_lambdas = engine.fixture_lambdas([0, 1], "2025-01-01T00:00:00")
+        rounding = PredictionEngine(
+            engine.predict_request, engine.init_prediction, engine.models, goal_sampling="round"
+        )
+        home_goals, away_goals, _ = rounding.simulate(0, "2025-01-01T00:00:00")
+
+        assert np.round(home_lambdas).tolist() == home_goals.tolist()
+        assert np.round(away_lambdas).tolist() == away_goals.tolist()
+
+
+def with_variance_reduction(engine, mode, strata=None):
+    return PredictionEngine(
+        engine.predict_request,
+        engine.init_prediction,
+        engine.models,
+        goal_sampling="poisson",
+        variance_reduction=mode,
+        strata=strata,
+    )
+
+
+class TestVarianceReduction:
+    def test_antithetic_pairs_mirror_uniforms(self, engine):
+        antithetic = with_variance_reduction(engine, "antithetic")
+
+        first, second = antithetic.iteration_uniforms(4), antithetic.iteration_uniforms(5)
+
+        assert np.allclose(first + second, 1.0)
+        assert not np.allclose(first, antithetic.iteration_uniforms(6))
+
+    def test_stratified_block_uses_every_stratum_once(self, engine):
+        stratified = with_variance_reduction(engine, "stratified", strata=8)
+
+        block = np.stack([stratified.iteration_uniforms(i) for i in range(8, 16)])
+
+        for match_uniforms in np.floor(block * 8).astype(int).transpose(1, 2, 0):
+            for column in match_uniforms:
+                assert sorted(column.tolist()) == list(range(8))
+
+    def test_sharded_chunks_match_in_process_engine(self, engine):
+        stratified = with_variance_reduction(engine, "stratified", strata=3)
+        with SharedPredictionState(stratified) as state:
+            shard = run_chunk(state.job, 2, 5).iterations
+
+        for shard_iteration in shard:
+            home, away, _ = stratified.simulate(
+                shard_iteration.iteration_index, "2025-01-01T00:00:00"
+            )
+            assert shard_iteration.home_goals.tolist() == home.tolist()
+            assert shard_iteration.away_goals.tolist() == away.tolist()
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from src.core.config import AppConfig, SportsDataGrpcConfig
+from src.domain.entities import LeagueRound
+from src.services import sportsdata_service
+from src.services.sportsdata_service import SportsDataService, invalidate_league_topology
+
+
+class FakeLeagueRoundClient:
+    def __init__(self, rounds):
+        self.rounds = rounds
+        self.calls = 0
+
+    async def get_league_rounds_by_params(self, req_league_id):
+        self.calls += 1
+        return list(self.rounds)
+
+
+def topology_ttl(monkeypatch, seconds: float) -> None:
+    app_config = AppConfig(sportsdata_grpc=SportsDataGrpcConfig(topology_ttl_seconds=seconds))
+    monkeypatch.setattr(sportsdata_service, "config", app_config)
+
+
+@pytest.fixture(autouse=True)
+def clear_topology_cache():
+    invalidate_league_topology()
+    yield
+    invalidate_league_topology()
+
+
+class TestLeagueTopologyCache:
+    def test_topology_is_served_from_memory_within_ttl(self, monkeypatch):
+        topology_ttl(monkeypatch, 3600)
+        client = FakeLeagueRoundClient([LeagueRound(11, 1, "2025", 1), LeagueRound(12, 1, "2025", 2)])
+        service = SportsDataService(client, None)
+
+        first = asyncio.run(service.get_league_topology("L1"))
+        second = asyncio.run(service.get_league_topology("L1"))
+
+        assert first is second and client.calls == 1
+        assert first.round_ids == (11, 12)
+
+        # nowa runda widoczna dopiero po unieważnieniu wpisu
+        client.rounds.append(LeagueRound(13, 1, "2025", 3))
+        invalidate_league_topology("L1")
+
+        assert asyncio.run(service.get_league_topology("L1")).round_ids == (11, 12, 13)
+        assert client.calls == 2
+
+    def test_without_ttl_rounds_are_fetched_but_topology_reused(self, monkeypatch):
+        topology_ttl(monkeypatch, 0)
+        client = FakeLeagueRoundClient([LeagueRound(11, 1, "2025", 1)])
+        service = SportsDataService(client, None)
+
+        first = asyncio.run(service.get_league_topology("L1"))
+        second = asyncio.run(service.get_league_topology("L1"))
+
+        assert first is second and client.calls == 2
@@ -0,0 +1,99 @@
+import asyncio
+
+from src.domain.entities import PredictRequest, TrainedModels
+from src.services.training_scheduler import TrainingScheduler
+
+
+def request(league_id: str) -> PredictRequest:
+    return PredictRequest(
+        simulation_id="S",
+        league_id=league_id,
+        iteration_count=1,
+        team_strengths={1: []},
+        matches_to_simulate=[],
+        train_until_round_no=1,
+    )
+
+
+class FakeSimulationService:
+    def __init__(self, pending, leagues=None):
+        self.pending = pending
+        # symulacja -> liga (domyślnie każda liga widzi każdą symulację)
+        self.leagues = leagues or {}
+        self.broken = {"broken"}
+        self.trained = []
+
+    async def get_pending_simulations_to_sync(self):
+        pending, self.pending = self.pending, []
+        return pending
+
+    async def simulations_for_league(self, predict_request, list_simulation_ids):
+        league_id = predict_request.league_id
+        return [s for s in list_simulation_ids if self.leagues.get(s, league_id) == league_id]
+
+    async def train_league(self, predict_request, list_simulation_ids):
+        if predict_request.league_id in self.broken:
+            raise RuntimeError("fit failed")
+        self.trained.append((predict_request.league_id, list_simulation_ids))
+        return TrainedModels(None, None, [predict_request.league_id])
+
+
+class TestTrainingScheduler:
+    def test_trains_registered_leagues(self):
+        async def scenario():
+            service = FakeSimulationService(["SIM_A", "SIM_B"])
+            scheduler = TrainingScheduler(service, interval_seconds=3600)
+
+            # bez zarejestrowanych lig nie zużywamy nowych symulacji
+            assert await scheduler.run_once() == 0
+            assert service.pending == ["SIM_A", "SIM_B"]
+
+            scheduler.register(request("broken"))
+            scheduler.register(request("L1"))
+            assert await scheduler.run_once() == 2
+            assert await scheduler.run_once() == 0
+            return service
+
+        service = asyncio.run(scenario())
+
+        assert service.trained == [("L1", ["SIM_A", "SIM_B"])]
+
+    def test_failed_league_gets_its_simulations_again(self):
+        async def scenario():
+            service = FakeSimulationService(
+                ["SIM_A", "SIM_B", "SIM_C"], leagues={"SIM_A": "broken", "SIM_B": "L1"}
+            )
+            scheduler = TrainingScheduler(service, interval_seconds=3600)
+            scheduler.register(request("broken"))
+            scheduler.register(request("L1"))
+
+            assert await scheduler.run_once() == 3
+            # naprawiony trening: bez nowych symulacji, z kolejki po nieudanej próbie
+            service.broken.clear()
+            service.pending = ["SIM_D"]
+            assert await scheduler.run_once() == 1
+            assert await scheduler.run_once() == 0
+            return service
+
+        service = asyncio.run(scenario())
+
+        assert service.trained == [
+            ("L1", ["SIM_B", "SIM_C"]),
+            ("broken", ["SIM_A", "SIM_C", "SIM_D"]),
+            ("L1", ["SIM_D"]),
+        ]
+
+    def test_new_league_wakes_background_loop(self):
+        async def scenario():
+            service = FakeSimulationService(["SIM_A"])
+            scheduler = TrainingScheduler(service, interval_seconds=3600)
+            scheduler.start()
+            scheduler.register(request("L1"))
+            for _ in range(100):
+                if service.trained:
+                    break
+                await asyncio.sleep(0.01)
+            await scheduler.stop()
+            return service
+
+        assert asyncio.run(scenario()).trained == [("L1", ["SIM_A"])]
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from src.adapters.persistence import JsonFileRepository
+from src.domain.entities import TrainedModels
+from src.domain.features.trainings.training_builder import TrainingBuilder
+from src.services.xgboost.joint_goal_model import train_joint_booster
+from src.services.xgboost.prediction_engine import predict_lambdas
+from src.services.xgboost.xgboost_context_service import XgBoostContextService
+
+
+def early_stopped_model() -> xgb.XGBRegressor:
+    rng = np.random.default_rng(0)
+    schema = TrainingBuilder.feature_schema()
+    X = pd.DataFrame(rng.uniform(0.5, 2.0, size=(120, len(schema))), columns=schema)
+    y = rng.poisson(1.3, size=120)
+    model = xgb.XGBRegressor(
+        n_estimators=50, max_depth=2, objective="count:poisson", early_stopping_rounds=3
+    )
+    model.fit(X[:90], y[:90], eval_set=[(X[90:], y[90:])], verbose=False)
+    return model
+
+
+class TestBestIteration:
+    def test_metadata_round_trip_and_iteration_range(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("STORAGE_DIR", str(tmp_path))
+        context = XgBoostContextService(JsonFileRepository())
+        model = early_stopped_model()
+        best = {"home": int(model.best_iteration), "away": 1}
+
+        context.save_league_models(
+            league_id="L",
+            model_home=model,
+            model_away=model,
+            feature_schema=TrainingBuilder.feature_schema(),
+            best_iterations=best,
+        )
+        artifacts = context.load_league_models(league_id="L")
+        models = TrainedModels(
+            home=artifacts.model_home,
+            away=artifacts.model_away,
+            feature_schema=artifacts.feature_schema,
+            best_iterations=artifacts.best_iterations,
+        )
+
+        assert artifacts.best_iterations == best
+        assert models.iteration_range("away") == (0, 2)
+        assert TrainedModels(model, model, []).iteration_range("home") == (0, 0)
+
+
+class TestJointModel:
+    def test_joint_round_trip_predicts_both_lambdas(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("STORAGE_DIR", str(tmp_path))
+        context = XgBoostContextService(JsonFileRepository())
+        schema = TrainingBuilder.feature_schema()
+        rng = np.random.default_rng(1)
+        X = rng.uniform(0.5, 2.0, size=(160, len(schema))).astype(np.float32)
+        Y = np.stack((rng.poisson(2.0, 160), rng.poisson(0.5, 160)), axis=1)
+
+        booster = train_joint_booster(
+            {"max_depth": 2, "learning_rate": 0.3},
+            X[:120],
+            Y[:120],
+            X[120:],
+            Y[120:],
+            schema,
+            num_boost_round=30,
+            max_bin=32,
+            early_stopping_rounds=3,
+        )
+        best = {"joint": int(booster.best_iteration)}
+        context.save_league_joint_model(
+            league_id="L", model_joint=booster, feature_schema=schema, best_iterations=best
+        )
+        artifacts = context.load_league_joint_model(league_id="L")
+        models = TrainedModels(
+            home=None,
+            away=None,
+            feature_schema=artifacts.feature_schema,
+            best_iterations=artifacts.best_iterations,
+            joint=artifacts.model_joint,
+        )
+
+        home, away = predict_lambdas(models, [dict(zip(schema, row)) for row in X[:4]])
+
+        assert artifacts.best_iterations == best
+        assert context.load_league_models(league_id="L").best_iterations == {}
+        assert home.shape == away.shape == (4,)
+        assert home.mean() > away.mean()